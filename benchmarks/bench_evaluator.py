@@ -0,0 +1,84 @@
+# benchmarks/bench_evaluator.py
+
+"""
+Re-scoring many outputs: one evaluate-style call per output vs
+EvaluatorAgent.evaluate_batch().
+
+Builds a mix of email, report, meeting and general outputs, then scores
+them all with the rule sets one by one (RuleSet.score, what evaluate()
+does) and in one batch (vectorized string operations per rule).
+
+Run from the project root:
+
+    python benchmarks/bench_evaluator.py
+    python benchmarks/bench_evaluator.py --outputs 1000000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pandas  # noqa: E402,F401  (imported lazily by evaluate_batch; keep it out of the timing)
+from agents.evaluator_agent import EvaluatorAgent  # noqa: E402
+
+SAMPLES = {
+    "EMAIL": [
+        "Subject: Project update\n\nDear Ana,\n\nThe rollout moves to Friday because of the "
+        "vendor delay.\nWe will share the new plan tomorrow.\n\nBest regards,\nBob",
+        "hey, running late",
+    ],
+    "REPORT": [
+        "=== Sales Report ===\nRows: 120\nTotal revenue: 48,200\nTotal expenses: 30,100\n"
+        "Total profit: 18,100\nTop days:\n- 2025-11-03: 4,200",
+        "Total revenue: 1",
+    ],
+    "MEETING": [
+        "Meeting Summary:\nThe team agreed on the Q3 roadmap.\n\nAction Items:\n"
+        "1. Ana drafts the spec\n2. Bob books the venue\n3. Cleo reviews the budget",
+        "We talked about things.",
+    ],
+    "GENERAL": [
+        "I didn't understand your request clearly. Try including words like 'email'.",
+        "ok",
+    ],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--outputs", type=int, default=200_000, help="Outputs to score")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    task_types = [rng.choice(list(SAMPLES)) for _ in range(args.outputs)]
+    # Every output distinct, like real LLM outputs
+    outputs = [f"{rng.choice(SAMPLES[t])}\nRef {i}" for i, t in enumerate(task_types)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = EvaluatorAgent(str(Path(tmp) / "metrics.csv"))
+
+        start = time.perf_counter()
+        single = [agent._rules_for(t).score(o) for t, o in zip(task_types, outputs)]
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = agent.evaluate_batch(task_types, outputs)
+        batched = time.perf_counter() - start
+
+        agent.close()
+
+    assert list(batch["score"]) == [score for score, _ in single]
+
+    print(f"{args.outputs:,} outputs")
+    print(f"  one by one     {one_by_one:7.3f}s  ({args.outputs / one_by_one:,.0f}/s)")
+    print(f"  evaluate_batch {batched:7.3f}s  ({args.outputs / batched:,.0f}/s)")
+    print(f"  speedup        {one_by_one / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_intent_router.py
+
+"""
+Routing cost as the keyword rule set grows.
+
+Compares IntentRouter against a naive chain of substring checks over
+the same keywords. The router should stay flat; the chain grows
+linearly with the number of keywords.
+
+Run from the project root:
+
+    python benchmarks/bench_intent_router.py
+"""
+
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.intent_router import build_default_router  # noqa: E402
+
+MESSAGES = [
+    "write an email to a client about project delay",
+    "generate a sales report for last month",
+    "summarize the meeting and list the action items",
+    "hello, what can you do for me today?",
+]
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+
+
+def time_per_call(fn, repeat: int = 2000) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(MESSAGES[i % len(MESSAGES)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    rng = random.Random(0)
+
+    print(f"{'keywords':>10}{'router (us)':>14}{'substring chain (us)':>24}")
+    for n in (10, 100, 1_000, 10_000):
+        router = build_default_router()
+        extra = [random_word(rng) for _ in range(n)]
+        for i in range(0, n, 10):
+            router.register(f"CUSTOM_{i}", extra[i:i + 10])
+
+        keywords = [(kw, "CUSTOM") for kw in extra]
+
+        def substring_chain(text: str) -> str:
+            lowered = text.lower()
+            for kw, intent in keywords:
+                if kw in lowered:
+                    return intent
+            return "GENERAL"
+
+        router_us = time_per_call(router.route)
+        chain_us = time_per_call(substring_chain)
+        print(f"{n:>10,}{router_us:>14.2f}{chain_us:>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_kpi_engine.py
+
+"""
+KPI engine vs. one pandas pass per metric, at 1M, 10M and 100M rows.
+
+Both compute the same KPIs: totals, per-client revenue and margin,
+day-over-day growth, a 7-day rolling average, monthly revenue and the
+top 10 clients. The data is generated in memory (dates and clients as
+categoricals, amounts as int32) so parsing time is not included.
+
+The pandas baseline is skipped above --pandas-max rows, where it needs
+more memory than a small machine has.
+
+Run from the project root:
+
+    python benchmarks/bench_kpi_engine.py
+    python benchmarks/bench_kpi_engine.py --rows 1000000 10000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.report_agent import BASE_KPIS, DEFAULT_KPIS  # noqa: E402
+from tools.kpi_engine import KPI, KPIEngine  # noqa: E402
+
+KPIS = BASE_KPIS + [kpi for kpi in DEFAULT_KPIS if kpi.name != "top_clients"] + [
+    KPI("revenue_7day_avg", "rolling", "revenue", by="date", window=7),
+    KPI("top_clients", "top", "revenue", by="client", n=10),
+]
+
+
+def make_data(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=730).strftime("%Y-%m-%d")
+    clients = [f"Client {i}" for i in range(10_000)]
+    return pd.DataFrame({
+        "date": pd.Categorical.from_codes(rng.integers(0, len(dates), rows, dtype=np.int16), dates),
+        "client": pd.Categorical.from_codes(rng.integers(0, len(clients), rows, dtype=np.int16), clients),
+        "revenue": rng.integers(100, 5000, rows, dtype=np.int32),
+        "expenses": rng.integers(50, 3000, rows, dtype=np.int32),
+    })
+
+
+def pandas_baseline(df: pd.DataFrame) -> dict:
+    """
+    The same KPIs the way ReportAgent used to compute its numbers: a
+    separate pandas pass for each one.
+    """
+    results = {
+        "total_revenue": df["revenue"].sum(),
+        "total_expenses": df["expenses"].sum(),
+    }
+    by_date = df.groupby("date", observed=True)["revenue"].sum()
+    results["revenue_by_date"] = by_date
+    results["revenue_by_client"] = df.groupby("client", observed=True)["revenue"].sum()
+    by_client = df.groupby("client", observed=True)[["revenue", "expenses"]].sum()
+    results["margin"] = (results["total_revenue"] - results["total_expenses"]) / results["total_revenue"]
+    results["margin_by_client"] = (by_client["revenue"] - by_client["expenses"]) / by_client["revenue"]
+    results["daily_revenue_growth"] = by_date.pct_change()
+    results["revenue_3day_avg"] = by_date.rolling(3).mean()
+    results["revenue_7day_avg"] = by_date.rolling(7).mean()
+    months = pd.to_datetime(df["date"].astype(str)).dt.to_period("M")
+    results["monthly_revenue"] = df.groupby(months)["revenue"].sum()
+    results["top_clients"] = results["revenue_by_client"].sort_values(ascending=False).head(10)
+    return results
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 100_000_000])
+    parser.add_argument("--pandas-max", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    engine = KPIEngine(KPIS)
+    print(f"{'rows':>12} {'engine (s)':>11} {'pandas (s)':>11} {'speedup':>8}")
+
+    for rows in args.rows:
+        df = make_data(rows)
+        repeat = 3 if rows <= 10_000_000 else 1
+
+        engine_time = best_of(lambda: engine.compute(df), repeat)
+
+        if rows <= args.pandas_max:
+            pandas_time = best_of(lambda: pandas_baseline(df), repeat)
+            results, expected = engine.compute(df), pandas_baseline(df)
+            assert results["total_revenue"] == expected["total_revenue"]
+            assert results["top_clients"].tolist() == expected["top_clients"].tolist()
+            print(f"{rows:>12,} {engine_time:>11.3f} {pandas_time:>11.3f} {pandas_time / engine_time:>7.1f}x")
+        else:
+            print(f"{rows:>12,} {engine_time:>11.3f} {'skipped':>11} {'':>8}")
+
+        del df
+
+
+if __name__ == "__main__":
+    main()
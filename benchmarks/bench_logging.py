@@ -0,0 +1,131 @@
+# benchmarks/bench_logging.py
+
+"""
+Per-request logging overhead: handlers on the request thread vs the
+QueueHandler/QueueListener pipeline.
+
+Runs PlannerAgent requests (fake LLM without latency, so the planner's
+own work dominates) with logging off, with the console and file handlers
+called directly (the previous setup), through the queue, and through the
+queue with per-logger rate limits. The console goes to /dev/null. For
+the queue modes, the time to drain what is still queued at the end is
+shown separately.
+
+Also measures what one log call of a long prompt costs the caller:
+eager shorten() vs shortened(), for a record that is written and for
+one below the log level.
+
+Run from the project root:
+
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --requests 5000 --format json
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from textwrap import shorten
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.evaluator_agent import EvaluatorAgent  # noqa: E402
+from agents.planner import PlannerAgent  # noqa: E402
+from utils import logging_config  # noqa: E402
+from utils.llm_client import FakeLLMClient  # noqa: E402
+
+INPUTS = ["write an email to a client", "summarize the meeting", "show my preferences", "hello"]
+PROMPT = "Write a short professional email to the client about the delayed rollout. " * 30
+CALLS = 10_000
+
+
+def request_us(planner: PlannerAgent, requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        planner.handle_request(INPUTS[i % len(INPUTS)])
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        fn()
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+def eager_shorten(text: str) -> str:
+    return shorten(text, width=120, placeholder="...")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2_000, help="Requests per mode")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Log line format")
+    args = parser.parse_args()
+
+    modes = [
+        ("logging off", None),
+        ("direct handlers", {"use_queue": False, "rate_limits": ""}),
+        ("queue", {"use_queue": True, "rate_limits": ""}),
+        ("queue + rate limit", {"use_queue": True, "rate_limits": "utils.llm_client=50,agents=50"}),
+    ]
+
+    root = logging.getLogger()
+    stderr = sys.stderr
+    sys.stderr = open(os.devnull, "w")
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        planner = PlannerAgent()
+        planner.evaluator_agent = EvaluatorAgent(str(Path(tmp) / "metrics.csv"))
+        planner.email_agent.llm = FakeLLMClient(latency=0.0)
+        planner.meeting_agent.llm = FakeLLMClient(latency=0.0)
+        log_file = Path(tmp) / "app.log"
+
+        request_us(planner, args.requests)  # warm-up, logging off
+        for name, options in modes:
+            if options is None:
+                root.setLevel(logging.CRITICAL)
+                results.append((name, request_us(planner, args.requests), 0.0))
+                continue
+            logging_config.setup_logging("INFO", args.format, log_file=log_file, **options)
+            per_request = request_us(planner, args.requests)
+            start = time.perf_counter()
+            logging_config.shutdown_logging()
+            drain = (time.perf_counter() - start) / args.requests * 1e6
+            results.append((name, per_request, drain))
+
+        logger = logging.getLogger("bench")
+        calls = []
+        for name, options in [("direct", False), ("queue", True)]:
+            logging_config.setup_logging("INFO", args.format, use_queue=options, rate_limits="", log_file=log_file)
+            calls.append((name, *[
+                per_call_us(lambda: log("Prompt: %s", arg(PROMPT)))
+                for log in (logger.info, logger.debug)
+                for arg in (eager_shorten, logging_config.shortened)
+            ]))
+            logging_config.shutdown_logging()
+
+        planner.evaluator_agent.close()
+
+    sys.stderr.close()
+    sys.stderr = stderr
+
+    off = results[0][1]
+    print(f"PlannerAgent.handle_request ({args.requests:,} requests, {args.format} lines)")
+    print(f"  {'mode':<20} {'us/request':>10} {'logging':>9} {'drain':>8}")
+    for name, per_request, drain in results:
+        print(f"  {name:<20} {per_request:10.1f} {per_request - off:9.1f} {drain:8.1f}")
+
+    print(f"\nOne log call with a {len(PROMPT):,}-char prompt, cost to the caller (us, {CALLS:,} calls)")
+    print(f"  {'handlers':<10} {'info shorten()':>15} {'info shortened()':>17} "
+          f"{'debug shorten()':>16} {'debug shortened()':>18}")
+    for name, *costs in calls:
+        print(f"  {name:<10} {costs[0]:15.2f} {costs[1]:17.2f} {costs[2]:16.2f} {costs[3]:18.2f}")
+
+
+if __name__ == "__main__":
+    main()
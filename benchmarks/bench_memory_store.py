@@ -0,0 +1,100 @@
+# benchmarks/bench_memory_store.py
+
+"""
+Compare MemoryStore (one long-lived connection per thread) against the
+old behaviour of opening and closing a SQLite connection on every call,
+and time the bulk set_many / get_many APIs on 100k keys.
+
+Run from the project root:
+
+    python benchmarks/bench_memory_store.py
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from memory.memory_store import MemoryStore  # noqa: E402
+
+
+class ConnectPerCallStore:
+    """
+    The previous MemoryStore behaviour: a new connection for every call.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS memories ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, "
+            "value TEXT NOT NULL, created_at TEXT NOT NULL)"
+        )
+        conn.commit()
+        conn.close()
+
+    def get_memory(self, key: str) -> str | None:
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute("SELECT value FROM memories WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        return None if row is None else row[0]
+
+    def set_memory(self, key: str, value: str):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "INSERT OR REPLACE INTO memories (id, key, value, created_at) VALUES ("
+            "COALESCE((SELECT id FROM memories WHERE key = ?), NULL), ?, ?, '')",
+            (key, key, value),
+        )
+        conn.commit()
+        conn.close()
+
+
+def ops_per_sec(fn, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    reads = 20_000
+    writes = 2_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old = ConnectPerCallStore(str(Path(tmp) / "old.db"))
+        new = MemoryStore(str(Path(tmp) / "new.db"))
+
+        for store in (old, new):
+            store.set_memory("email_signature", "Best regards,\nAI Business Assistant")
+
+        print(f"{'operation':<12}{'connect-per-call':>20}{'persistent':>16}{'speedup':>10}")
+
+        old_get = ops_per_sec(lambda i: old.get_memory("email_signature"), reads)
+        new_get = ops_per_sec(lambda i: new.get_memory("email_signature"), reads)
+        print(f"{'get_memory':<12}{old_get:>17,.0f}/s{new_get:>13,.0f}/s{new_get / old_get:>9.1f}x")
+
+        old_set = ops_per_sec(lambda i: old.set_memory(f"k{i}", "v"), writes)
+        new_set = ops_per_sec(lambda i: new.set_memory(f"k{i}", "v"), writes)
+        print(f"{'set_memory':<12}{old_set:>17,.0f}/s{new_set:>13,.0f}/s{new_set / old_set:>9.1f}x")
+
+        bulk = {f"client{i}:email_signature": f"Regards,\nClient {i}" for i in range(100_000)}
+        start = time.perf_counter()
+        new.set_many(bulk)
+        elapsed = time.perf_counter() - start
+        print(f"\nset_many with {len(bulk):,} keys: {elapsed:.3f}s")
+
+        start = time.perf_counter()
+        new.get_many(list(bulk))
+        elapsed = time.perf_counter() - start
+        print(f"get_many with {len(bulk):,} keys: {elapsed:.3f}s")
+
+        new.close()
+
+
+if __name__ == "__main__":
+    main()
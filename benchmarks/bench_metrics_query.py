@@ -0,0 +1,96 @@
+# benchmarks/bench_metrics_query.py
+
+"""
+Metrics history queries: indexed SQLite windows vs loading the CSV.
+
+Writes a synthetic metrics CSV (about a year of evaluations), imports
+it into the metrics database, then answers "last 7 days" questions two
+ways: MetricsQuery on the indexed table, and pandas reading the whole
+CSV each time (the only option before).
+
+Run from the project root:
+
+    python benchmarks/bench_metrics_query.py
+    python benchmarks/bench_metrics_query.py --rows 5000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tools.metrics_query import MetricsQuery  # noqa: E402
+
+NOTES = np.array([
+    "OK",
+    "Missing subject line",
+    "Missing subject line; Missing greeting (e.g., 'Dear ...')",
+    "Report seems too short (few lines)",
+    "No numbered action items found",
+], dtype=object)
+TASK_TYPES = np.array(["EMAIL", "REPORT", "MEETING", "GENERAL"], dtype=object)
+
+
+def write_history(path: Path, rows: int):
+    rng = np.random.default_rng(0)
+    start = np.datetime64("2025-01-01T00:00:00")
+    seconds = np.sort(rng.integers(0, 365 * 86400, rows))
+    df = pd.DataFrame({
+        "timestamp": np.datetime_as_string(start + seconds.astype("timedelta64[s]")),
+        "task_type": TASK_TYPES[rng.integers(0, len(TASK_TYPES), rows)],
+        "output_length": rng.integers(20, 2000, rows),
+        "score": rng.choice([0.5, 0.6, 0.7, 0.8, 0.9], rows),
+        "notes": NOTES[rng.integers(0, len(NOTES), rows)],
+    })
+    df.to_csv(path, index=False)
+
+
+def timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def pandas_week(csv_path: Path) -> pd.DataFrame:
+    df = pd.read_csv(csv_path)
+    window = df[(df["timestamp"] >= "2025-12-24") & (df["timestamp"] < "2026-01-01")]
+    return window.groupby([window["timestamp"].str[:10], "task_type"])["score"].agg(["count", "mean"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Evaluations in the history")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "metrics.csv"
+        write_history(csv_path, args.rows)
+        query = MetricsQuery(str(Path(tmp) / "metrics.db"))
+
+        seconds, added = timed(lambda: query.import_csv(str(csv_path)))
+        print(f"Import {added:,} rows: {seconds:.2f}s   (re-import: "
+              f"{timed(lambda: query.import_csv(str(csv_path)))[0] * 1000:.1f} ms)")
+
+        window = {"start": "2025-12-24", "end": "2025-12-31"}
+        print("\nLast 7 days:")
+        for name, fn in [
+            ("score trend", lambda: query.score_trend("day", **window)),
+            ("note frequency", lambda: query.note_frequency(**window)),
+            ("p95 length/day", lambda: query.length_percentile(95, "day", **window)),
+            ("EMAIL trend", lambda: query.score_trend("day", task_type="EMAIL", **window)),
+        ]:
+            print(f"  {name:<16} {timed(fn)[0] * 1000:8.1f} ms")
+
+        seconds, _ = timed(lambda: pandas_week(csv_path))
+        print(f"  pandas (full CSV) {seconds * 1000:7.1f} ms  (score trend only)")
+        query.close()
+
+
+if __name__ == "__main__":
+    main()
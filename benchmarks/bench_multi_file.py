@@ -0,0 +1,80 @@
+# benchmarks/bench_multi_file.py
+
+"""
+Report over a directory of daily CSV files: one process vs. a pool.
+
+Writes `--files` CSV files of `--rows` rows each (every other one
+gzipped) to a temp directory, then times ReportAgent over the directory
+with SpreadsheetTool using 1 worker and using one per CPU (at least
+two). The speedup is bounded by the number of CPUs.
+
+Run from the project root:
+
+    python benchmarks/bench_multi_file.py
+    python benchmarks/bench_multi_file.py --files 90 --rows 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.report_agent import ReportAgent  # noqa: E402
+from tools.spreadsheet_parser import SpreadsheetTool  # noqa: E402
+
+
+def write_files(folder: Path, files: int, rows: int):
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2025-01-01", periods=files).strftime("%Y-%m-%d")
+    for i, day in enumerate(days):
+        df = pd.DataFrame({
+            "date": day,
+            "client": rng.choice([f"Client {c}" for c in range(200)], rows),
+            "revenue": rng.integers(100, 5000, rows),
+            "expenses": rng.integers(50, 3000, rows),
+        })
+        suffix = ".csv.gz" if i % 2 else ".csv"
+        df.to_csv(folder / f"sales_{day}{suffix}", index=False)
+
+
+def time_report(folder: Path, workers: int) -> tuple[float, str]:
+    agent = ReportAgent()
+    agent.spreadsheet_tool = SpreadsheetTool(workers=workers)
+
+    start = time.perf_counter()
+    report = agent.generate_report(str(folder))
+    elapsed = time.perf_counter() - start
+
+    agent.spreadsheet_tool.close()
+    return elapsed, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=30)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        write_files(folder, args.files, args.rows)
+
+        serial, expected = time_report(folder, workers=1)
+        cpus = max(2, os.cpu_count() or 1)
+        parallel, report = time_report(folder, workers=cpus)
+        assert report == expected
+
+        print(f"{args.files} files x {args.rows:,} rows")
+        print(f"1 process:    {serial:.2f}s")
+        print(f"{cpus} processes: {parallel:.2f}s  ({serial / parallel:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
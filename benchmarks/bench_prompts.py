@@ -0,0 +1,134 @@
+# benchmarks/bench_prompts.py
+
+"""
+Prompt building: f-string + textwrap.dedent per call vs compiled templates.
+
+Times the email and meeting prompts built the old way (an f-string over
+the whole template, then dedent() on every call) against the registered
+templates, then the token estimator, then budgeting an oversized email
+request and transcript to a given context size.
+
+Run from the project root:
+
+    python benchmarks/bench_prompts.py
+    python benchmarks/bench_prompts.py --context 32000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from textwrap import dedent
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.prompts import estimate_tokens, get_template  # noqa: E402
+from utils.transcript import split_transcript  # noqa: E402
+
+CALLS = 100_000
+REQUEST = "Write an email to the client explaining the rollout moves to Friday because of the vendor delay."
+TRANSCRIPT = "".join(
+    f"{speaker}: Update {i} on the project, the vendor delay moves the rollout to Friday.\n"
+    for i, speaker in zip(range(40), ["Alice", "Bob", "Carol"] * 14)
+)
+
+
+def old_email_prompt(user_request: str, signature: str) -> str:
+    prompt = f"""
+    You are a professional business email assistant.
+
+    Write a clear, polite, and concise email based on the user's request below.
+
+    Requirements:
+    - Include a subject line starting with: "Subject:"
+    - Start with a greeting (e.g., "Dear <Client Name>,")
+    - Use a professional but friendly tone.
+    - End with the provided signature.
+
+    User request:
+    \"\"\"{user_request}\"\"\"
+
+    Signature to use:
+    \"\"\"{signature}\"\"\"
+
+    Now write only the email.
+    """
+    return dedent(prompt).strip()
+
+
+def old_meeting_prompt(transcript: str) -> str:
+    prompt = f"""
+    You are an assistant that summarizes business meetings.
+
+    Given the meeting transcript below:
+    1. Write a brief summary (3-5 sentences).
+    2. List all action items as numbered bullet points.
+       - Each item should start with a verb (e.g., "Finalize", "Prepare", "Schedule").
+       - Include who is responsible, if mentioned.
+
+    Meeting transcript:
+    \"\"\"{transcript}\"\"\"
+
+    Format:
+
+    === Meeting Summary ===
+    <summary here>
+
+    === Action Items ===
+    1. ...
+    2. ...
+    3. ...
+    """
+    return dedent(prompt).strip()
+
+
+def per_call_us(fn, calls: int = CALLS) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--context", type=int, default=8_192, help="Context window (tokens) to budget for")
+    args = parser.parse_args()
+
+    email = get_template("email")
+    meeting = get_template("meeting_summary")
+    budget = args.context - 512
+
+    print(f"Per prompt (us, {CALLS:,} calls)        old   template   render_within")
+    rows = [
+        ("email", lambda: old_email_prompt(REQUEST, "Bob"),
+         lambda: email.render(user_request=REQUEST, signature="Bob"),
+         lambda: email.render_within(budget, user_request=REQUEST, signature="Bob")),
+        (f"meeting ({len(TRANSCRIPT):,} chars)", lambda: old_meeting_prompt(TRANSCRIPT),
+         lambda: meeting.render(transcript=TRANSCRIPT),
+         lambda: meeting.render_within(budget, transcript=TRANSCRIPT)),
+    ]
+    for name, old, new, budgeted in rows:
+        print(f"  {name:<30} {per_call_us(old):6.2f} {per_call_us(new):10.2f} {per_call_us(budgeted):15.2f}")
+
+    print(f"\nestimate_tokens: {per_call_us(lambda: estimate_tokens(TRANSCRIPT)) * 1000:.0f} ns "
+          f"({len(TRANSCRIPT):,} ASCII chars), "
+          f"{per_call_us(lambda: estimate_tokens('日本語' * 1000)) * 1000:.0f} ns (3,000 CJK chars)")
+
+    huge_request = REQUEST * 5_000
+    huge_transcript = TRANSCRIPT * 200
+    start = time.perf_counter()
+    trimmed = email.render_within(budget, user_request=huge_request, signature="Bob")
+    trim_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    chunks = split_transcript(huge_transcript, meeting.field_budget(budget))
+    chunk_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\nBudget {budget:,} prompt tokens ({args.context:,} context, 512 for the reply)")
+    print(f"  email request   {estimate_tokens(email.render(user_request=huge_request, signature='Bob')):>9,} "
+          f"-> {estimate_tokens(trimmed):,} tokens, trimmed in {trim_ms:.2f} ms")
+    print(f"  transcript      {estimate_tokens(huge_transcript):>9,} "
+          f"-> {len(chunks)} chunks of <= {meeting.field_budget(budget):,} tokens in {chunk_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_rollups.py
+
+"""
+Report latency: rescanning every CSV vs. answering from rollups.
+
+Writes one CSV per day for `--days` days, then times:
+- a full report (parse every file)
+- building the rollups the first time
+- a report from up-to-date rollups
+- a report after one new day's file arrives (only that file is parsed)
+- a date-range + client query
+
+Run from the project root:
+
+    python benchmarks/bench_rollups.py
+    python benchmarks/bench_rollups.py --days 365 --rows 20000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.report_agent import ReportAgent  # noqa: E402
+
+CLIENTS = [f"Client {c}" for c in range(200)]
+
+
+def write_day(folder: Path, day: str, rows: int, rng: np.random.Generator):
+    pd.DataFrame({
+        "date": day,
+        "client": rng.choice(CLIENTS, rows),
+        "revenue": rng.integers(100, 5000, rows),
+        "expenses": rng.integers(50, 3000, rows),
+    }).to_csv(folder / f"sales_{day}.csv", index=False)
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<34} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2025-01-01", periods=args.days + 1).strftime("%Y-%m-%d")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        for day in days[:-1]:
+            write_day(folder, day, args.rows, rng)
+        source = str(folder)
+        print(f"{args.days} files x {args.rows:,} rows")
+
+        full = ReportAgent(rollups=False)
+        agent = ReportAgent(rollups=True)
+        store = agent.rollup_store(source)
+
+        expected = timed("full rescan report", lambda: full.generate_report(source))
+        timed("initial rollup build", store.refresh)
+        report = timed("report from rollups", lambda: agent.generate_report(source))
+        assert report == expected
+
+        write_day(folder, days[-1], args.rows, rng)
+        timed("report after one new file", lambda: agent.generate_report(source))
+        timed(
+            "one month, 3 clients (weekly)",
+            lambda: store.query("week", start=days[30], end=days[60], clients=CLIENTS[:3]),
+        )
+        problems = timed("verify against full recompute", store.verify)
+        assert problems == []
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/bench_server.py
+
+"""
+Load test for server mode: latency percentiles and requests/second.
+
+Opens `--concurrency` keep-alive connections and sends `--requests`
+POST /request calls over them, cycling through a mix of email, meeting,
+report and general requests. Latency is measured per request on the
+client side.
+
+By default a server with a FakeLLMClient (`--latency` seconds per call)
+is started in-process on a free port. Pass --url to load-test a server
+that is already running (python src/main.py serve).
+
+Run from the project root:
+
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --concurrency 50 --requests 2000
+    python benchmarks/bench_server.py --url http://127.0.0.1:8080
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.evaluator_agent import EvaluatorAgent  # noqa: E402
+from agents.planner import PlannerAgent  # noqa: E402
+from server import PlannerServer  # noqa: E402
+from utils.llm_client import FakeLLMClient  # noqa: E402
+
+REQUESTS = [
+    "write an email to a client about project delay",
+    "summarize the meeting",
+    "generate a sales report",
+    "hello there",
+]
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """
+    Read one HTTP response; returns its status code.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split(b" ", 2)[1])
+
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host: str, port: int, jobs: asyncio.Queue, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                user_input = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            body = json.dumps({"input": user_input}).encode()
+            request = (
+                f"POST /request HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def load_test(host: str, port: int, concurrency: int, total: int) -> dict:
+    jobs: asyncio.Queue = asyncio.Queue()
+    for i in range(total):
+        jobs.put_nowait(REQUESTS[i % len(REQUESTS)])
+
+    latencies: list[float] = []
+    errors: list[int] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, jobs, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+async def run(args) -> dict:
+    if args.url:
+        url = urlsplit(args.url)
+        return await load_test(url.hostname, url.port or 80, args.concurrency, args.requests)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        planner = PlannerAgent(max_concurrency=args.concurrency)
+        planner.evaluator_agent = EvaluatorAgent(str(Path(tmp) / "metrics.csv"))
+        planner.email_agent.llm = FakeLLMClient(latency=args.latency)
+        planner.meeting_agent.llm = FakeLLMClient(latency=args.latency)
+
+        server = PlannerServer(planner, host="127.0.0.1", port=0)
+        await server.start()
+        try:
+            # One round first so caches and lazy imports are warm
+            await load_test(server.host, server.port, 1, len(REQUESTS))
+            return await load_test(server.host, server.port, args.concurrency, args.requests)
+        finally:
+            await server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Server to test (default: start one in-process)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Open connections")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests in total")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake LLM latency (in-process only)")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args))
+
+    print(f"{stats['requests']} requests on {args.concurrency} connections in {stats['seconds']:.2f}s")
+    print(f"  errors      {stats['errors']}")
+    print(f"  throughput  {stats['rps']:.1f} req/s")
+    for name in ("p50", "p95", "p99"):
+        print(f"  {name:<11} {stats[name] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_startup.py
+
+"""
+Cold-start cost of the CLI: time and memory to import src/main.py and
+build a PlannerAgent, each measured in a fresh Python process.
+
+"lazy" is what the CLI does now. "eager" additionally touches every
+sub-agent, which is what PlannerAgent.__init__ used to do.
+
+Run from the project root:
+
+    python benchmarks/bench_startup.py
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+RUNS = 5
+
+CHILD = r"""
+import json, sys, time, tracemalloc
+sys.path.insert(0, {src!r})
+if {trace!r}:
+    tracemalloc.start()
+start = time.perf_counter()
+
+import main
+from agents.planner import PlannerAgent
+imported = time.perf_counter()
+
+planner = PlannerAgent()
+if {eager!r}:
+    for name in ("email_agent", "report_agent", "memory_agent", "meeting_agent", "evaluator_agent"):
+        getattr(planner, name)
+built = time.perf_counter()
+
+_, peak = tracemalloc.get_traced_memory()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "total_ms": (built - start) * 1000,
+    "peak_mb": peak / 1e6,
+    "pandas_loaded": "pandas" in sys.modules,
+}}))
+"""
+
+
+def child(eager: bool, trace: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(src=str(SRC), eager=eager, trace=trace)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(eager: bool) -> dict:
+    # tracemalloc slows imports down a lot, so time and memory are
+    # measured in separate processes.
+    timed = [child(eager, trace=False) for _ in range(RUNS)]
+    traced = child(eager, trace=True)
+
+    return {
+        "import_ms": statistics.median(r["import_ms"] for r in timed),
+        "total_ms": statistics.median(r["total_ms"] for r in timed),
+        "peak_mb": traced["peak_mb"],
+        "pandas_loaded": traced["pandas_loaded"],
+    }
+
+
+def main():
+    print(f"{'mode':<8}{'import (ms)':>14}{'startup (ms)':>15}{'peak mem (MB)':>16}{'pandas':>9}")
+    for mode, eager in (("lazy", False), ("eager", True)):
+        r = run(eager)
+        print(
+            f"{mode:<8}{r['import_ms']:>14.1f}{r['total_ms']:>15.1f}"
+            f"{r['peak_mb']:>16.1f}{str(r['pandas_loaded']):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_streaming.py
+
+"""
+Time-to-first-token: streaming vs waiting for the whole response.
+
+Uses FakeLLMClient with a fixed start-up latency and per-token delay,
+and goes through PlannerAgent so prompt building and evaluation are
+included. With streaming, the user sees output after roughly the
+start-up latency instead of after the full generation time.
+
+Run from the project root:
+
+    python benchmarks/bench_streaming.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.evaluator_agent import EvaluatorAgent  # noqa: E402
+from agents.planner import PlannerAgent  # noqa: E402
+from utils.llm_client import FakeLLMClient  # noqa: E402
+
+REQUEST = "write an email to a client about project delay"
+
+
+def measure(planner: PlannerAgent, stream: bool) -> tuple[float, float]:
+    """
+    (seconds until first output, seconds until done)
+    """
+    start = time.perf_counter()
+    if not stream:
+        planner.handle_request(REQUEST)
+        total = time.perf_counter() - start
+        return total, total
+
+    first = None
+    for _ in planner.handle_request_stream(REQUEST):
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'latency':>8} {'tok delay':>10} {'mode':>9} {'first (ms)':>11} {'total (ms)':>11}")
+        for latency, token_delay in [(0.05, 0.005), (0.2, 0.01), (0.5, 0.02)]:
+            planner = PlannerAgent()
+            planner.evaluator_agent = EvaluatorAgent(str(Path(tmp) / "metrics.csv"))
+            planner.email_agent.llm = FakeLLMClient(latency=latency, token_delay=token_delay)
+
+            for stream in (False, True):
+                first, total = measure(planner, stream)
+                mode = "stream" if stream else "blocking"
+                print(
+                    f"{latency:>8.2f} {token_delay:>10.3f} {mode:>9} "
+                    f"{first * 1000:>11.1f} {total * 1000:>11.1f}"
+                )
+            planner.evaluator_agent.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_tracing.py
+
+"""
+Cost of the tracing layer, switched off and switched on.
+
+Measures the per-call cost of span() and @traced with tracing off and
+on, then the time of a PlannerAgent request (fake LLM without latency,
+so the planner's own work dominates) both ways. Ends with the
+per-stage latency table from the traced run.
+
+Run from the project root:
+
+    python benchmarks/bench_tracing.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agents.evaluator_agent import EvaluatorAgent  # noqa: E402
+from agents.planner import PlannerAgent  # noqa: E402
+from utils import tracing  # noqa: E402
+from utils.llm_client import FakeLLMClient  # noqa: E402
+
+CALLS = 200_000
+REQUESTS = 2_000
+INPUTS = ["write an email to a client", "summarize the meeting", "show my preferences", "hello"]
+
+
+@tracing.traced("bench.traced")
+def traced_noop():
+    return None
+
+
+def noop():
+    return None
+
+
+def per_call_ns(fn) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(CALLS):
+        fn()
+    return (time.perf_counter_ns() - start) / CALLS
+
+
+def with_span():
+    with tracing.span("bench.span"):
+        pass
+
+
+def request_ms(planner: PlannerAgent) -> float:
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        planner.handle_request(INPUTS[i % len(INPUTS)])
+    return (time.perf_counter() - start) / REQUESTS * 1000
+
+
+def main():
+    tracer = tracing.get_tracer()
+    baseline = per_call_ns(noop)
+
+    print(f"Per call ({CALLS:,} calls, plain function call: {baseline:.0f} ns)")
+    for enabled in (False, True):
+        tracing.enable() if enabled else tracing.disable()
+        tracer.reset()
+        label = "on " if enabled else "off"
+        print(f"  tracing {label}  span(): {per_call_ns(with_span):6.0f} ns   "
+              f"@traced: {per_call_ns(traced_noop) - baseline:6.0f} ns extra")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        planner = PlannerAgent()
+        planner.evaluator_agent = EvaluatorAgent(str(Path(tmp) / "metrics.csv"))
+        planner.email_agent.llm = FakeLLMClient(latency=0.0)
+        planner.meeting_agent.llm = FakeLLMClient(latency=0.0)
+
+        tracing.disable()
+        request_ms(planner)  # warm-up
+        off = request_ms(planner)
+
+        tracing.enable()
+        tracer.reset()
+        on = request_ms(planner)
+        tracing.disable()
+        planner.evaluator_agent.close()
+
+    print(f"\nPlannerAgent.handle_request ({REQUESTS:,} requests)")
+    print(f"  tracing off  {off:.3f} ms/request")
+    print(f"  tracing on   {on:.3f} ms/request  ({(on - off) / off:+.1%})")
+    print("\nStage latencies (tracing on):")
+    print(tracer.format_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# src/agents/background_evaluator.py
+
+"""
+Evaluation off the request's critical path.
+
+BackgroundEvaluator takes (task type, input, output) triples from
+PlannerAgent and runs EvaluatorAgent.evaluate() on a worker thread, so
+the response can be returned before it is scored. The summary is
+delivered to an optional callback and through the Future submit()
+returns.
+
+The queue is bounded: when it is full the evaluation is dropped (and
+counted) rather than making the request wait. EvalSampler lets busy
+intents evaluate only a fraction of their outputs.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from fractions import Fraction
+from typing import Callable
+
+from config import EVAL_QUEUE_SIZE, EVAL_SAMPLE_RATES
+
+logger = logging.getLogger(__name__)
+
+EvaluationCallback = Callable[[str, str, str], None]
+
+_STOP = object()
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """
+    "EMAIL=0.1, GENERAL=0.5" -> {"EMAIL": 0.1, "GENERAL": 0.5}.
+    """
+    rates = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        intent, sep, value = part.partition("=")
+        try:
+            rate = float(value)
+        except ValueError:
+            rate = -1.0
+        if not sep or not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Invalid evaluation sample rate {part.strip()!r} (expected INTENT=0..1)")
+        rates[intent.strip().upper()] = rate
+    return rates
+
+
+class EvalSampler:
+    """
+    Decides which outputs get evaluated, per intent.
+
+    Intents without a rate are always evaluated. Sampling is
+    deterministic: with rate 0.25 exactly every fourth output of that
+    intent is evaluated (the first, fifth, ninth, ...), so low rates
+    still give a steady trickle. Rates are kept as exact fractions, so
+    the spacing doesn't drift the way float credit would.
+    """
+
+    def __init__(self, rates: dict[str, float] | str | None = None):
+        if rates is None:
+            rates = EVAL_SAMPLE_RATES
+        if isinstance(rates, str):
+            rates = parse_sample_rates(rates)
+        self.rates = {
+            intent.upper(): Fraction(rate).limit_denominator(1_000_000) for intent, rate in rates.items()
+        }
+        self._credit: dict[str, Fraction] = {}
+        self._lock = threading.Lock()
+
+    def should_evaluate(self, intent: str) -> bool:
+        intent = intent.upper()
+        rate = self.rates.get(intent)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        with self._lock:
+            credit = self._credit.get(intent, 1 - rate) + rate
+            if credit >= 1:
+                self._credit[intent] = credit - 1
+                return True
+            self._credit[intent] = credit
+            return False
+
+
+class BackgroundEvaluator:
+    """
+    Runs evaluations on a worker thread behind a bounded queue.
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        max_queue: int = EVAL_QUEUE_SIZE,
+        callback: EvaluationCallback | None = None,
+    ):
+        self.evaluator = evaluator
+        self.callback = callback
+        self.max_queue = max_queue
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._counts = {"submitted": 0, "evaluated": 0, "failed": 0, "dropped": 0}
+        self.max_depth = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="background-evaluator", daemon=True)
+        self._thread.start()
+
+    def submit(self, task_type: str, user_input: str, output_text: str) -> Future | None:
+        """
+        Queue one evaluation. Never blocks: returns None if the queue is
+        full (the evaluation is dropped) or the evaluator is closed.
+        """
+        if self._closed:
+            return None
+
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((future, task_type, user_input, output_text))
+        except queue.Full:
+            with self._lock:
+                self._counts["dropped"] += 1
+                dropped = self._counts["dropped"]
+            # Log the first drop and then every 100th, not every one
+            if dropped == 1 or dropped % 100 == 0:
+                logger.warning("Evaluation queue full (%d); %d evaluations dropped", self.max_queue, dropped)
+            return None
+
+        with self._lock:
+            self._counts["submitted"] += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return future
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._evaluate(*item)
+            finally:
+                self._queue.task_done()
+
+    def _evaluate(self, future: Future, task_type: str, user_input: str, output_text: str):
+        try:
+            summary = self.evaluator.evaluate(task_type, user_input, output_text)
+        except Exception as e:
+            logger.exception("Background evaluation failed for task_type=%s", task_type)
+            with self._lock:
+                self._counts["failed"] += 1
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._counts["evaluated"] += 1
+        future.set_result(summary)
+
+        if self.callback is not None:
+            try:
+                self.callback(task_type, user_input, summary)
+            except Exception:
+                logger.exception("Evaluation callback failed")
+
+    def stats(self) -> dict:
+        """
+        Counters: submitted, evaluated, failed, dropped (queue full),
+        plus the current queue depth and the deepest it has been.
+        """
+        with self._lock:
+            return {**self._counts, "queued": self._queue.qsize(), "max_depth": self.max_depth}
+
+    def join(self):
+        """
+        Wait until everything queued so far has been evaluated.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Finish the queued evaluations, stop the worker and flush metrics.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.evaluator.flush()
@@ -1,11 +1,13 @@
 # src/agents/email_agent.py
 
+import asyncio
 import logging
+from typing import Iterator
 
 from agents.memory_agent import MemoryAgent
 from utils.prompts import build_email_prompt
-from utils.llm_client import FakeLLMClient, RealLLMClient
-from config import USE_FAKE_LLM
+from utils.llm_pool import get_pool
+from utils.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -17,20 +19,15 @@ class EmailAgent:
     - LLMClient (Fake or Real) for generation
     """
 
-    def __init__(self):
+    def __init__(self, memory_agent: MemoryAgent | None = None, llm=None):
         logger.info("Initializing EmailAgent")
-        self.memory_agent = MemoryAgent()
+        self.memory_agent = memory_agent or MemoryAgent()
 
-        if USE_FAKE_LLM:
-            logger.info("EmailAgent using FakeLLMClient")
-            self.llm = FakeLLMClient()
-        else:
-            logger.info("EmailAgent using RealLLMClient")
-            self.llm = RealLLMClient()
-
-    def generate_email(self, user_request: str) -> str:
-        logger.info("Generating email for request: %s", user_request)
+        # Shared, rate-limited client from the process-wide pool
+        self.llm = llm or get_pool().get()
 
+    @traced("email.prompt")
+    def _build_prompt(self, user_request: str) -> str:
         signature = self.memory_agent.get_preference(
             "email_signature",
             default="Best regards,\nAI Business Assistant"
@@ -38,8 +35,36 @@ class EmailAgent:
 
         logger.info("Using email signature: %s", signature)
 
-        prompt = build_email_prompt(user_request, signature)
+        return build_email_prompt(user_request, signature)
+
+    def generate_email(self, user_request: str) -> str:
+        logger.info("Generating email for request: %s", user_request)
 
-        llm_output = self.llm.generate(prompt, max_tokens=512)
+        prompt = self._build_prompt(user_request)
+
+        with span("llm.generate", agent="email"):
+            llm_output = self.llm.generate(prompt, max_tokens=512)
 
         return llm_output
+
+    async def agenerate_email(self, user_request: str) -> str:
+        logger.info("Generating email (async) for request: %s", user_request)
+
+        # The preference lookup may touch SQLite, so keep it off the event loop.
+        prompt = await asyncio.to_thread(self._build_prompt, user_request)
+
+        with span("llm.generate", agent="email"):
+            llm_output = await self.llm.agenerate(prompt, max_tokens=512)
+
+        return llm_output
+
+    def generate_email_stream(self, user_request: str) -> Iterator[str]:
+        """
+        Like generate_email(), but yields the email piece by piece as the
+        LLM produces it.
+        """
+        logger.info("Generating email (streaming) for request: %s", user_request)
+
+        prompt = self._build_prompt(user_request)
+
+        return self.llm.generate_stream(prompt, max_tokens=512)
@@ -0,0 +1,184 @@
+# src/agents/evaluation_rules.py
+
+"""
+Declarative scoring rules for EvaluatorAgent.
+
+A RuleSet is a base score plus a list of rules. Each rule that passes
+adds its points; each one that fails adds its note. The total is
+clamped to [0, 1].
+
+Rules:
+- Contains:   the text contains any of the given terms (case-insensitive)
+- MinLength:  the stripped text has at least `chars` characters
+- MinLines:   at least `count` non-blank lines
+- LinePrefix: at least `count` lines start (after indentation) with one
+              of the given prefixes
+
+Lines are split and stripped the way str.splitlines() and str.strip()
+do it. score() on one text lowercases and splits it once for all the
+rules. score_batch() checks a whole pandas Series of texts with
+vectorized string operations (pandas is only imported for batches, so
+single evaluations stay cheap to start).
+"""
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+class Rule:
+    """
+    Base class: `points` added when the rule passes, `note` when it fails.
+    """
+
+    def __init__(self, points: float, note: str):
+        self.points = points
+        self.note = note
+
+    def passes(self, text: str, lower: str, lines: list[str]) -> bool:
+        """
+        `lower` is the lowercased text, `lines` its stripped non-blank lines.
+        """
+        raise NotImplementedError
+
+
+class Contains(Rule):
+    def __init__(self, terms: str | tuple[str, ...], points: float, note: str):
+        super().__init__(points, note)
+        self.terms = tuple(t.lower() for t in ((terms,) if isinstance(terms, str) else terms))
+
+    def passes(self, text: str, lower: str, lines: list[str]) -> bool:
+        return any(term in lower for term in self.terms)
+
+
+class MinLength(Rule):
+    def __init__(self, chars: int, points: float, note: str):
+        super().__init__(points, note)
+        self.chars = chars
+
+    def passes(self, text: str, lower: str, lines: list[str]) -> bool:
+        return len(text.strip()) >= self.chars
+
+
+class MinLines(Rule):
+    def __init__(self, count: int, points: float, note: str):
+        super().__init__(points, note)
+        self.count = count
+
+    def passes(self, text: str, lower: str, lines: list[str]) -> bool:
+        return len(lines) >= self.count
+
+
+class LinePrefix(Rule):
+    def __init__(self, prefixes: tuple[str, ...], points: float, note: str, count: int = 1):
+        super().__init__(points, note)
+        self.prefixes = tuple(prefixes)
+        self.count = count
+
+    def passes(self, text: str, lower: str, lines: list[str]) -> bool:
+        return sum(1 for line in lines if line.startswith(self.prefixes)) >= self.count
+
+
+# Line boundaries of str.splitlines()
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+# Start of a line (start of the text or after a line break), then its
+# indentation; "\S" after it means the line is not blank
+_LINE_START = rf"(?:^|(?<=[{_LINE_BREAKS}]))[^\S{_LINE_BREAKS}]*"
+
+
+class RuleSet:
+    """
+    The rules for one task type. score(text) returns
+    (score, notes for the failed rules).
+    """
+
+    def __init__(self, rules: list[Rule], base: float = 0.5):
+        self.rules = list(rules)
+        self.base = base
+        self._needs_lines = any(isinstance(r, (MinLines, LinePrefix)) for r in self.rules)
+
+    def score(self, text: str) -> tuple[float, list[str]]:
+        lower = text.lower()
+        lines = [line for line in map(str.strip, text.splitlines()) if line] if self._needs_lines else []
+
+        score = self.base
+        notes = []
+        for rule in self.rules:
+            if rule.passes(text, lower, lines):
+                score += rule.points
+            else:
+                notes.append(rule.note)
+
+        return max(0.0, min(1.0, score)), notes
+
+    def score_batch(self, texts: "pd.Series") -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        score() for every text in a Series, one vectorized operation per
+        rule instead of a Python loop per text. Returns the scores and
+        the notes joined with '; ' ('' where every rule passed).
+        """
+        import numpy as np
+
+        texts = texts.fillna("").astype(str)
+        lower = None
+        stripped_length = None
+
+        scores = np.full(len(texts), self.base, dtype=float)
+        # Bit i is set where rule i failed; each distinct combination of
+        # failures is joined into a notes string once, not once per text.
+        failed = np.zeros(len(texts), dtype=np.int64)
+        for bit, rule in enumerate(self.rules):
+            if isinstance(rule, Contains):
+                if lower is None:
+                    lower = texts.str.lower()
+                passed = np.zeros(len(texts), dtype=bool)
+                for term in rule.terms:
+                    passed |= lower.str.contains(term, regex=False).to_numpy(dtype=bool)
+            elif isinstance(rule, MinLength):
+                if stripped_length is None:
+                    stripped_length = texts.str.strip().str.len().to_numpy()
+                passed = stripped_length >= rule.chars
+            elif isinstance(rule, MinLines):
+                passed = texts.str.count(_LINE_START + r"\S").to_numpy() >= rule.count
+            else:
+                pattern = _LINE_START + f"(?:{'|'.join(re.escape(p) for p in rule.prefixes)})"
+                passed = texts.str.count(pattern).to_numpy() >= rule.count
+
+            scores += np.where(passed, rule.points, 0.0)
+            failed |= np.where(passed, 0, 1 << bit)
+
+        np.clip(scores, 0.0, 1.0, out=scores)
+
+        combinations, codes = np.unique(failed, return_inverse=True)
+        joined = np.array(
+            ["; ".join(r.note for i, r in enumerate(self.rules) if c >> i & 1) for c in combinations.tolist()],
+            dtype=object,
+        )
+        return scores, joined[codes.reshape(-1)]
+
+
+DEFAULT_RULES: dict[str, RuleSet] = {
+    "EMAIL": RuleSet([
+        Contains("subject:", 0.1, "Missing subject line"),
+        Contains("dear ", 0.1, "Missing greeting (e.g., 'Dear ...')"),
+        Contains(("regards", "thanks"), 0.1, "Missing closing signature (e.g., 'Regards', 'Thanks')"),
+        MinLength(50, 0.1, "Email very short; may be low quality"),
+    ]),
+    "REPORT": RuleSet([
+        Contains("total revenue", 0.1, "Report missing 'Total revenue'"),
+        Contains("total profit", 0.1, "Report missing 'Total profit'"),
+        MinLines(5, 0.1, "Report seems too short (few lines)"),
+    ]),
+    "MEETING": RuleSet([
+        Contains("meeting summary", 0.1, "Missing 'Meeting Summary' section title"),
+        Contains("action items", 0.1, "Missing 'Action Items' section title"),
+        LinePrefix(("1.", "2.", "3.", "4.", "5."), 0.1, "No numbered action items found"),
+    ]),
+    "GENERAL": RuleSet([
+        MinLength(31, 0.1, "Output extremely short; may be low value"),
+    ]),
+}
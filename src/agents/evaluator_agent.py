@@ -1,9 +1,22 @@
 # src/agents/evaluator_agent.py
 
 import logging
-import csv
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+from agents.evaluation_rules import DEFAULT_RULES, Rule, RuleSet
+from utils.metrics_sink import CSVMetricsSink, SQLiteMetricsSink
+from utils.tracing import traced
+from config import (
+    METRICS_BACKEND,
+    METRICS_BATCH_SIZE,
+    METRICS_FLUSH_INTERVAL,
+    METRICS_PER_PROCESS,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -12,145 +25,65 @@ class EvaluatorAgent:
     Agent for evaluating the quality of other agents' outputs.
 
     It uses simple rule-based checks to compute a score between 0 and 1
-    and logs the metrics to a CSV file for later analysis.
+    and logs the metrics to a CSV file (or SQLite) for later analysis.
+    The rules per task type are RuleSets (see evaluation_rules);
+    register_task_type() adds or replaces them. evaluate_batch() scores
+    many outputs at once.
+
+    Metrics rows are buffered and written in batches by a background
+    thread, so the file I/O is not part of request latency. Call flush()
+    to force pending rows out.
     """
 
-    def __init__(self, metrics_path: str = "data/metrics.csv"):
+    def __init__(self, metrics_path: str = "data/metrics.csv", sink=None):
         logger.info("Initializing EvaluatorAgent")
         self.metrics_path = Path(metrics_path)
-        self._ensure_metrics_file()
-
-    def _ensure_metrics_file(self):
-        """
-        Make sure the metrics CSV exists with a header row.
-        """
-        self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
-
-        if not self.metrics_path.exists():
-            with self.metrics_path.open("w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(
-                    ["timestamp", "task_type", "output_length", "score", "notes"]
-                )
-            logger.info("Created metrics file at %s", self.metrics_path)
 
-    def _score_email(self, output_text: str) -> tuple[float, list[str]]:
-        """
-        Score an email based on simple structure:
-        - Contains 'Subject:'
-        - Contains a greeting (e.g., 'Dear')
-        - Contains a signature (e.g., 'Best regards' or 'Thanks')
-        """
-        notes: list[str] = []
-        score = 0.5  # base
-
-        text_lower = output_text.lower()
-
-        if "subject:" in text_lower:
-            score += 0.1
-        else:
-            notes.append("Missing subject line")
-
-        if "dear " in text_lower:
-            score += 0.1
-        else:
-            notes.append("Missing greeting (e.g., 'Dear ...')")
-
-        if "regards" in text_lower or "thanks" in text_lower:
-            score += 0.1
-        else:
-            notes.append("Missing closing signature (e.g., 'Regards', 'Thanks')")
-
-        # Length check (too short => suspicious)
-        if len(output_text.strip()) < 50:
-            notes.append("Email very short; may be low quality")
-        else:
-            score += 0.1
-
-        # Clamp score between 0 and 1
-        score = max(0.0, min(1.0, score))
-        return score, notes
+        if sink is None:
+            sink = self._build_sink()
+        self.sink = sink
+
+        self.rules: dict[str, RuleSet] = dict(DEFAULT_RULES)
+
+    def _build_sink(self):
+        if METRICS_BACKEND == "sqlite":
+            return SQLiteMetricsSink(
+                str(self.metrics_path.with_suffix(".db")),
+                batch_size=METRICS_BATCH_SIZE,
+                flush_interval=METRICS_FLUSH_INTERVAL,
+            )
+        return CSVMetricsSink(
+            str(self.metrics_path),
+            batch_size=METRICS_BATCH_SIZE,
+            flush_interval=METRICS_FLUSH_INTERVAL,
+            per_process=METRICS_PER_PROCESS,
+        )
 
-    def _score_report(self, output_text: str) -> tuple[float, list[str]]:
+    def flush(self):
         """
-        Score a report:
-        - Mentions key metrics like 'Total revenue' and 'Total profit'
-        - Has multiple lines
+        Write any buffered metrics rows now.
         """
-        notes: list[str] = []
-        score = 0.5
-
-        text_lower = output_text.lower()
-
-        if "total revenue" in text_lower:
-            score += 0.1
-        else:
-            notes.append("Report missing 'Total revenue'")
-
-        if "total profit" in text_lower:
-            score += 0.1
-        else:
-            notes.append("Report missing 'Total profit'")
-
-        lines = [l for l in output_text.splitlines() if l.strip()]
-        if len(lines) >= 5:
-            score += 0.1
-        else:
-            notes.append("Report seems too short (few lines)")
-
-        score = max(0.0, min(1.0, score))
-        return score, notes
+        self.sink.flush()
 
-    def _score_meeting(self, output_text: str) -> tuple[float, list[str]]:
+    def close(self):
         """
-        Score a meeting summary:
-        - Has a 'Meeting Summary' section
-        - Has an 'Action Items' section with at least one item
+        Flush and stop the background metrics writer.
         """
-        notes: list[str] = []
-        score = 0.5
-
-        text_lower = output_text.lower()
-
-        if "meeting summary" in text_lower:
-            score += 0.1
-        else:
-            notes.append("Missing 'Meeting Summary' section title")
-
-        if "action items" in text_lower:
-            score += 0.1
-        else:
-            notes.append("Missing 'Action Items' section title")
+        self.sink.close()
 
-        # Count action item-like lines (starting with number + dot)
-        action_like_lines = [
-            l for l in output_text.splitlines()
-            if l.strip().startswith(("1.", "2.", "3.", "4.", "5."))
-        ]
-
-        if len(action_like_lines) >= 1:
-            score += 0.1
-        else:
-            notes.append("No numbered action items found")
-
-        score = max(0.0, min(1.0, score))
-        return score, notes
-
-    def _score_general(self, output_text: str) -> tuple[float, list[str]]:
+    def register_task_type(self, task_type: str, rules: RuleSet | list[Rule], base: float = 0.5):
         """
-        Fallback scoring for GENERAL outputs.
+        Score `task_type` outputs with these rules (replacing any existing
+        ones). Unknown task types are scored with the GENERAL rules.
         """
-        notes: list[str] = []
-        score = 0.5
-
-        if len(output_text.strip()) > 30:
-            score += 0.1
-        else:
-            notes.append("Output extremely short; may be low value")
+        if not isinstance(rules, RuleSet):
+            rules = RuleSet(rules, base)
+        self.rules[task_type.upper()] = rules
 
-        score = max(0.0, min(1.0, score))
-        return score, notes
+    def _rules_for(self, task_type: str) -> RuleSet:
+        return self.rules.get(task_type, self.rules["GENERAL"])
 
+    @traced("evaluator.evaluate")
     def evaluate(self, task_type: str, user_input: str, output_text: str) -> str:
         """
         Main entry point.
@@ -161,24 +94,15 @@ class EvaluatorAgent:
         task_type = task_type.upper()
         logger.info("Evaluating output for task_type=%s", task_type)
 
-        if task_type == "EMAIL":
-            score, notes = self._score_email(output_text)
-        elif task_type == "REPORT":
-            score, notes = self._score_report(output_text)
-        elif task_type == "MEETING":
-            score, notes = self._score_meeting(output_text)
-        else:
-            score, notes = self._score_general(output_text)
+        score, notes = self._rules_for(task_type).score(output_text)
 
         output_length = len(output_text)
 
-        # Log to CSV
+        # Queue the metrics row (written in the background)
         timestamp = datetime.utcnow().isoformat()
         notes_str = "; ".join(notes) if notes else "OK"
 
-        with self.metrics_path.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([timestamp, task_type, output_length, score, notes_str])
+        self.sink.write([timestamp, task_type, output_length, score, notes_str])
 
         logger.info(
             "Evaluation done: task_type=%s, length=%d, score=%.2f, notes=%s",
@@ -200,3 +124,53 @@ class EvaluatorAgent:
             lines.append("Notes: OK")
 
         return "\n".join(lines)
+
+    def evaluate_batch(
+        self,
+        task_types: str | list[str],
+        outputs: "list[str] | pd.Series",
+        record: bool = False,
+    ) -> "pd.DataFrame":
+        """
+        Score many outputs at once, e.g. to re-score old outputs under new
+        rules. `task_types` is one task type for all outputs or one per
+        output. Each task type's rules run as vectorized string
+        operations over all of its outputs.
+
+        Returns a DataFrame with task_type, output_length, score and
+        notes ('; '-joined, 'OK' if none), in input order. With
+        record=True the rows are also written to the metrics sink.
+        """
+        import numpy as np
+        import pandas as pd
+
+        outputs = pd.Series(outputs, dtype=object).reset_index(drop=True).fillna("").astype(str)
+        if isinstance(task_types, str):
+            task_types = [task_types] * len(outputs)
+        if len(task_types) != len(outputs):
+            raise ValueError("task_types and outputs must have the same length")
+
+        types = pd.Series(task_types, dtype=object).str.upper()
+        codes, names = pd.factorize(types)
+        scores = np.zeros(len(outputs))
+        notes = np.empty(len(outputs), dtype=object)
+
+        for code, task_type in enumerate(names):
+            index = np.flatnonzero(codes == code)
+            scores[index], notes[index] = self._rules_for(task_type).score_batch(outputs.iloc[index])
+
+        notes[notes == ""] = "OK"
+        result = pd.DataFrame({
+            "task_type": types,
+            "output_length": outputs.str.len(),
+            "score": scores,
+            "notes": notes,
+        })
+        logger.info("Batch evaluation of %d outputs done", len(result))
+
+        if record:
+            timestamp = datetime.utcnow().isoformat()
+            for row in result.itertuples(index=False):
+                self.sink.write([timestamp, row.task_type, row.output_length, row.score, row.notes])
+
+        return result
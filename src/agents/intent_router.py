@@ -0,0 +1,112 @@
+# src/agents/intent_router.py
+
+"""
+Keyword-based intent routing.
+
+All keyword rules are compiled into one lookup table keyed by word
+sequences. Routing a message tokenizes it once and looks up every word
+n-gram (up to the longest registered phrase), so the cost depends on
+the length of the message, not on how many keywords are registered.
+
+Keywords only match whole words ("mail" does not match inside "email").
+Each matched keyword adds its weight to its intent, and the intent with
+the highest total wins. Ties go to the intent registered first.
+"""
+
+import re
+
+# Words are runs of letters/digits; '_', '.', '-' etc. separate words
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+class IntentRouter:
+    """
+    Routes free text to an intent name using weighted keyword rules.
+    """
+
+    def __init__(self, default_intent: str = "GENERAL"):
+        self.default_intent = default_intent
+        self._prefixes: list[tuple[str, str]] = []
+        self._table: dict[tuple[str, ...], list[tuple[str, float]]] = {}
+        self._priority: dict[str, int] = {}
+        self._max_ngram = 1
+
+    def add_prefix(self, intent: str, prefix: str):
+        """
+        Route any text that starts with `prefix` (case-insensitive) to
+        `intent`, before keyword scoring. Checked in registration order.
+        """
+        self._register_intent(intent)
+        self._prefixes.append((prefix.lower(), intent))
+
+    def register(self, intent: str, keywords: list[str], weight: float = 1.0):
+        """
+        Add keywords (single words or multi-word phrases) for an intent.
+        """
+        self._register_intent(intent)
+        for keyword in keywords:
+            words = tuple(tokenize(keyword))
+            if not words:
+                raise ValueError(f"Keyword has no words: {keyword!r}")
+            self._table.setdefault(words, []).append((intent, weight))
+            self._max_ngram = max(self._max_ngram, len(words))
+
+    def _register_intent(self, intent: str):
+        self._priority.setdefault(intent, len(self._priority))
+
+    def scores(self, text: str) -> dict[str, float]:
+        """
+        Total keyword weight per intent. Each distinct keyword counts once.
+        """
+        words = tokenize(text)
+        table = self._table
+        matched = set()
+
+        for n in range(1, self._max_ngram + 1):
+            for i in range(len(words) - n + 1):
+                key = tuple(words[i:i + n])
+                if key in table:
+                    matched.add(key)
+
+        totals: dict[str, float] = {}
+        for key in matched:
+            for intent, weight in table[key]:
+                totals[intent] = totals.get(intent, 0.0) + weight
+        return totals
+
+    def route(self, text: str) -> str:
+        lowered = text.lower()
+        for prefix, intent in self._prefixes:
+            if lowered.startswith(prefix):
+                return intent
+
+        totals = self.scores(text)
+        if not totals:
+            return self.default_intent
+
+        return min(totals, key=lambda intent: (-totals[intent], self._priority[intent]))
+
+
+def build_default_router() -> IntentRouter:
+    """
+    The rules PlannerAgent uses out of the box.
+    """
+    router = IntentRouter()
+
+    router.add_prefix("PREFERENCE", "set ")
+    router.register("SHOW_PREFS", ["show preferences"], weight=100.0)
+
+    # 'summarize' is a generic verb, so it only tips the balance when
+    # nothing more specific is mentioned ("summarize the sales report").
+    router.register("MEETING", ["meeting", "meetings", "minutes", "transcript"])
+    router.register("MEETING", ["summarize", "summarise", "summary"], weight=0.5)
+
+    router.register("EMAIL", ["email", "emails", "mail", "mails"], weight=2.0)
+
+    router.register("REPORT", ["report", "reports", "csv", "sales"])
+
+    return router
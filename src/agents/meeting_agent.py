@@ -1,30 +1,88 @@
 # src/agents/meeting_agent.py
 
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
-from utils.prompts import build_meeting_summary_prompt
-from utils.llm_client import FakeLLMClient, RealLLMClient
-from config import USE_FAKE_LLM
+from utils.prompts import (
+    build_meeting_summary_prompt,
+    build_meeting_chunk_prompt,
+    build_meeting_reduce_prompt,
+    get_template,
+    prompt_budget,
+)
+from utils.llm_pool import get_pool
+from utils.tracing import span, traced
+from utils.llm_cache import (
+    ERROR_PREFIXES,
+    InMemoryCacheBackend,
+    SQLiteCacheBackend,
+    cache_key,
+)
+from utils.transcript import (
+    estimate_tokens,
+    format_meeting_summary,
+    merge_action_items,
+    pack_texts,
+    parse_summary,
+    split_transcript,
+)
+from config import (
+    MEETING_CHUNK_TOKENS,
+    MEETING_MAX_PARALLEL,
+    MEETING_CHUNK_CACHE,
+    MEETING_CHUNK_CACHE_PATH,
+)
 
 logger = logging.getLogger(__name__)
 
+
+def _default_chunk_cache():
+    if MEETING_CHUNK_CACHE == "sqlite":
+        return SQLiteCacheBackend(MEETING_CHUNK_CACHE_PATH)
+    if MEETING_CHUNK_CACHE == "memory":
+        return InMemoryCacheBackend()
+    return None
+
+
 class MeetingAgent:
     """
     Agent for summarizing meeting transcripts and extracting action items.
     Uses LLMClient (Fake or Real) behind the scenes.
+
+    Transcripts longer than `chunk_tokens` (or than what fits the
+    model's context in the prompt) are summarized map-reduce style:
+    split into chunks at speaker/paragraph boundaries, each chunk
+    summarized in parallel (up to `max_parallel` at once), then the
+    partial summaries combined and the action items merged. Chunk
+    summaries are cached by content, so after an edit only the changed
+    chunks go back to the LLM.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        llm=None,
+        chunk_tokens: int = MEETING_CHUNK_TOKENS,
+        max_parallel: int = MEETING_MAX_PARALLEL,
+        chunk_cache=None,
+    ):
         logger.info("Initializing MeetingAgent")
 
-        if USE_FAKE_LLM:
-            logger.info("MeetingAgent using FakeLLMClient")
-            self.llm = FakeLLMClient()
-        else:
-            logger.info("MeetingAgent using RealLLMClient")
-            self.llm = RealLLMClient()
+        # Shared, rate-limited client from the process-wide pool
+        self.llm = llm or get_pool().get()
 
+        # Chunks must also fit the model's context in the summary prompts
+        budget = prompt_budget(512)
+        fits = min(get_template(name).field_budget(budget) for name in ("meeting_summary", "meeting_chunk"))
+        if fits < chunk_tokens:
+            logger.info("Meeting chunks capped at %d tokens by the context limit", fits)
+        self.chunk_tokens = min(chunk_tokens, fits)
+        self.max_parallel = max_parallel
+        self.chunk_cache = chunk_cache if chunk_cache is not None else _default_chunk_cache()
+
+    @traced("meeting.load")
     def _load_transcript(self, file_path: str) -> str:
         path = Path(file_path)
         logger.info("Loading meeting transcript from: %s", path)
@@ -40,11 +98,124 @@ class MeetingAgent:
 
         return text
 
+    def _is_long(self, transcript: str) -> bool:
+        return estimate_tokens(transcript) > self.chunk_tokens
+
     def summarize_meeting(self, file_path: str) -> str:
         transcript = self._load_transcript(file_path)
 
-        prompt = build_meeting_summary_prompt(transcript)
+        if self._is_long(transcript):
+            return self.summarize_long_transcript(transcript)
 
-        llm_output = self.llm.generate(prompt, max_tokens=512)
+        with span("meeting.prompt"):
+            prompt = build_meeting_summary_prompt(transcript)
+
+        with span("llm.generate", agent="meeting"):
+            llm_output = self.llm.generate(prompt, max_tokens=512)
 
         return llm_output
+
+    async def asummarize_meeting(self, file_path: str) -> str:
+        transcript = await asyncio.to_thread(self._load_transcript, file_path)
+
+        if self._is_long(transcript):
+            # The chunk calls already run in parallel on a thread pool
+            return await asyncio.to_thread(self.summarize_long_transcript, transcript)
+
+        with span("meeting.prompt"):
+            prompt = build_meeting_summary_prompt(transcript)
+
+        with span("llm.generate", agent="meeting"):
+            llm_output = await self.llm.agenerate(prompt, max_tokens=512)
+
+        return llm_output
+
+    def summarize_meeting_stream(self, file_path: str) -> Iterator[str]:
+        """
+        Like summarize_meeting(), but yields the summary piece by piece.
+        The transcript is loaded right away, so a missing or empty file
+        raises here rather than part-way through the stream.
+
+        Long transcripts are summarized in chunks first and yielded in
+        one piece.
+        """
+        transcript = self._load_transcript(file_path)
+
+        if self._is_long(transcript):
+            return iter([self.summarize_long_transcript(transcript)])
+
+        with span("meeting.prompt"):
+            prompt = build_meeting_summary_prompt(transcript)
+
+        return self.llm.generate_stream(prompt, max_tokens=512)
+
+    # ---------- map-reduce for long transcripts ----------
+
+    def _cached_generate(self, prompt: str) -> str:
+        """
+        generate() through the chunk cache. Error replies are not cached.
+        """
+        if self.chunk_cache is None:
+            with span("llm.generate", agent="meeting", chunk=True):
+                return self.llm.generate(prompt, max_tokens=512)
+
+        provider = getattr(self.llm, "provider", "")
+        model = getattr(self.llm, "model_name", type(self.llm).__name__)
+        key = cache_key(provider, model, prompt, 512)
+
+        entry = self.chunk_cache.get(key)
+        if entry is not None:
+            return entry[0]
+
+        with span("llm.generate", agent="meeting", chunk=True):
+            response = self.llm.generate(prompt, max_tokens=512)
+        if not response.startswith(ERROR_PREFIXES):
+            self.chunk_cache.put(key, response, 0.0)
+        return response
+
+    def _generate_all(self, prompts: list[str]) -> list[str]:
+        if len(prompts) == 1:
+            return [self._cached_generate(prompts[0])]
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            return list(pool.map(self._cached_generate, prompts))
+
+    @traced("meeting.map_reduce")
+    def summarize_long_transcript(self, transcript: str) -> str:
+        """
+        Map: summarize each chunk. Reduce: combine the chunk summaries
+        (in rounds, if they are still too long together) and merge the
+        action items. Returns the first LLM error instead, if any.
+        """
+        chunks = split_transcript(transcript, self.chunk_tokens)
+        logger.info("Summarizing transcript in %d chunks", len(chunks))
+
+        partials = self._generate_all([build_meeting_chunk_prompt(c) for c in chunks])
+        for partial in partials:
+            if partial.startswith(ERROR_PREFIXES):
+                return partial
+
+        parsed = [parse_summary(p) for p in partials]
+        summaries = [summary for summary, _ in parsed]
+        action_items = merge_action_items(item for _, items in parsed for item in items)
+
+        # Budget for the reduce prompt's input; it holds summaries, not transcript
+        while len(summaries) > 1 and estimate_tokens("\n\n".join(summaries)) > self.chunk_tokens:
+            groups = pack_texts(summaries, self.chunk_tokens)
+            if len(groups) == len(summaries):
+                break
+            logger.info("Reducing %d partial summaries in %d groups", len(summaries), len(groups))
+            reduced = self._generate_all([build_meeting_reduce_prompt(g) for g in groups])
+            for text in reduced:
+                if text.startswith(ERROR_PREFIXES):
+                    return text
+            summaries = [parse_summary(text)[0] for text in reduced]
+
+        if len(summaries) == 1:
+            summary = summaries[0]
+        else:
+            final = self._cached_generate(build_meeting_reduce_prompt(summaries))
+            if final.startswith(ERROR_PREFIXES):
+                return final
+            summary = parse_summary(final)[0]
+
+        return format_meeting_summary(summary, action_items)
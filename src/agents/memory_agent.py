@@ -8,8 +8,8 @@ class MemoryAgent:
     Uses MemoryStore under the hood.
     """
 
-    def __init__(self):
-        self.store = MemoryStore()
+    def __init__(self, store: MemoryStore | None = None):
+        self.store = store or MemoryStore()
 
     def set_preference(self, key: str, value: str):
         """
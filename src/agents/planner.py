@@ -1,12 +1,15 @@
 # src/agents/planner.py
 
+import asyncio
 import logging
+from functools import cached_property
+from typing import Callable, Iterator
 
-from agents.email_agent import EmailAgent
-from agents.report_agent import ReportAgent
-from agents.memory_agent import MemoryAgent
-from agents.meeting_agent import MeetingAgent
-from agents.evaluator_agent import EvaluatorAgent
+from agents.registry import AgentRegistry
+from agents.intent_router import IntentRouter, build_default_router
+from agents.background_evaluator import BackgroundEvaluator, EvalSampler, EvaluationCallback
+from config import EVAL_MODE, LLM_MAX_CONCURRENCY, REPORT_SOURCE
+from utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -17,15 +20,118 @@ class PlannerAgent:
     - Routes to correct sub-agent (Email, Report, Meeting)
     - Handles simple preference commands
     - Sends outputs to EvaluatorAgent for scoring
+
+    handle_request() is blocking. ahandle_request() / ahandle_requests()
+    are the asyncio versions, so many requests can wait on the LLM at once.
+    handle_request_stream() yields the response as the LLM produces it.
+
+    Sub-agents come from an AgentRegistry and are only built the first
+    time a request needs them.
+
+    With evaluation='sync' the evaluation summary is appended to each
+    response. With 'background' the response is returned right away and
+    the output is scored on a BackgroundEvaluator; `on_evaluation(intent,
+    user_input, summary)` is called once it is done. `sample_rates`
+    (intent -> fraction, default EVAL_SAMPLE_RATES) applies to both.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        router: IntentRouter | None = None,
+        registry: AgentRegistry | None = None,
+        evaluation: str = EVAL_MODE,
+        on_evaluation: EvaluationCallback | None = None,
+        sample_rates: dict[str, float] | None = None,
+    ):
         logger.info("Initializing PlannerAgent")
-        self.email_agent = EmailAgent()
-        self.report_agent = ReportAgent()
-        self.memory_agent = MemoryAgent()
-        self.meeting_agent = MeetingAgent()
-        self.evaluator_agent = EvaluatorAgent()
+        if evaluation not in ("sync", "background"):
+            raise ValueError(f"Unknown evaluation mode {evaluation!r} (expected 'sync' or 'background')")
+
+        self.registry = registry or AgentRegistry()
+        self.max_concurrency = max_concurrency
+        self.router = router or build_default_router()
+        self.custom_handlers: dict[str, Callable[[str], str]] = {}
+        self.evaluation = evaluation
+        self.on_evaluation = on_evaluation
+        self.sampler = EvalSampler(sample_rates)
+
+    @cached_property
+    def email_agent(self):
+        return self.registry.email_agent()
+
+    @cached_property
+    def report_agent(self):
+        return self.registry.report_agent()
+
+    @cached_property
+    def memory_agent(self):
+        return self.registry.memory_agent()
+
+    @cached_property
+    def meeting_agent(self):
+        return self.registry.meeting_agent()
+
+    @cached_property
+    def evaluator_agent(self):
+        return self.registry.evaluator_agent()
+
+    @cached_property
+    def background_evaluator(self) -> BackgroundEvaluator:
+        return BackgroundEvaluator(self.evaluator_agent, callback=self.on_evaluation)
+
+    def _evaluation_suffix(self, task_type: str, user_input: str, response_text: str) -> str:
+        """
+        What to append to the response: the evaluation summary in 'sync'
+        mode, nothing if the output is sampled out or evaluated in the
+        background.
+        """
+        if not self.sampler.should_evaluate(task_type):
+            return ""
+        if self.evaluation == "background":
+            self.background_evaluator.submit(task_type, user_input, response_text)
+            return ""
+        return "\n\n---\n" + self.evaluator_agent.evaluate(task_type, user_input, response_text)
+
+    async def _aevaluation_suffix(self, task_type: str, user_input: str, response_text: str) -> str:
+        # Queueing never blocks; a synchronous evaluation writes metrics, so use a thread
+        if self.evaluation == "background":
+            return self._evaluation_suffix(task_type, user_input, response_text)
+        return await asyncio.to_thread(self._evaluation_suffix, task_type, user_input, response_text)
+
+    def evaluation_stats(self) -> dict:
+        """
+        Background evaluation counters (empty in 'sync' mode or before
+        the first evaluation).
+        """
+        background = self.__dict__.get("background_evaluator")
+        return background.stats() if background is not None else {}
+
+    def flush_evaluations(self):
+        """
+        Wait for queued background evaluations and write out buffered
+        metrics. Only touches what has been built.
+        """
+        background = self.__dict__.get("background_evaluator")
+        if background is not None:
+            background.join()
+        evaluator = self.__dict__.get("evaluator_agent")
+        if evaluator is not None:
+            evaluator.flush()
+
+    def register_intent(
+        self,
+        intent: str,
+        keywords: list[str],
+        handler: Callable[[str], str],
+        weight: float = 1.0,
+    ):
+        """
+        Add a custom intent: when its keywords win, handler(user_input)
+        produces the response. The output is evaluated as GENERAL text.
+        """
+        self.router.register(intent, keywords, weight)
+        self.custom_handlers[intent] = handler
 
     def _normalize_text(self, user_input: str) -> str:
         text = user_input.strip()
@@ -35,26 +141,13 @@ class PlannerAgent:
 
     def detect_intent(self, user_input: str) -> str:
         norm = self._normalize_text(user_input)
-        text = norm.lower()
 
         logger.info("Detecting intent for normalized text: %s", norm)
 
-        # Preference commands
-        if text.startswith("set "):
-            return "PREFERENCE"
-        if "show preferences" in text:
-            return "SHOW_PREFS"
-
-        # Meeting-related
-        if "meeting" in text or "minutes" in text or "summarize" in text:
-            return "MEETING"
-
-        if "email" in text or "mail" in text:
-            return "EMAIL"
-        elif "report" in text or "csv" in text or "sales" in text:
-            return "REPORT"
-        else:
-            return "GENERAL"
+        with span("planner.intent") as s:
+            intent = self.router.route(norm)
+            s.set("intent", intent)
+        return intent
 
     def handle_preference_command(self, user_input: str) -> str:
         text = self._normalize_text(user_input)
@@ -80,9 +173,21 @@ class PlannerAgent:
             )
 
     def handle_request(self, user_input: str) -> str:
-        intent = self.detect_intent(user_input)
-        logger.info("Detected intent: %s", intent)
+        return self.handle_request_with_intent(user_input)[1]
+
+    def handle_request_with_intent(self, user_input: str) -> tuple[str, str]:
+        """
+        Like handle_request(), but returns (intent, response), so callers
+        that report the intent don't have to route the input again.
+        """
+        with span("planner.request") as s:
+            intent = self.detect_intent(user_input)
+            logger.info("Detected intent: %s", intent)
+            s.set("intent", intent)
+
+            return intent, self._handle_intent(intent, user_input)
 
+    def _handle_intent(self, intent: str, user_input: str) -> str:
         # Preferences are not evaluated (they just set state)
         if intent == "PREFERENCE":
             return self.handle_preference_command(user_input)
@@ -90,8 +195,7 @@ class PlannerAgent:
         if intent == "SHOW_PREFS":
             prefs_text = self.memory_agent.list_preferences()
             # Evaluate as GENERAL text
-            evaluation = self.evaluator_agent.evaluate("GENERAL", user_input, prefs_text)
-            return prefs_text + "\n\n---\n" + evaluation
+            return prefs_text + self._evaluation_suffix("GENERAL", user_input, prefs_text)
 
         # Default response text
         response_text = ""
@@ -102,7 +206,7 @@ class PlannerAgent:
 
         elif intent == "REPORT":
             logger.info("Routing to ReportAgent")
-            file_path = "examples/sales_data.csv"
+            file_path = REPORT_SOURCE
             try:
                 response_text = self.report_agent.generate_report(file_path)
             except Exception as e:
@@ -118,16 +222,134 @@ class PlannerAgent:
                 logger.exception("Error in MeetingAgent")
                 response_text = f"Error summarizing meeting: {e}"
 
+        elif intent in self.custom_handlers:
+            logger.info("Routing to custom handler for %s", intent)
+            response_text = self.custom_handlers[intent](user_input)
+
         else:
             logger.info("Falling back to GENERAL handler")
-            response_text = (
-                "I didn't understand your request clearly.\n"
-                "Try including words like 'email', 'meeting', 'report', or 'sales'.\n"
-                "You can also set preferences, e.g.: set email signature to Thanks,\\nYour Name"
-            )
-
-        # Evaluate the response
-        evaluation_text = self.evaluator_agent.evaluate(intent, user_input, response_text)
+            response_text = self._general_response()
 
         # Show both the main response and evaluation summary
-        return response_text + "\n\n---\n" + evaluation_text
+        return response_text + self._evaluation_suffix(intent, user_input, response_text)
+
+    def handle_request_stream(self, user_input: str) -> Iterator[str]:
+        """
+        Streaming version of handle_request().
+
+        For EMAIL and MEETING, yields the LLM output as it arrives, then
+        the evaluation once the response is complete. Other intents do
+        not call the LLM, so their full response is yielded at once.
+        Joined together, the chunks equal handle_request()'s result.
+        """
+        intent = self.detect_intent(user_input)
+        logger.info("Detected intent: %s", intent)
+
+        if intent == "EMAIL":
+            logger.info("Routing to EmailAgent (streaming)")
+            chunks = self.email_agent.generate_email_stream(user_input)
+
+        elif intent == "MEETING":
+            logger.info("Routing to MeetingAgent (streaming)")
+            file_path = "examples/meeting_transcript.txt"
+            try:
+                chunks = self.meeting_agent.summarize_meeting_stream(file_path)
+            except Exception as e:
+                logger.exception("Error in MeetingAgent")
+                chunks = iter([f"Error summarizing meeting: {e}"])
+
+        else:
+            yield self._handle_intent(intent, user_input)
+            return
+
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        response_text = "".join(parts)
+
+        suffix = self._evaluation_suffix(intent, user_input, response_text)
+        if suffix:
+            yield suffix
+
+    def _general_response(self) -> str:
+        return (
+            "I didn't understand your request clearly.\n"
+            "Try including words like 'email', 'meeting', 'report', or 'sales'.\n"
+            "You can also set preferences, e.g.: set email signature to Thanks,\\nYour Name"
+        )
+
+    async def ahandle_request(self, user_input: str) -> str:
+        """
+        Async version of handle_request().
+
+        LLM calls are awaited; blocking work (SQLite, CSV parsing, the
+        metrics file) runs in worker threads so the event loop stays free.
+        """
+        return (await self.ahandle_request_with_intent(user_input))[1]
+
+    async def ahandle_request_with_intent(self, user_input: str) -> tuple[str, str]:
+        """
+        Like ahandle_request(), but returns (intent, response), so callers
+        that report the intent don't have to route the input again.
+        """
+        with span("planner.request") as s:
+            s.set("async", True)
+            intent = self.detect_intent(user_input)
+            s.set("intent", intent)
+            return intent, await self._ahandle_intent(intent, user_input)
+
+    async def _ahandle_intent(self, intent: str, user_input: str) -> str:
+        logger.info("Detected intent: %s", intent)
+
+        if intent in ("PREFERENCE", "SHOW_PREFS"):
+            return await asyncio.to_thread(self._handle_intent, intent, user_input)
+
+        response_text = ""
+
+        if intent == "EMAIL":
+            logger.info("Routing to EmailAgent (async)")
+            response_text = await self.email_agent.agenerate_email(user_input)
+
+        elif intent == "REPORT":
+            logger.info("Routing to ReportAgent (async)")
+            file_path = REPORT_SOURCE
+            try:
+                response_text = await asyncio.to_thread(
+                    self.report_agent.generate_report, file_path
+                )
+            except Exception as e:
+                logger.exception("Error in ReportAgent")
+                response_text = f"Error generating report: {e}"
+
+        elif intent == "MEETING":
+            logger.info("Routing to MeetingAgent (async)")
+            file_path = "examples/meeting_transcript.txt"
+            try:
+                response_text = await self.meeting_agent.asummarize_meeting(file_path)
+            except Exception as e:
+                logger.exception("Error in MeetingAgent")
+                response_text = f"Error summarizing meeting: {e}"
+
+        elif intent in self.custom_handlers:
+            logger.info("Routing to custom handler for %s", intent)
+            response_text = await asyncio.to_thread(self.custom_handlers[intent], user_input)
+
+        else:
+            logger.info("Falling back to GENERAL handler")
+            response_text = self._general_response()
+
+        return response_text + await self._aevaluation_suffix(intent, user_input, response_text)
+
+    async def ahandle_requests(self, user_inputs: list[str]) -> list[str]:
+        """
+        Handle many requests concurrently, at most `max_concurrency` at a
+        time. Results are returned in the same order as the inputs.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(user_input: str) -> str:
+            async with semaphore:
+                return await self.ahandle_request(user_input)
+
+        return await asyncio.gather(*(run_one(u) for u in user_inputs))
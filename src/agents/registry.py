@@ -0,0 +1,89 @@
+# src/agents/registry.py
+
+"""
+Lazy, shared construction of agents and their dependencies.
+
+Nothing is built (or even imported) until it is first asked for, so
+starting the CLI does not pay for pandas, the Gemini SDK or SQLite
+unless a request actually needs them. Each object is created once per
+registry and shared, e.g. EmailAgent and PlannerAgent use the same
+MemoryAgent / MemoryStore, and EmailAgent and MeetingAgent share one
+LLM client.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class AgentRegistry:
+    """
+    Builds each shared component on first use (thread-safe).
+    """
+
+    def __init__(self):
+        self._instances: dict[str, object] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory):
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                logger.info("Creating shared %s", name)
+                instance = factory()
+                self._instances[name] = instance
+            return instance
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    # ---------- shared dependencies ----------
+
+    def memory_store(self):
+        def build():
+            from memory.memory_store import MemoryStore
+            return MemoryStore()
+        return self._get("memory_store", build)
+
+    def llm_client(self):
+        def build():
+            from utils.llm_pool import get_pool
+            return get_pool().get()
+        return self._get("llm_client", build)
+
+    # ---------- agents ----------
+
+    def memory_agent(self):
+        def build():
+            from agents.memory_agent import MemoryAgent
+            return MemoryAgent(store=self.memory_store())
+        return self._get("memory_agent", build)
+
+    def email_agent(self):
+        def build():
+            from agents.email_agent import EmailAgent
+            return EmailAgent(memory_agent=self.memory_agent(), llm=self.llm_client())
+        return self._get("email_agent", build)
+
+    def meeting_agent(self):
+        def build():
+            from agents.meeting_agent import MeetingAgent
+            return MeetingAgent(llm=self.llm_client())
+        return self._get("meeting_agent", build)
+
+    def report_agent(self):
+        def build():
+            from agents.report_agent import ReportAgent
+            return ReportAgent()
+        return self._get("report_agent", build)
+
+    def evaluator_agent(self):
+        def build():
+            from agents.evaluator_agent import EvaluatorAgent
+            return EvaluatorAgent()
+        return self._get("evaluator_agent", build)
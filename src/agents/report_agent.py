@@ -1,19 +1,194 @@
 # src/agents/report_agent.py
 
 import logging
+from pathlib import Path
+
+import pandas as pd
+
 from tools.spreadsheet_parser import SpreadsheetTool
+from tools.report_state import ReportStateStore
+from tools.kpi_engine import KPI, KPIEngine, top_n
+from tools.rollup_store import UNDATED, RollupStore
+from utils.tracing import traced
+from config import (
+    REPORT_CHUNK_SIZE,
+    REPORT_INCREMENTAL,
+    REPORT_KPIS,
+    REPORT_ROLLUPS,
+    REPORT_STATE_DIR,
+    REPORT_STREAMING,
+)
 
 logger = logging.getLogger(__name__)
 
+# Columns the report actually needs; everything else is skipped when streaming.
+REPORT_COLUMNS = ["date", "revenue", "expenses"]
+
+# Dates repeat on every row, so 'category' stores each one only once per chunk.
+REPORT_DTYPES = {"date": "category"}
+
+# What the basic report is built from
+BASE_KPIS = [
+    KPI("total_revenue", "total", "revenue"),
+    KPI("total_expenses", "total", "expenses"),
+    KPI("revenue_by_date", "sum", "revenue", by="date"),
+]
+
+# Extra KPIs appended to the report when REPORT_KPIS is on
+DEFAULT_KPIS = [
+    KPI("revenue_by_client", "sum", "revenue", by="client"),
+    KPI("margin", "margin", "revenue"),
+    KPI("margin_by_client", "margin", "revenue", by="client"),
+    KPI("daily_revenue_growth", "growth", "revenue", by="date"),
+    KPI("revenue_3day_avg", "rolling", "revenue", by="date", window=3),
+    KPI("monthly_revenue", "sum", "revenue", by="date", period="M"),
+    KPI("top_clients", "top", "revenue", by="client", n=3),
+]
+
+
+class ReportAccumulator:
+    """
+    Running totals for a report, built up one DataFrame chunk at a time.
+
+    Only the sums and the per-date revenue are kept, so memory grows with
+    the number of distinct dates, not with the number of rows.
+    """
+
+    def __init__(self):
+        self.num_rows = 0
+        self.total_revenue = 0
+        self.total_expenses = 0
+        self.revenue_by_date: pd.Series | None = None
+
+    def add(self, df: pd.DataFrame):
+        """
+        Fold one chunk of rows into the running totals.
+        """
+        if df.empty:
+            return
+
+        self.num_rows += len(df)
+        self.total_revenue = self.total_revenue + df["revenue"].sum()
+        self.total_expenses = self.total_expenses + df["expenses"].sum()
+
+        partial = df.groupby("date", observed=True)["revenue"].sum()
+        partial.index = partial.index.astype(object)
+        self._merge_by_date(partial)
+
+    def merge(self, other: "ReportAccumulator"):
+        """
+        Fold in totals built up separately (e.g. from another file).
+        """
+        if other.num_rows == 0:
+            return
+
+        self.num_rows += other.num_rows
+        self.total_revenue = self.total_revenue + other.total_revenue
+        self.total_expenses = self.total_expenses + other.total_expenses
+        self._merge_by_date(other.revenue_by_date)
+
+    def _merge_by_date(self, partial: pd.Series):
+        if self.revenue_by_date is None:
+            merged = partial
+        else:
+            merged = pd.concat([self.revenue_by_date, partial])
+
+        # groupby keeps the original dtype (no NaN from index alignment)
+        # and sorts by date, like the in-memory report does.
+        self.revenue_by_date = merged.groupby(level=0).sum()
+        self.revenue_by_date.index.name = "date"
+
+    def to_dict(self) -> dict:
+        """
+        JSON-friendly copy of the running totals.
+        """
+        by_date = None
+        if self.revenue_by_date is not None:
+            by_date = {
+                "dates": [str(d) for d in self.revenue_by_date.index],
+                "values": self.revenue_by_date.tolist(),
+                "dtype": str(self.revenue_by_date.dtype),
+            }
+
+        return {
+            "num_rows": self.num_rows,
+            "total_revenue": _to_builtin(self.total_revenue),
+            "total_expenses": _to_builtin(self.total_expenses),
+            "revenue_by_date": by_date,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReportAccumulator":
+        acc = cls()
+        acc.num_rows = data["num_rows"]
+        acc.total_revenue = data["total_revenue"]
+        acc.total_expenses = data["total_expenses"]
+
+        by_date = data["revenue_by_date"]
+        if by_date is not None:
+            acc.revenue_by_date = pd.Series(
+                by_date["values"],
+                index=pd.Index(by_date["dates"], dtype=object, name="date"),
+                dtype=by_date["dtype"],
+                name="revenue",
+            )
+        return acc
+
+
+def _accumulate_frame(df: pd.DataFrame) -> ReportAccumulator:
+    """
+    Report totals for one file; runs in SpreadsheetTool's worker processes.
+    """
+    acc = ReportAccumulator()
+    acc.add(df)
+    return acc
+
+
+def _to_builtin(value):
+    """
+    Convert NumPy scalars to plain Python numbers for JSON.
+    """
+    return value.item() if hasattr(value, "item") else value
+
+
 class ReportAgent:
     """
     Agent for generating simple business reports from CSV files.
+
+    The source can also be a directory or glob pattern of CSV files
+    (optionally gzip/zstd compressed); those are parsed in parallel.
+
+    With `rollups` (REPORT_ROLLUPS), reports are answered from a
+    RollupStore kept next to the data, which only parses new or changed
+    files. generate_rollup_report() also filters by date range/client.
+
+    With `kpis` (or REPORT_KPIS=true for DEFAULT_KPIS), the in-memory
+    report also lists those KPIs. They are computed in the same pass as
+    the basic report numbers.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        streaming: bool = REPORT_STREAMING,
+        chunksize: int = REPORT_CHUNK_SIZE,
+        incremental: bool = REPORT_INCREMENTAL,
+        state_dir: str = REPORT_STATE_DIR,
+        kpis: list[KPI] | None = None,
+        rollups: bool = REPORT_ROLLUPS,
+    ):
         logger.info("Initializing ReportAgent")
         self.spreadsheet_tool = SpreadsheetTool()
+        self.streaming = streaming
+        self.chunksize = chunksize
+        self.incremental = incremental
+        self.state_store = ReportStateStore(state_dir) if incremental else None
+        if kpis is None and REPORT_KPIS:
+            kpis = DEFAULT_KPIS
+        self.kpis = kpis or []
+        self.rollups = rollups
+        self._rollup_stores: dict[str, RollupStore] = {}
 
+    @traced("report.generate")
     def generate_report(self, file_path: str) -> str:
         """
         Reads a CSV file and returns a human-readable report.
@@ -21,14 +196,248 @@ class ReportAgent:
 
         logger.info("Generating report from file: %s", file_path)
 
+        # KPIs need the individual rows, which rollups don't keep
+        if self.rollups and not self.kpis:
+            return self.generate_rollup_report(file_path)
+
+        # Streaming and incremental modes apply to single files
+        if self.spreadsheet_tool.is_multi_source(file_path):
+            return self.generate_report_multi(file_path)
+
+        if self.incremental:
+            return self.generate_report_incremental(file_path)
+
+        if self.streaming:
+            return self.generate_report_streaming(file_path)
+
         df = self.spreadsheet_tool.read_csv(file_path)
+        return self._report_from_frame(df)
 
-        num_rows = len(df)
-        total_revenue = df["revenue"].sum()
-        total_expenses = df["expenses"].sum()
-        profit = total_revenue - total_expenses
+    @traced("report.aggregate_multi")
+    def generate_report_multi(self, source: str) -> str:
+        """
+        One report over many CSV files (a directory or a glob pattern),
+        parsed in parallel.
+
+        Without extra KPIs each worker process reduces its file to report
+        totals and only those are merged here. With KPIs the files are
+        concatenated first, since the KPIs need the individual rows.
+        """
+
+        logger.info("Generating report across files: %s", source)
+        tool = self.spreadsheet_tool
+
+        if self.kpis:
+            return self._report_from_frame(tool.read_many(source))
+
+        acc = ReportAccumulator()
+        partials = tool.aggregate_many(
+            source, _accumulate_frame, usecols=REPORT_COLUMNS, dtype=REPORT_DTYPES
+        )
+        for partial in partials:
+            acc.merge(partial)
 
-        revenue_by_date = df.groupby("date")["revenue"].sum()
+        return self._format_report(
+            acc.num_rows, acc.total_revenue, acc.total_expenses, acc.revenue_by_date
+        )
+
+    def rollup_store(self, source: str) -> RollupStore:
+        """
+        The (shared) RollupStore for a source.
+        """
+        store = self._rollup_stores.get(source)
+        if store is None:
+            store = RollupStore(source, tool=self.spreadsheet_tool)
+            self._rollup_stores[source] = store
+        return store
+
+    @traced("report.rollups")
+    def generate_rollup_report(
+        self,
+        source: str,
+        start: str | None = None,
+        end: str | None = None,
+        clients: list[str] | None = None,
+    ) -> str:
+        """
+        Report from precomputed daily rollups, optionally limited to
+        dates start..end (inclusive, 'YYYY-MM-DD') and some clients.
+
+        New or changed files are rolled up first; unchanged ones are not
+        read at all.
+        """
+
+        logger.info("Generating report from rollups: %s", source)
+
+        store = self.rollup_store(source)
+        store.refresh()
+        daily = store.query("day", start=start, end=end, clients=clients)
+
+        if daily.empty:
+            logger.warning("No data for report: %s", source)
+            raise ValueError(f"No data for report: {source}")
+
+        # UNDATED rows count in the totals but not in the per-date revenue
+        # (a full report lists an unparseable date as its own "date")
+        dated = daily[daily["period"] != UNDATED]
+        revenue_by_date = pd.Series(
+            dated["revenue"].to_numpy(),
+            index=pd.Index(dated["period"], name="date"),
+            name="revenue",
+        )
+        return self._format_report(
+            int(daily["rows"].sum()),
+            daily["revenue"].sum(),
+            daily["expenses"].sum(),
+            revenue_by_date,
+        )
+
+    @traced("report.aggregate")
+    def _report_from_frame(self, df: pd.DataFrame) -> str:
+        results = KPIEngine(BASE_KPIS + self.kpis).compute(df)
+
+        report = self._format_report(
+            len(df),
+            results["total_revenue"],
+            results["total_expenses"],
+            results["revenue_by_date"],
+        )
+        if self.kpis:
+            report += "\n\n" + self._format_kpis(results)
+        return report
+
+    def compute_kpis(self, file_path: str, kpis: list[KPI]) -> dict:
+        """
+        {kpi name: value} for the given KPIs over a CSV file, directory
+        or glob pattern.
+        """
+        logger.info("Computing %d KPIs from: %s", len(kpis), file_path)
+        tool = self.spreadsheet_tool
+        if tool.is_multi_source(file_path):
+            df = tool.read_many(file_path)
+        else:
+            df = tool.read_csv(file_path)
+        return KPIEngine(kpis).compute(df)
+
+    @traced("report.aggregate_streaming")
+    def generate_report_streaming(self, file_path: str) -> str:
+        """
+        Same report as generate_report, but the CSV is read in bounded
+        chunks so peak memory does not depend on the file size.
+
+        Integer columns give exactly the same output. Float columns can
+        differ in the last digits, because the sums are added up in a
+        different order.
+        """
+
+        logger.info("Generating streaming report from file: %s", file_path)
+
+        acc = ReportAccumulator()
+        chunks = self.spreadsheet_tool.iter_csv_chunks(
+            file_path,
+            chunksize=self.chunksize,
+            usecols=REPORT_COLUMNS,
+            dtype=REPORT_DTYPES,
+        )
+        for chunk in chunks:
+            acc.add(chunk)
+
+        if acc.num_rows == 0:
+            logger.warning("CSV file is empty: %s", file_path)
+            raise ValueError(f"CSV file is empty: {file_path}")
+
+        return self._format_report(
+            acc.num_rows, acc.total_revenue, acc.total_expenses, acc.revenue_by_date
+        )
+
+    @traced("report.aggregate_incremental")
+    def generate_report_incremental(self, file_path: str) -> str:
+        """
+        Report for an append-only CSV that only parses rows added since
+        the previous call.
+
+        The totals and the byte offset reached are saved after each call.
+        If the file shrank or its already-processed bytes changed, the
+        saved state is thrown away and the whole file is read again.
+
+        A last row without a trailing newline is included in the report
+        but not in the saved state, since a writer may still be adding
+        to it; the next call reads it again.
+        """
+
+        logger.info("Generating incremental report from file: %s", file_path)
+
+        tool = self.spreadsheet_tool
+        if self.state_store is None:
+            self.state_store = ReportStateStore(REPORT_STATE_DIR)
+
+        names = tool.read_header(file_path)
+        end = tool.complete_lines_end(file_path)
+
+        saved = self.state_store.load(file_path)
+        if saved is None:
+            start, acc = 0, ReportAccumulator()
+        else:
+            offset, aggregates = saved
+            start, acc = offset, ReportAccumulator.from_dict(aggregates)
+
+        logger.info("Parsing bytes %d-%d of %s", start, end, file_path)
+
+        chunks = tool.iter_csv_range(
+            file_path,
+            start,
+            end,
+            names=names,
+            chunksize=self.chunksize,
+            usecols=REPORT_COLUMNS,
+            dtype=REPORT_DTYPES,
+        )
+        for chunk in chunks:
+            acc.add(chunk)
+
+        self.state_store.save(file_path, max(start, end), acc.to_dict())
+
+        acc = self._with_unterminated_tail(file_path, max(start, end), names, acc)
+
+        if acc.num_rows == 0:
+            logger.warning("CSV file is empty: %s", file_path)
+            raise ValueError(f"CSV file is empty: {file_path}")
+
+        return self._format_report(
+            acc.num_rows, acc.total_revenue, acc.total_expenses, acc.revenue_by_date
+        )
+
+    def _with_unterminated_tail(
+        self, file_path: str, end: int, names: list[str], acc: ReportAccumulator
+    ) -> ReportAccumulator:
+        """
+        `acc` plus the row after the last newline, if there is one (on a
+        copy, so the saved state never holds a possibly partial row).
+        """
+        size = Path(file_path).stat().st_size
+        if size <= end:
+            return acc
+
+        with_tail = ReportAccumulator.from_dict(acc.to_dict())
+        try:
+            for chunk in self.spreadsheet_tool.iter_csv_range(
+                file_path, end, size, names=names, usecols=REPORT_COLUMNS, dtype=REPORT_DTYPES
+            ):
+                with_tail.add(chunk)
+        except (ValueError, pd.errors.ParserError) as e:
+            # Most likely a row still being written
+            logger.warning("Skipping unterminated last row of %s: %s", file_path, e)
+            return acc
+        return with_tail
+
+    def _format_report(
+        self,
+        num_rows: int,
+        total_revenue,
+        total_expenses,
+        revenue_by_date: pd.Series,
+    ) -> str:
+        profit = total_revenue - total_expenses
         avg_daily_revenue = revenue_by_date.mean()
 
         logger.info(
@@ -45,8 +454,21 @@ class ReportAgent:
         report.append(f"Average daily revenue: {avg_daily_revenue:.2f}")
         report.append("")
         report.append("Top revenue by date:")
-        report.append(str(revenue_by_date.sort_values(ascending=False).head(3)))
+        report.append(str(revenue_by_date.iloc[top_n(revenue_by_date.to_numpy(), 3)]))
         report.append("")
         report.append("Note: This is a simple report. The agent can be extended with more KPIs.")
 
         return "\n".join(report)
+
+    def _format_kpis(self, results: dict) -> str:
+        lines = ["=== KPIs ==="]
+        for kpi in self.kpis:
+            value = results[kpi.name]
+            if isinstance(value, pd.Series):
+                lines.append(f"{kpi.name}:")
+                lines.append(value.to_string(float_format="{:.2f}".format))
+            elif isinstance(value, float):
+                lines.append(f"{kpi.name}: {value:.2f}")
+            else:
+                lines.append(f"{kpi.name}: {value}")
+        return "\n".join(lines)
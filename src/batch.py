@@ -0,0 +1,290 @@
+# src/batch.py
+
+"""
+Batch mode: run a JSONL file of requests through PlannerAgent.
+
+Each input line is a JSON object. The request text is taken from the
+first of these fields that is present: input, text, body, title.
+
+Each output line is a JSON object with:
+- line: 0-based line number in the input file
+- id: the input's request_id / id, if any
+- intent, response, latency_ms, error
+
+If the input can't be read to the end (I/O error, invalid UTF-8), the
+lines read so far are still processed and the summary's input_error
+says what went wrong.
+
+The output file is also the checkpoint: with resume=True, lines that
+already have a result are skipped, so a crashed run can pick up where
+it stopped.
+"""
+
+import json
+import logging
+import queue
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INPUT_FIELDS = ("input", "text", "body", "title")
+
+# Marks the end of the input queue
+_DONE = object()
+
+
+def _request_text(record: dict) -> str:
+    for field in INPUT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str) and value.strip():
+            return value
+    raise ValueError(f"No request text found (expected one of {', '.join(INPUT_FIELDS)})")
+
+
+def _load_checkpoint(output_path: Path) -> set[int]:
+    """
+    Line numbers that already have a result in output_path.
+
+    A partially written last line (from a crash) is cut off.
+    """
+    if not output_path.exists():
+        return set()
+
+    done: set[int] = set()
+    good_bytes = 0
+
+    with output_path.open("rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                done.add(json.loads(raw)["line"])
+            except (ValueError, KeyError):
+                break
+            good_bytes += len(raw)
+
+    if good_bytes != output_path.stat().st_size:
+        logger.warning("Truncating partial result at end of %s", output_path)
+        with output_path.open("r+b") as f:
+            f.truncate(good_bytes)
+
+    return done
+
+
+class BatchRunner:
+    """
+    Runs requests from a JSONL file on a pool of worker threads.
+
+    The reader blocks when `queue_size` requests are waiting, so memory
+    stays bounded however large the input file is. With ordered=True,
+    results are written in input order; otherwise as they complete.
+    """
+
+    def __init__(
+        self,
+        planner,
+        workers: int = 4,
+        queue_size: int = 64,
+        ordered: bool = True,
+        progress_every: float = 5.0,
+    ):
+        self.planner = planner
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ordered = ordered
+        self.progress_every = progress_every
+
+        self._reset_counts()
+
+    def _reset_counts(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.completed = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def _process(self, line_no: int, raw: str) -> dict:
+        result = {"line": line_no, "id": None, "intent": None, "response": None, "error": None}
+        start = time.perf_counter()
+
+        try:
+            record = json.loads(raw)
+            result["id"] = record.get("request_id", record.get("id"))
+            user_input = _request_text(record)
+            result["intent"], result["response"] = self.planner.handle_request_with_intent(user_input)
+        except Exception as e:
+            logger.exception("Batch request on line %d failed", line_no)
+            result["error"] = str(e)
+
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return result
+
+    def run(self, input_path: str, output_path: str, resume: bool = False) -> dict:
+        """
+        Process input_path and write results to output_path.
+        Returns a summary dict (also logged).
+        """
+        if not Path(input_path).exists():
+            raise FileNotFoundError(f"Batch input not found: {input_path}")
+
+        # The summary covers this run only
+        self._reset_counts()
+
+        out_path = Path(output_path)
+        done = _load_checkpoint(out_path) if resume else set()
+        if done:
+            logger.info("Resuming: %d requests already done", len(done))
+
+        # Lines that will never get a new result: already done, or blank
+        no_result = set(done)
+
+        in_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        out_queue: queue.Queue = queue.Queue()
+        # Caps requests that are read but not yet written, including
+        # results held back to restore input order.
+        window = threading.BoundedSemaphore(self.queue_size + self.workers)
+        read_errors: list[Exception] = []
+
+        def reader():
+            try:
+                with open(input_path, encoding="utf-8") as f:
+                    for line_no, raw in enumerate(f):
+                        if line_no in done:
+                            self.skipped += 1
+                            continue
+                        if not raw.strip():
+                            # Recorded before any later line is queued, so the
+                            # ordered writer never waits for a blank line.
+                            no_result.add(line_no)
+                            continue
+                        window.acquire()
+                        in_queue.put((line_no, raw))
+            except Exception as e:
+                logger.exception("Failed reading batch input %s", input_path)
+                read_errors.append(e)
+            finally:
+                for _ in range(self.workers):
+                    in_queue.put(_DONE)
+
+        def worker():
+            while True:
+                item = in_queue.get()
+                if item is _DONE:
+                    out_queue.put(_DONE)
+                    return
+                out_queue.put(self._process(*item))
+
+        threads = [threading.Thread(target=reader, name="batch-reader", daemon=True)]
+        threads += [
+            threading.Thread(target=worker, name=f"batch-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+
+        # Ordered mode: results waiting for earlier lines, and the next
+        # input line number we are allowed to write.
+        pending: dict[int, dict] = {}
+        expected = [0]
+        finished_workers = 0
+        last_progress = start
+
+        # Without resume, start the output over; appending would leave
+        # the previous run's results in it (and fool a later --resume)
+        with out_path.open("a" if resume else "w", encoding="utf-8") as out:
+
+            def write(result: dict):
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                window.release()
+                self.completed += 1
+                if result["error"] is not None:
+                    self.errors += 1
+                intent = result["intent"] or "ERROR"
+                self.latencies.setdefault(intent, []).append(result["latency_ms"])
+
+            def flush_ready():
+                while True:
+                    while expected[0] in no_result:
+                        expected[0] += 1
+                    result = pending.pop(expected[0], None)
+                    if result is None:
+                        return
+                    write(result)
+                    expected[0] += 1
+
+            while finished_workers < self.workers:
+                item = out_queue.get()
+                if item is _DONE:
+                    finished_workers += 1
+                    continue
+
+                if self.ordered:
+                    pending[item["line"]] = item
+                    flush_ready()
+                else:
+                    write(item)
+
+                now = time.perf_counter()
+                if now - last_progress >= self.progress_every:
+                    last_progress = now
+                    self._log_progress(now - start)
+
+            flush_ready()
+
+        for t in threads:
+            t.join()
+
+        input_error = f"{type(read_errors[0]).__name__}: {read_errors[0]}" if read_errors else None
+        return self._summary(time.perf_counter() - start, input_error)
+
+    def _log_progress(self, elapsed: float):
+        rate = self.completed / elapsed if elapsed else 0.0
+        logger.info("Batch progress: %d done, %.1f req/s", self.completed, rate)
+
+    def _summary(self, elapsed: float, input_error: str | None = None) -> dict:
+        per_intent = {}
+        for intent, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            per_intent[intent] = {
+                "count": len(values),
+                "mean_ms": round(statistics.fmean(values), 3),
+                "p50_ms": round(ordered[len(ordered) // 2], 3),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            }
+
+        summary = {
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(self.completed / elapsed, 2) if elapsed else 0.0,
+            "per_intent": per_intent,
+            "input_error": input_error,
+        }
+        if input_error:
+            logger.error("Batch stopped early, input not fully read: %s", input_error)
+        logger.info("Batch finished: %s", summary)
+        return summary
+
+
+def print_summary(summary: dict, stream=sys.stdout):
+    print("=== Batch Summary ===", file=stream)
+    print(f"Completed: {summary['completed']}", file=stream)
+    print(f"Skipped (already done): {summary['skipped']}", file=stream)
+    print(f"Errors: {summary['errors']}", file=stream)
+    print(f"Elapsed: {summary['elapsed_s']}s", file=stream)
+    print(f"Throughput: {summary['throughput_rps']} req/s", file=stream)
+    if summary.get("input_error"):
+        print(f"Input error (stopped early): {summary['input_error']}", file=stream)
+    for intent, stats in summary["per_intent"].items():
+        print(
+            f"- {intent}: n={stats['count']} mean={stats['mean_ms']}ms "
+            f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms",
+            file=stream,
+        )
@@ -21,5 +21,136 @@ LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "gemini")
 # Real API key (if you ever set it)
 LLM_API_KEY: str | None = os.getenv("LLM_API_KEY")
 
+# Model used by RealLLMClient
+LLM_MODEL: str = os.getenv("LLM_MODEL", "models/gemini-flash-latest")
+
+# Per-request timeout (seconds) for real LLM calls
+LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "60"))
+
 # Whether to use Fake LLM (default: True for safety)
 USE_FAKE_LLM: bool = os.getenv("USE_FAKE_LLM", "true").lower() == "true"
+
+# Read sales CSVs in bounded chunks instead of loading the whole file
+REPORT_STREAMING: bool = os.getenv("REPORT_STREAMING", "false").lower() == "true"
+
+# Rows per chunk when REPORT_STREAMING is on
+REPORT_CHUNK_SIZE: int = int(os.getenv("REPORT_CHUNK_SIZE", "100000"))
+
+# On-disk columnar cache for parsed CSV files
+SPREADSHEET_CACHE: bool = os.getenv("SPREADSHEET_CACHE", "false").lower() == "true"
+SPREADSHEET_CACHE_DIR: str = os.getenv("SPREADSHEET_CACHE_DIR", "data/spreadsheet_cache")
+SPREADSHEET_CACHE_MAX_BYTES: int = int(os.getenv("SPREADSHEET_CACHE_MAX_BYTES", str(1 << 30)))
+
+# Processes used to parse several CSV files at once (0 = one per CPU)
+SPREADSHEET_WORKERS: int = int(os.getenv("SPREADSHEET_WORKERS", "0"))
+
+# Sales data for reports: a CSV file, a directory of CSVs or a glob pattern
+REPORT_SOURCE: str = os.getenv("REPORT_SOURCE", "examples/sales_data.csv")
+
+# Only parse rows appended since the last report (append-only CSVs)
+REPORT_INCREMENTAL: bool = os.getenv("REPORT_INCREMENTAL", "false").lower() == "true"
+REPORT_STATE_DIR: str = os.getenv("REPORT_STATE_DIR", "data/report_state")
+
+# Append per-client totals, margins, growth, rolling and top-N KPIs to reports
+REPORT_KPIS: bool = os.getenv("REPORT_KPIS", "false").lower() == "true"
+
+# Answer reports from daily/weekly/monthly rollups stored next to the data
+REPORT_ROLLUPS: bool = os.getenv("REPORT_ROLLUPS", "false").lower() == "true"
+
+# In-process cache for MemoryStore.get_memory (0 disables it)
+MEMORY_CACHE_SIZE: int = int(os.getenv("MEMORY_CACHE_SIZE", "1024"))
+
+# Seconds a cached memory stays valid (0 = until invalidated)
+MEMORY_CACHE_TTL: float = float(os.getenv("MEMORY_CACHE_TTL", "0"))
+
+# Simulated latency (seconds) for FakeLLMClient, for offline benchmarks
+FAKE_LLM_LATENCY: float = float(os.getenv("FAKE_LLM_LATENCY", "0"))
+
+# Max requests PlannerAgent runs at once on the async path
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# LLM response cache: 'none', 'memory' (in-process LRU) or 'sqlite' (persistent)
+LLM_CACHE: str = os.getenv("LLM_CACHE", "none").lower()
+LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "data/llm_cache.db")
+LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+# Where EvaluatorAgent writes metrics: 'csv' or 'sqlite'
+METRICS_BACKEND: str = os.getenv("METRICS_BACKEND", "csv").lower()
+
+# Metrics rows are flushed when this many are buffered, or every METRICS_FLUSH_INTERVAL seconds
+METRICS_BATCH_SIZE: int = int(os.getenv("METRICS_BATCH_SIZE", "100"))
+METRICS_FLUSH_INTERVAL: float = float(os.getenv("METRICS_FLUSH_INTERVAL", "1.0"))
+
+# One metrics CSV per process (metrics.<pid>.csv) instead of a shared locked file
+METRICS_PER_PROCESS: bool = os.getenv("METRICS_PER_PROCESS", "false").lower() == "true"
+
+# Client pool rate limits (0 = unlimited): requests and tokens per minute
+LLM_RPM: float = float(os.getenv("LLM_RPM", "0"))
+LLM_TPM: float = float(os.getenv("LLM_TPM", "0"))
+
+# Retries for transient LLM errors (exponential backoff with jitter)
+LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+
+# Circuit breaker: open after this many consecutive failures, retry after LLM_BREAKER_RESET seconds
+LLM_BREAKER_THRESHOLD: int = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_RESET: float = float(os.getenv("LLM_BREAKER_RESET", "30"))
+
+# Pause (seconds) between tokens streamed by FakeLLMClient
+FAKE_LLM_TOKEN_DELAY: float = float(os.getenv("FAKE_LLM_TOKEN_DELAY", "0"))
+
+# Transcripts longer than this (estimated tokens) are summarized in chunks
+MEETING_CHUNK_TOKENS: int = int(os.getenv("MEETING_CHUNK_TOKENS", "3000"))
+
+# How many transcript chunks are summarized at the same time
+MEETING_MAX_PARALLEL: int = int(os.getenv("MEETING_MAX_PARALLEL", "4"))
+
+# Cache for chunk summaries: none | memory | sqlite
+MEETING_CHUNK_CACHE: str = os.getenv("MEETING_CHUNK_CACHE", "memory").lower()
+
+# SQLite file for the chunk summary cache
+MEETING_CHUNK_CACHE_PATH: str = os.getenv("MEETING_CHUNK_CACHE_PATH", "data/meeting_chunks.db")
+
+# Server mode (python src/main.py serve)
+SERVER_HOST: str = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8080"))
+
+# Seconds a single request may take before the server answers 504
+SERVER_REQUEST_TIMEOUT: float = float(os.getenv("SERVER_REQUEST_TIMEOUT", "30"))
+
+# Seconds to let in-flight requests finish on shutdown
+SERVER_SHUTDOWN_GRACE: float = float(os.getenv("SERVER_SHUTDOWN_GRACE", "10"))
+
+# Request tracing (spans + per-stage latency histograms)
+TRACING: bool = os.getenv("TRACING", "false").lower() == "true"
+
+# Where the trace is written at exit, and its format: chrome | otlp
+TRACE_FILE: str = os.getenv("TRACE_FILE", "logs/trace.json")
+TRACE_FORMAT: str = os.getenv("TRACE_FORMAT", "chrome").lower()
+
+# Most recent spans kept in memory for export
+TRACE_MAX_SPANS: int = int(os.getenv("TRACE_MAX_SPANS", "100000"))
+
+# When responses are evaluated: 'sync' (appended to the response) or 'background'
+EVAL_MODE: str = os.getenv("EVAL_MODE", "sync").lower()
+
+# Evaluations waiting in background mode; more than this are dropped
+EVAL_QUEUE_SIZE: int = int(os.getenv("EVAL_QUEUE_SIZE", "1000"))
+
+# Fraction of outputs evaluated per intent, e.g. "EMAIL=0.1,GENERAL=0.5" (others: all)
+EVAL_SAMPLE_RATES: str = os.getenv("EVAL_SAMPLE_RATES", "")
+
+# Root log level, and log line format: 'text' or 'json' (one JSON object per line)
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+
+# Write logs from a background thread (QueueHandler/QueueListener) instead of the caller's
+LOG_QUEUE: bool = os.getenv("LOG_QUEUE", "true").lower() == "true"
+
+# Per-logger records/second below WARNING, e.g. "utils.llm_client=5,agents=50" (others: unlimited)
+LOG_RATE_LIMITS: str = os.getenv("LOG_RATE_LIMITS", "")
+
+# Context window (tokens) used for prompt budgeting; 0 = the known limit for LLM_MODEL
+LLM_CONTEXT_TOKENS: int = int(os.getenv("LLM_CONTEXT_TOKENS", "0"))
@@ -1,12 +1,100 @@
 # src/main.py
 # Project created and implemented by Channaveer
 
+import argparse
 import logging
+import sys
 from agents.planner import PlannerAgent
 from utils.logging_config import setup_logging
+from utils.tracing import setup_tracing
+from config import SERVER_HOST, SERVER_PORT, SERVER_REQUEST_TIMEOUT
 
-def main():
-    setup_logging()
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="AI Business Workflow Assistant. Without a command, starts the interactive CLI."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser("batch", help="Run a JSONL file of requests")
+    batch.add_argument("input", help="JSONL file, one request object per line")
+    batch.add_argument("-o", "--output", default="batch_results.jsonl", help="JSONL file for results")
+    batch.add_argument("-w", "--workers", type=int, default=4, help="Worker threads")
+    batch.add_argument("--queue-size", type=int, default=64, help="Max requests waiting for a worker")
+    batch.add_argument("--unordered", action="store_true", help="Write results as they complete")
+    batch.add_argument("--resume", action="store_true", help="Skip requests already in the output file")
+
+    serve = subparsers.add_parser("serve", help="Run the HTTP/JSON server")
+    serve.add_argument("--host", default=SERVER_HOST, help="Interface to listen on")
+    serve.add_argument("--port", type=int, default=SERVER_PORT, help="Port to listen on")
+    serve.add_argument(
+        "--timeout", type=float, default=SERVER_REQUEST_TIMEOUT, help="Per-request timeout in seconds"
+    )
+
+    metrics = subparsers.add_parser("metrics", help="Query the evaluation metrics history")
+    metrics.add_argument(
+        "query",
+        choices=["import", "trend", "notes", "lengths"],
+        help="import CSV history, score trend, failure-note frequency, or output length percentile",
+    )
+    metrics.add_argument("csv", nargs="*", default=["data/metrics.csv"], help="CSV files to import")
+    metrics.add_argument("--db", default="data/metrics.db", help="Metrics SQLite database")
+    metrics.add_argument("--start", help="From this timestamp/date (inclusive)")
+    metrics.add_argument("--end", help="Up to this timestamp/date (inclusive)")
+    metrics.add_argument("--task-type", help="Only this task type")
+    metrics.add_argument("--grain", default="day", choices=["hour", "day", "month"], help="Period size")
+    metrics.add_argument("--pct", type=float, default=95, help="Percentile for 'lengths'")
+
+    return parser
+
+def run_batch(args: argparse.Namespace):
+    from batch import BatchRunner, print_summary
+
+    planner = PlannerAgent()
+    runner = BatchRunner(
+        planner,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        ordered=not args.unordered,
+    )
+    summary = runner.run(args.input, args.output, resume=args.resume)
+    print_summary(summary)
+    if summary["input_error"]:
+        sys.exit(1)
+
+def run_serve(args: argparse.Namespace):
+    import asyncio
+    from server import run_server
+
+    asyncio.run(run_server(PlannerAgent(), args.host, args.port, args.timeout))
+
+def run_metrics(args: argparse.Namespace):
+    from tools.metrics_query import MetricsQuery
+
+    query = MetricsQuery(args.db)
+    window = {"start": args.start, "end": args.end, "task_type": args.task_type}
+
+    try:
+        if args.query == "import":
+            for path in args.csv:
+                print(f"{path}: {query.import_csv(path)} new rows")
+            print(f"{query.count()} evaluations in {args.db}")
+            return
+
+        if args.query == "trend":
+            result = query.score_trend(args.grain, **window)
+        elif args.query == "notes":
+            result = query.note_frequency(**window)
+        else:
+            result = query.length_percentile(args.pct, args.grain, **window)
+
+        if result.empty:
+            print("No evaluations in this window.")
+        else:
+            print(result.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    finally:
+        query.close()
+
+def run_interactive():
     logger = logging.getLogger(__name__)
 
     logger.info("Starting AI Business Workflow Assistant CLI")
@@ -26,16 +114,34 @@ def main():
 
         logger.info("Received user input: %s", user_input)
 
+        print("\nAssistant:")
+
+        # Print the response as it is generated; the evaluation follows
+        # once the stream is complete.
         try:
-            response = planner.handle_request(user_input)
+            for chunk in planner.handle_request_stream(user_input):
+                print(chunk, end="", flush=True)
             logger.info("Generated response successfully")
         except Exception as e:
             logger.exception("Error while handling request")
-            response = f"An unexpected error occurred: {e}"
+            print(f"An unexpected error occurred: {e}", end="")
 
-        print("\nAssistant:")
-        print(response)
+        print()
         print("-" * 40)
 
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+    setup_logging()
+    setup_tracing()
+
+    if args.command == "batch":
+        run_batch(args)
+    elif args.command == "serve":
+        run_serve(args)
+    elif args.command == "metrics":
+        run_metrics(args)
+    else:
+        run_interactive()
+
 if __name__ == "__main__":
     main()
@@ -1,52 +1,213 @@
 # src/memory/memory_store.py
 
+import json
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 
+from config import MEMORY_CACHE_SIZE, MEMORY_CACHE_TTL
+from utils.tracing import traced
+
+# How many prepared statements each connection keeps around
+CACHED_STATEMENTS = 128
+
+# Upsert that keeps the existing row id when the key is already stored
+UPSERT_SQL = """
+    INSERT INTO memories (key, value, created_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET
+        value = excluded.value,
+        created_at = excluded.created_at
+"""
+
+# Keys per "WHERE key IN (...)" query, below SQLite's host parameter limit
+IN_BATCH_SIZE = 500
+
+# Rows per executemany call when importing JSONL
+IMPORT_BATCH_SIZE = 10_000
+
+# Marks "not in cache" (None is a valid cached result: key not stored)
+_MISSING = object()
+
 class MemoryStore:
     """
     Simple wrapper around SQLite to store key-value memories.
 
     This is our LONG-TERM MEMORY layer.
+
+    Each thread gets one long-lived connection (in WAL mode), so reads
+    and writes don't pay for opening the database file every time.
+
+    get_memory results are kept in a small LRU cache (optionally with a
+    TTL). Our own writes drop the cached key; writes from other
+    connections or processes are noticed through SQLite's data_version
+    and clear the whole cache.
     """
 
-    def __init__(self, db_path: str = "data/memory.db"):
+    # Database files whose schema was already checked in this process
+    _initialized_paths: set[str] = set()
+    _init_lock = threading.Lock()
+
+    def __init__(
+        self,
+        db_path: str = "data/memory.db",
+        cache_size: int = MEMORY_CACHE_SIZE,
+        cache_ttl: float = MEMORY_CACHE_TTL,
+    ):
         self.db_path = db_path
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        # Read-through cache: key -> (value, expires_at or None)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: OrderedDict[str, tuple[str | None, float | None]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+
         self._ensure_db()
 
-    def _get_connection(self):
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Return this thread's connection, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        # check_same_thread=False only so close() can run from any thread;
+        # each connection is otherwise used by the thread that opened it.
+        conn = sqlite3.connect(
+            self.db_path,
+            cached_statements=CACHED_STATEMENTS,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        self._local.conn = conn
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    # ---------- cache ----------
+
+    def _check_data_version(self, conn: sqlite3.Connection):
+        """
+        Clear the cache if another connection committed since this
+        thread last looked.
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if getattr(self._local, "data_version", None) != version:
+            self._local.data_version = version
+            self.clear_cache()
+
+    def _cache_get(self, key: str):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.cache_misses += 1
+                return _MISSING
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._cache[key]
+                self.cache_misses += 1
+                return _MISSING
+
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return value
+
+    def _cache_put(self, key: str, value: str | None, generation: int):
+        expires_at = time.monotonic() + self.cache_ttl if self.cache_ttl > 0 else None
+
+        with self._cache_lock:
+            # A write happened while we were reading; our value may be stale.
+            if generation != self._cache_generation:
+                return
+
+            self._cache[key] = (value, expires_at)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _invalidate(self, *keys: str):
+        with self._cache_lock:
+            for key in keys:
+                self._cache.pop(key, None)
+            self._cache_generation += 1
+
+    def clear_cache(self):
+        """
+        Drop every cached value.
         """
-        Create a new SQLite connection.
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_generation += 1
+
+    def cache_info(self) -> dict:
+        """
+        Cache hit/miss counters and current size.
+        """
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+            }
+
+    def close(self):
+        """
+        Close every connection opened by this store.
         """
-        return sqlite3.connect(self.db_path)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
     def _ensure_db(self):
         """
         Create the table if it does not exist.
+
+        Only runs once per database file per process.
         """
 
-        # Make sure folder exists
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        key = str(Path(self.db_path).resolve())
+        with MemoryStore._init_lock:
+            if key in MemoryStore._initialized_paths and Path(key).exists():
+                return
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Basic table: id, key, value, created_at
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS memories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT NOT NULL UNIQUE,
-                value TEXT NOT NULL,
-                created_at TEXT NOT NULL
+            # Make sure folder exists
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            # Basic table: id, key, value, created_at
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS memories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL UNIQUE,
+                    value TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
             )
-            """
-        )
 
-        conn.commit()
-        conn.close()
+            conn.commit()
+            MemoryStore._initialized_paths.add(key)
 
+    @traced("memory.set")
     def set_memory(self, key: str, value: str):
         """
         Insert or update a memory (key, value).
@@ -54,55 +215,169 @@ class MemoryStore:
         """
 
         conn = self._get_connection()
-        cursor = conn.cursor()
 
         now = datetime.utcnow().isoformat()
-
-        # Use INSERT OR REPLACE to avoid duplicate key errors
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO memories (id, key, value, created_at)
-            VALUES (
-                COALESCE((SELECT id FROM memories WHERE key = ?), NULL),
-                ?, ?, ?
-            )
-            """,
-            (key, key, value, now),
-        )
+        conn.execute(UPSERT_SQL, (key, value, now))
 
         conn.commit()
-        conn.close()
+        self._invalidate(key)
+
+    def set_many(self, items: dict[str, str] | list[tuple[str, str]]):
+        """
+        Insert or update many memories in a single transaction.
+        """
 
+        if isinstance(items, dict):
+            items = list(items.items())
+
+        conn = self._get_connection()
+        now = datetime.utcnow().isoformat()
+
+        with conn:
+            conn.executemany(UPSERT_SQL, [(k, v, now) for k, v in items])
+
+        self._invalidate(*(k for k, _ in items))
+
+    @traced("memory.get")
     def get_memory(self, key: str) -> str | None:
         """
         Returns the value for a given key, or None if not found.
         """
 
         conn = self._get_connection()
-        cursor = conn.cursor()
 
-        cursor.execute(
+        if self.cache_size > 0:
+            self._check_data_version(conn)
+            cached = self._cache_get(key)
+            if cached is not _MISSING:
+                return cached
+            generation = self._cache_generation
+
+        row = conn.execute(
             "SELECT value FROM memories WHERE key = ?",
             (key,),
-        )
+        ).fetchone()
 
-        row = cursor.fetchone()
-        conn.close()
+        value = None if row is None else row[0]
 
-        if row is None:
-            return None
-        return row[0]
+        if self.cache_size > 0:
+            self._cache_put(key, value, generation)
+        return value
 
-    def get_all_memories(self) -> list[tuple[str, str]]:
+    @traced("memory.get_many")
+    def get_many(self, keys: list[str]) -> dict[str, str]:
         """
-        Returns a list of (key, value) pairs for all memories.
+        Returns {key: value} for the keys that are stored.
+        Missing keys are left out of the result.
+        """
+
+        conn = self._get_connection()
+        found: dict[str, str] = {}
+        to_fetch = list(dict.fromkeys(keys))
+
+        if self.cache_size > 0:
+            self._check_data_version(conn)
+            generation = self._cache_generation
+            remaining = []
+            for key in to_fetch:
+                cached = self._cache_get(key)
+                if cached is _MISSING:
+                    remaining.append(key)
+                elif cached is not None:
+                    found[key] = cached
+            to_fetch = remaining
+
+        for i in range(0, len(to_fetch), IN_BATCH_SIZE):
+            batch = to_fetch[i:i + IN_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT key, value FROM memories WHERE key IN ({placeholders})",
+                batch,
+            ).fetchall()
+            fetched = dict(rows)
+            found.update(fetched)
+
+            if self.cache_size > 0:
+                for key in batch:
+                    self._cache_put(key, fetched.get(key), generation)
+
+        return found
+
+    def delete_many(self, keys: list[str]) -> int:
+        """
+        Delete the given keys in a single transaction.
+        Returns how many rows were removed.
+        """
+
+        conn = self._get_connection()
+
+        with conn:
+            cursor = conn.executemany(
+                "DELETE FROM memories WHERE key = ?",
+                [(k,) for k in keys],
+            )
+
+        self._invalidate(*keys)
+        return cursor.rowcount
+
+    def import_jsonl(self, file_path: str) -> int:
+        """
+        Load memories from a JSONL file with one {"key": ..., "value": ...}
+        object per line. Existing keys are overwritten.
+
+        The file is streamed in batches, but the whole import is one
+        transaction. Returns the number of rows imported.
         """
 
         conn = self._get_connection()
-        cursor = conn.cursor()
+        now = datetime.utcnow().isoformat()
+        count = 0
+        batch: list[tuple[str, str, str]] = []
 
-        cursor.execute("SELECT key, value FROM memories")
-        rows = cursor.fetchall()
-        conn.close()
+        with conn, open(file_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                batch.append((record["key"], record["value"], record.get("created_at", now)))
+
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    conn.executemany(UPSERT_SQL, batch)
+                    count += len(batch)
+                    batch.clear()
+
+            if batch:
+                conn.executemany(UPSERT_SQL, batch)
+                count += len(batch)
+
+        self.clear_cache()
+        return count
+
+    def export_jsonl(self, file_path: str) -> int:
+        """
+        Write every memory to a JSONL file, one object per line.
+        Returns the number of rows written.
+        """
 
-        return rows
+        conn = self._get_connection()
+        count = 0
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            cursor = conn.execute(
+                "SELECT key, value, created_at FROM memories ORDER BY id"
+            )
+            for key, value, created_at in cursor:
+                f.write(json.dumps({"key": key, "value": value, "created_at": created_at}))
+                f.write("\n")
+                count += 1
+
+        return count
+
+    @traced("memory.get_all")
+    def get_all_memories(self) -> list[tuple[str, str]]:
+        """
+        Returns a list of (key, value) pairs for all memories.
+        """
+
+        conn = self._get_connection()
+        return conn.execute("SELECT key, value FROM memories").fetchall()
@@ -0,0 +1,309 @@
+# src/server.py
+
+"""
+Server mode: PlannerAgent over HTTP/JSON, on plain asyncio.
+
+One PlannerAgent (and so one set of agents, SQLite connections, caches
+and LLM client pool) is shared by every connection, and kept warm for
+the life of the process.
+
+Endpoints:
+- POST /request  body {"input": "..."}
+  -> {"intent": ..., "response": ..., "latency_ms": ...}
+- GET /health    -> {"status": "ok", "in_flight": ..., "served": ...,
+                    "timed_out": ..., "failed": ...}
+- GET /stats     -> per-stage latency percentiles (with TRACING=true) and
+                    background evaluation counters
+
+Requests that take longer than `request_timeout` get a 504. On
+shutdown the server stops accepting connections, lets in-flight
+requests finish (up to `shutdown_grace` seconds) and flushes metrics.
+
+HTTP/1.1 keep-alive is supported; chunked request bodies are not.
+"""
+
+import asyncio
+import json
+import logging
+import signal
+import time
+
+from utils.tracing import get_tracer
+from config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_REQUEST_TIMEOUT,
+    SERVER_SHUTDOWN_GRACE,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 1 << 20
+
+# How long an idle keep-alive connection is kept open
+IDLE_TIMEOUT = 60.0
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PlannerServer:
+    """
+    asyncio HTTP server around one shared PlannerAgent.
+    """
+
+    def __init__(
+        self,
+        planner,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        request_timeout: float = SERVER_REQUEST_TIMEOUT,
+        shutdown_grace: float = SERVER_SHUTDOWN_GRACE,
+    ):
+        self.planner = planner
+        self.host = host
+        self.port = port
+        self.request_timeout = request_timeout
+        self.shutdown_grace = shutdown_grace
+
+        self.in_flight = 0
+        # Requests answered 200, 504 and 500
+        self.served = 0
+        self.timed_out = 0
+        self.failed = 0
+        self._server: asyncio.Server | None = None
+        self._closing = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self, warm_up: bool = True):
+        """
+        Start listening. With warm_up, the agents are built first so the
+        first requests don't pay for it.
+        """
+        if warm_up:
+            await asyncio.to_thread(self._warm_up)
+
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Port 0 means "any free port"; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Server listening on http://%s:%d", self.host, self.port)
+
+    def _warm_up(self):
+        planner = self.planner
+        for name in ("memory_agent", "email_agent", "meeting_agent", "report_agent", "evaluator_agent"):
+            getattr(planner, name)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def shutdown(self):
+        """
+        Stop accepting connections, wait for in-flight requests (at most
+        shutdown_grace seconds), then close everything.
+        """
+        if self._closing:
+            return
+        self._closing = True
+        logger.info("Shutting down server (%d requests in flight)", self.in_flight)
+
+        if self._server is not None:
+            self._server.close()
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), self.shutdown_grace)
+        except asyncio.TimeoutError:
+            logger.warning("Shutdown grace period over with %d requests in flight", self.in_flight)
+
+        for writer in list(self._writers):
+            writer.close()
+
+        await asyncio.to_thread(self.planner.flush_evaluations)
+        logger.info(
+            "Server stopped after %d requests (%d timed out, %d failed)",
+            self.served, self.timed_out, self.failed,
+        )
+
+    # ---------- HTTP ----------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        try:
+            while not self._closing:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    await self._send(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = keep_alive and not self._closing
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """
+        (method, path, headers, body), or None if the client hung up.
+        """
+        line = await reader.readline()
+        if not line:
+            return None
+
+        try:
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length") from None
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path, headers, body
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        path = path.split("?", 1)[0]
+
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return 200, {
+                "status": "closing" if self._closing else "ok",
+                "in_flight": self.in_flight,
+                "served": self.served,
+                "timed_out": self.timed_out,
+                "failed": self.failed,
+            }
+
+        if path == "/stats":
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            tracer = get_tracer()
+            return 200, {
+                "tracing": tracer.enabled,
+                "stages": tracer.stats(),
+                "evaluation": self.planner.evaluation_stats(),
+            }
+
+        if path == "/request":
+            if method != "POST":
+                return 405, {"error": "Use POST"}
+            if self._closing:
+                return 503, {"error": "Server is shutting down"}
+            return await self._handle_request(body)
+
+        return 404, {"error": f"Unknown path: {path}"}
+
+    async def _handle_request(self, body: bytes) -> tuple[int, dict]:
+        try:
+            data = json.loads(body or b"{}")
+            user_input = data["input"]
+            if not isinstance(user_input, str) or not user_input.strip():
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": 'Expected a JSON body like {"input": "..."}'}
+
+        self.in_flight += 1
+        self._idle.clear()
+        start = time.perf_counter()
+        try:
+            intent, response = await asyncio.wait_for(
+                self.planner.ahandle_request_with_intent(user_input), self.request_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Request timed out after %.1fs: %s", self.request_timeout, user_input)
+            self.timed_out += 1
+            return 504, {"error": f"Request timed out after {self.request_timeout}s"}
+        except Exception as e:
+            logger.exception("Error while handling request")
+            self.failed += 1
+            return 500, {"error": str(e)}
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+
+        self.served += 1
+
+        return 200, {
+            "intent": intent,
+            "response": response,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+
+
+async def run_server(planner, host: str, port: int, request_timeout: float):
+    """
+    Run until SIGINT/SIGTERM, then shut down gracefully.
+    """
+    server = PlannerServer(planner, host, port, request_timeout)
+    await server.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    print(f"Serving on http://{server.host}:{server.port} (Ctrl+C to stop)")
+    serving = asyncio.create_task(server.serve_forever())
+    try:
+        await stop.wait()
+    finally:
+        await server.shutdown()
+        serving.cancel()
@@ -0,0 +1,296 @@
+# src/tools/columnar_cache.py
+
+"""
+On-disk columnar cache for parsed CSV files.
+
+Each cached file is stored as one .npy file per column:
+- numeric / bool columns are saved as-is and memory-mapped on load
+- text columns are saved as integer codes + a table of unique values
+
+Entries are keyed by the resolved file path and validated with the
+file size, mtime and a content hash, so a changed file is re-parsed
+automatically. The cache has a size cap and evicts least-recently-used
+entries when it grows past it.
+
+Several caches (threads or processes) can share one directory: the
+index is re-read and written back under a file lock, and an entry that
+someone else cached first is kept rather than written again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_content_hash(path: Path) -> str:
+    """
+    BLAKE2 hash of the file contents, read in 1 MB blocks.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ColumnarCache:
+    """
+    LRU cache of parsed DataFrames stored as memory-mappable columns.
+    """
+
+    def __init__(self, cache_dir: str = "data/spreadsheet_cache", max_bytes: int = 1 << 30):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+
+    # ---------- index ----------
+
+    def _load_index(self) -> dict:
+        index_path = self.cache_dir / INDEX_FILE
+        if not index_path.exists():
+            return {}
+        try:
+            return json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Columnar cache index is unreadable, starting empty: %s", index_path)
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the thread lock and the directory's file lock, with the
+        index freshly loaded, so changes made by other caches sharing
+        the directory are merged rather than overwritten.
+        """
+        with self._lock, (self.cache_dir / LOCK_FILE).open("a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                self._index = self._load_index()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _save_index(self):
+        index_path = self.cache_dir / INDEX_FILE
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+
+    def _entry_id(self, path: Path) -> str:
+        return hashlib.blake2b(str(path).encode("utf-8"), digest_size=16).hexdigest()
+
+    # ---------- public API ----------
+
+    def get(self, file_path: str) -> pd.DataFrame | None:
+        """
+        Return the cached DataFrame for file_path, or None on a miss.
+
+        A stale entry (file changed since it was cached) is dropped.
+        """
+        path = Path(file_path).resolve()
+        entry_id = self._entry_id(path)
+        stat = path.stat()
+
+        with self._locked():
+            entry = self._index.get(entry_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry["size"] != stat.st_size:
+                fresh = False
+            elif entry["mtime_ns"] == stat.st_mtime_ns:
+                fresh = True
+            else:
+                # Same size but touched: only trust it if the bytes are unchanged.
+                fresh = entry["content_hash"] == file_content_hash(path)
+                if fresh:
+                    entry["mtime_ns"] = stat.st_mtime_ns
+
+            if not fresh:
+                logger.info("Columnar cache entry is stale, dropping: %s", path)
+                self._remove_entry(entry_id)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            try:
+                df = self._load_entry(entry_id, entry)
+            except (OSError, ValueError, KeyError):
+                logger.warning("Columnar cache entry is corrupt, dropping: %s", path)
+                self._remove_entry(entry_id)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            entry["last_used"] = time.time()
+            self._save_index()
+            self.hits += 1
+
+        logger.info("Columnar cache hit for %s", path)
+        return df
+
+    def put(self, file_path: str, df: pd.DataFrame) -> bool:
+        """
+        Store df as the parsed contents of file_path.
+
+        Returns False if the DataFrame has column types we cannot store.
+        """
+        path = Path(file_path).resolve()
+        entry_id = self._entry_id(path)
+        stat = path.stat()
+        content_hash = file_content_hash(path)
+
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f"{entry_id}.", suffix=".tmp", dir=self.cache_dir))
+
+        try:
+            columns = self._write_columns(tmp_dir, df)
+        except TypeError as e:
+            logger.info("Not caching %s: %s", path, e)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+        nbytes = sum(f.stat().st_size for f in tmp_dir.iterdir())
+        entry_dir = self.cache_dir / entry_id
+
+        with self._locked():
+            entry = self._index.get(entry_id)
+            if (
+                entry is not None
+                and entry["size"] == stat.st_size
+                and entry["content_hash"] == content_hash
+                and entry_dir.is_dir()
+            ):
+                # Another cache sharing the directory got there first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                entry["last_used"] = time.time()
+                self._save_index()
+                return True
+
+            self._remove_entry(entry_id)
+            # A directory left behind without an index entry
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            self._index[entry_id] = {
+                "path": str(path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "content_hash": content_hash,
+                "columns": columns,
+                "bytes": nbytes,
+                "last_used": time.time(),
+            }
+            self._evict()
+            self._save_index()
+
+        logger.info("Cached %s as %d columns (%d bytes)", path, len(columns), nbytes)
+        return True
+
+    def clear(self):
+        """
+        Remove every cached entry.
+        """
+        with self._locked():
+            for entry_id in list(self._index):
+                self._remove_entry(entry_id)
+            self._save_index()
+
+    def stats(self) -> dict:
+        """
+        Hit/miss/eviction counters and current disk usage.
+        """
+        with self._locked():
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": sum(e["bytes"] for e in self._index.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    # ---------- storage ----------
+
+    def _write_columns(self, entry_dir: Path, df: pd.DataFrame) -> list[dict]:
+        columns = []
+        for i, name in enumerate(df.columns):
+            col = df[name]
+            kind = col.dtype.kind
+
+            if kind in "iufb":
+                np.save(entry_dir / f"{i}.npy", col.to_numpy())
+                columns.append({"name": name, "dtype": str(col.dtype), "kind": "numeric"})
+                continue
+
+            codes, uniques = pd.factorize(col)
+            if not all(isinstance(v, str) for v in uniques):
+                raise TypeError(f"column {name!r} has unsupported dtype {col.dtype}")
+
+            np.save(entry_dir / f"{i}.codes.npy", codes.astype(np.int32))
+            np.save(entry_dir / f"{i}.values.npy", np.asarray(uniques, dtype=str))
+            columns.append({"name": name, "dtype": str(col.dtype), "kind": "text"})
+
+        return columns
+
+    def _load_entry(self, entry_id: str, entry: dict) -> pd.DataFrame:
+        entry_dir = self.cache_dir / entry_id
+        data = {}
+        for i, col in enumerate(entry["columns"]):
+            if col["kind"] == "numeric":
+                mapped = np.load(entry_dir / f"{i}.npy", mmap_mode="r")
+                data[col["name"]] = mapped.view(np.ndarray)
+            else:
+                codes = np.load(entry_dir / f"{i}.codes.npy", mmap_mode="r")
+                uniques = np.load(entry_dir / f"{i}.values.npy")
+                categorical = pd.Categorical.from_codes(codes, uniques.astype(object))
+                data[col["name"]] = pd.Series(categorical).astype(col["dtype"])
+
+        return pd.DataFrame(data, copy=False)
+
+    def _remove_entry(self, entry_id: str):
+        if self._index.pop(entry_id, None) is not None:
+            shutil.rmtree(self.cache_dir / entry_id, ignore_errors=True)
+
+    def _evict(self):
+        """
+        Drop least-recently-used entries until we are under max_bytes.
+        """
+        total = sum(e["bytes"] for e in self._index.values())
+        by_age = sorted(self._index.items(), key=lambda item: item[1]["last_used"])
+
+        for entry_id, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            logger.info("Evicting columnar cache entry for %s", entry["path"])
+            total -= entry["bytes"]
+            self._remove_entry(entry_id)
+            self.evictions += 1
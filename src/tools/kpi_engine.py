@@ -0,0 +1,325 @@
+# src/tools/kpi_engine.py
+
+"""
+Declarative KPI computation over NumPy arrays.
+
+A report asks for a list of KPI objects (totals, per-group sums,
+margins, growth, rolling averages, top-N). KPIEngine works out which
+groupings and sums those need and computes all of them together:
+
+- each grouping column is factorized once, however many KPIs use it
+- every (grouping, value column) sum comes from one np.bincount, done
+  block by block in a single pass over the rows
+- weekly/monthly/... groupings are derived from the per-date sums, so
+  they never touch the rows again
+- top-N uses partial selection (np.argpartition) instead of a full sort
+
+Missing values count as 0 in sums; rows with a missing group key are
+left out of that grouping, like pandas groupby does. Integer sums are
+done in float64 and converted back, which is exact up to 2**53.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+KPI_KINDS = ("total", "sum", "count", "mean", "margin", "growth", "rolling", "top")
+
+# Kinds that only make sense per group
+GROUPED_KINDS = ("sum", "count", "mean", "growth", "rolling", "top")
+
+# Rows handled per bincount call; bounds the float64 temporaries
+BLOCK_SIZE = 4_000_000
+
+
+class KPI:
+    """
+    One KPI to compute.
+
+    - total:   sum of `column` over all rows
+    - sum / count / mean: per value of `by`
+    - margin:  (column - cost_column) / column, overall or per `by`
+    - growth:  change of the per-group sum vs. the previous group, as a
+               fraction (groups in sorted order, e.g. dates)
+    - rolling: mean of the per-group sum over the last `window` groups
+    - top:     the `n` groups with the largest sum
+
+    `period` ('W', 'M', 'Q', 'Y', ...) groups a date column `by` into
+    calendar periods first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        column: str | None = None,
+        by: str | None = None,
+        period: str | None = None,
+        window: int = 3,
+        n: int = 5,
+        cost_column: str = "expenses",
+    ):
+        if kind not in KPI_KINDS:
+            raise ValueError(f"Unknown KPI kind {kind!r} (expected one of {', '.join(KPI_KINDS)})")
+        if kind in GROUPED_KINDS and by is None:
+            raise ValueError(f"KPI {name!r} of kind {kind!r} needs a 'by' column")
+        if kind == "total" and by is not None:
+            raise ValueError(f"KPI {name!r}: use kind 'sum' for per-group totals")
+        if kind != "count" and column is None:
+            raise ValueError(f"KPI {name!r} of kind {kind!r} needs a column")
+        if period is not None and by is None:
+            raise ValueError(f"KPI {name!r}: 'period' needs a 'by' date column")
+
+        self.name = name
+        self.kind = kind
+        self.column = column
+        self.by = by
+        self.period = period
+        self.window = window
+        self.n = n
+        self.cost_column = cost_column
+
+    def value_columns(self) -> list[str]:
+        if self.kind == "count":
+            return []
+        if self.kind == "margin":
+            return [self.column, self.cost_column]
+        return [self.column]
+
+    def __repr__(self) -> str:
+        return f"KPI({self.name!r}, {self.kind!r}, column={self.column!r}, by={self.by!r})"
+
+
+def top_n(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Positions of the n largest values, largest first. Ties keep their
+    original order; NaN sorts last. O(len(values)) plus O(n log n).
+    """
+    values = np.asarray(values, dtype=float)
+    n = min(n, len(values))
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    values = np.where(np.isnan(values), -np.inf, values)
+    kth = values[np.argpartition(-values, n - 1)[n - 1]]
+
+    # Everything above the n-th value, then the first ties with it
+    above = np.flatnonzero(values > kth)
+    equal = np.flatnonzero(values == kth)[: n - len(above)]
+    idx = np.concatenate([above, equal])
+
+    order = np.lexsort((idx, -values[idx]))
+    return idx[order]
+
+
+def _column(data, name: str):
+    try:
+        return data[name]
+    except KeyError:
+        raise ValueError(f"Column {name!r} not found for KPI computation") from None
+
+
+class KPIEngine:
+    """
+    Computes a list of KPIs in one pass over a DataFrame or a mapping of
+    column name -> array.
+    """
+
+    def __init__(self, kpis: list[KPI], block_size: int = BLOCK_SIZE):
+        names = [kpi.name for kpi in kpis]
+        if len(set(names)) != len(names):
+            raise ValueError("KPI names must be unique")
+        self.kpis = list(kpis)
+        self.block_size = block_size
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        Every input column the KPIs read.
+        """
+        needed = set()
+        for kpi in self.kpis:
+            needed.update(kpi.value_columns())
+            if kpi.by:
+                needed.add(kpi.by)
+        return sorted(needed)
+
+    def compute(self, data) -> dict:
+        """
+        Returns {kpi name: scalar or pd.Series}. Series are indexed by the
+        group labels in sorted order.
+        """
+        # Which sums the KPIs need, per base grouping (None = all rows)
+        sum_columns: dict[str | None, set[str]] = {}
+        for kpi in self.kpis:
+            sum_columns.setdefault(kpi.by, set()).update(kpi.value_columns())
+
+        values = {}
+        for name in sorted(set().union(*sum_columns.values())):
+            array = np.asarray(_column(data, name))
+            if array.dtype.kind not in "iufb":
+                raise ValueError(f"Column {name!r} is not numeric")
+            values[name] = array
+
+        groupings = {by: self._factorize(_column(data, by)) for by in sum_columns if by}
+        columns = self.columns
+        num_rows = len(_column(data, columns[0])) if columns else 0
+
+        totals, sums, counts = self._scan(num_rows, values, groupings, sum_columns)
+
+        results = {}
+        for kpi in self.kpis:
+            results[kpi.name] = self._derive(kpi, values, groupings, totals, sums, counts)
+        return results
+
+    # ---------- the single pass ----------
+
+    def _factorize(self, column) -> tuple[np.ndarray, pd.Index]:
+        """
+        Integer codes (sorted label order) plus labels. Missing keys get
+        the extra code len(labels), which is dropped after counting.
+
+        Categoricals reuse their codes instead of hashing every row;
+        categories without rows are dropped after the scan.
+        """
+        if isinstance(column, pd.Series) and isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()
+            labels = column.cat.categories
+            if not (column.cat.ordered or labels.is_monotonic_increasing):
+                order = np.argsort(labels.to_numpy(), kind="stable")
+                rank = np.empty(len(order), dtype=codes.dtype)
+                rank[order] = np.arange(len(order), dtype=codes.dtype)
+                codes = np.where(codes < 0, codes, rank[codes])
+                labels = labels[order]
+        else:
+            codes, labels = pd.factorize(column, sort=True)
+
+        labels = pd.Index(labels)
+        if (codes < 0).any():
+            codes = np.where(codes < 0, len(labels), codes)
+        return codes, labels
+
+    def _scan(self, num_rows, values, groupings, sum_columns):
+        """
+        Totals, per-group sums and per-group row counts in one pass.
+        Empty groups are removed from `groupings` in place.
+        """
+        totals = {name: None for name in sum_columns.get(None, ())}
+        sums = {
+            (by, name): np.zeros(len(groupings[by][1]) + 1)
+            for by, names in sum_columns.items() if by
+            for name in names
+        }
+        # Rows per group are always counted: they also show which groups are empty
+        counts = {by: np.zeros(len(labels) + 1, dtype=np.int64) for by, (_, labels) in groupings.items()}
+
+        for start in range(0, num_rows, self.block_size):
+            stop = start + self.block_size
+            block = {}
+            for name, array in values.items():
+                part = array[start:stop]
+                if part.dtype.kind == "f":
+                    part = np.nan_to_num(part, nan=0.0)
+                block[name] = part
+
+            for name in totals:
+                partial = block[name].sum()
+                totals[name] = partial if totals[name] is None else totals[name] + partial
+
+            for by, (codes, labels) in groupings.items():
+                code_block = codes[start:stop]
+                size = len(labels) + 1
+                for name in sum_columns[by]:
+                    sums[by, name] += np.bincount(code_block, weights=block[name], minlength=size)
+                counts[by] += np.bincount(code_block, minlength=size)
+
+        # Drop the missing-key bucket and empty groups, restore integer dtypes
+        present = {by: count[:-1] > 0 for by, count in counts.items()}
+        for (by, name), total in sums.items():
+            total = total[:-1][present[by]]
+            if values[name].dtype.kind in "iub":
+                total = np.rint(total).astype(np.int64)
+            sums[by, name] = total
+        for by in counts:
+            counts[by] = counts[by][:-1][present[by]]
+            codes, labels = groupings[by]
+            groupings[by] = (codes, labels[present[by]])
+
+        return totals, sums, counts
+
+    # ---------- per-KPI results ----------
+
+    def _grouped(self, kpi: KPI, groupings, sums, counts, name: str | None):
+        """
+        Per-group sum (or count, if name is None) for the KPI's grouping,
+        rolled up into calendar periods if it asks for one.
+        """
+        labels = groupings[kpi.by][1]
+        total = counts[kpi.by] if name is None else sums[kpi.by, name]
+        if kpi.period is None:
+            return total, labels
+
+        periods = pd.DatetimeIndex(pd.to_datetime(labels)).to_period(kpi.period)
+        codes, period_labels = pd.factorize(periods, sort=True)
+        rolled = np.bincount(codes, weights=total, minlength=len(period_labels))
+        if total.dtype.kind in "iub":
+            rolled = np.rint(rolled).astype(np.int64)
+        return rolled, pd.Index(period_labels)
+
+    def _series(self, data: np.ndarray, labels: pd.Index, kpi: KPI, name: str | None = None):
+        return pd.Series(
+            data,
+            index=labels.rename(kpi.by),
+            name=name or kpi.column or kpi.name,
+        )
+
+    def _derive(self, kpi: KPI, values, groupings, totals, sums, counts):
+        if kpi.kind == "total":
+            return totals[kpi.column]
+
+        if kpi.kind == "margin":
+            if kpi.by is None:
+                revenue, cost = totals[kpi.column], totals[kpi.cost_column]
+                return float((revenue - cost) / revenue) if revenue else float("nan")
+            revenue, labels = self._grouped(kpi, groupings, sums, counts, kpi.column)
+            cost, _ = self._grouped(kpi, groupings, sums, counts, kpi.cost_column)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                margin = np.where(revenue != 0, (revenue - cost) / revenue, np.nan)
+            return self._series(margin, labels, kpi, "margin")
+
+        if kpi.kind == "count":
+            count, labels = self._grouped(kpi, groupings, sums, counts, None)
+            return self._series(count, labels, kpi, "count")
+
+        total, labels = self._grouped(kpi, groupings, sums, counts, kpi.column)
+
+        if kpi.kind == "sum":
+            return self._series(total, labels, kpi)
+
+        if kpi.kind == "mean":
+            count, _ = self._grouped(kpi, groupings, sums, counts, None)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+            return self._series(mean, labels, kpi)
+
+        if kpi.kind == "growth":
+            growth = np.full(len(total), np.nan)
+            previous = total[:-1].astype(float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                growth[1:] = np.where(previous != 0, (total[1:] - previous) / previous, np.nan)
+            return self._series(growth, labels, kpi, "growth")
+
+        if kpi.kind == "rolling":
+            window = kpi.window
+            rolling = np.full(len(total), np.nan)
+            if len(total) >= window:
+                csum = np.concatenate([[0.0], np.cumsum(total, dtype=float)])
+                rolling[window - 1:] = (csum[window:] - csum[:-window]) / window
+            return self._series(rolling, labels, kpi)
+
+        # top
+        idx = top_n(total, kpi.n)
+        return self._series(total[idx], labels[idx], kpi)
@@ -0,0 +1,258 @@
+# src/tools/metrics_query.py
+
+"""
+Query layer over the evaluation metrics history.
+
+Metrics live in the indexed SQLite table that SQLiteMetricsSink writes
+(METRICS_BACKEND=sqlite), with indexes on timestamp and on
+(task_type, timestamp). Every query takes a time window and an optional
+task type, so SQLite reads only the index range for that window instead
+of scanning the whole history.
+
+CSV history (data/metrics.csv, or the per-process metrics.<pid>.csv
+files) can be imported. Imports are incremental: the byte offset
+reached in each CSV is remembered, so importing the same file again only
+adds the rows appended since.
+
+Window bounds are ISO timestamps or prefixes of them. `start` is
+inclusive; `end` is inclusive too, so end='2025-11-27' covers that
+whole day and end='2025-11' the whole month.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from tools.spreadsheet_parser import SpreadsheetTool
+from utils.metrics_sink import METRICS_HEADER, create_metrics_table
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "data/metrics.db"
+
+# SQL for the period label of a timestamp, per grain
+GRAINS = {
+    "hour": "substr(timestamp, 1, 13)",
+    "day": "substr(timestamp, 1, 10)",
+    "month": "substr(timestamp, 1, 7)",
+}
+
+# Rows per executemany call when importing
+IMPORT_BATCH_ROWS = 50_000
+
+
+def _end_bound(end: str) -> tuple[str, str]:
+    """
+    SQL condition and parameter for an inclusive `end`. Dates and months
+    become an exclusive bound at the start of the next day / month, so
+    the timestamp index can still be used.
+    """
+    if len(end) == 10:
+        return "timestamp < ?", (date.fromisoformat(end) + timedelta(days=1)).isoformat()
+    if len(end) == 7:
+        year, month = map(int, end.split("-"))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return "timestamp < ?", f"{year:04d}-{month:02d}"
+    return "timestamp <= ?", end
+
+
+class MetricsQuery:
+    """
+    Windowed aggregates over the metrics table, plus CSV import.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        create_metrics_table(self._conn)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metrics_imports (
+                path TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL,
+                rows INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    # ---------- import ----------
+
+    def import_csv(self, csv_path: str, tool: SpreadsheetTool | None = None) -> int:
+        """
+        Append the rows of a metrics CSV not imported before. Returns the
+        number of rows added. A file that got shorter than what was
+        imported is taken to be a new (rotated) file and read from the top.
+        """
+        tool = tool or SpreadsheetTool()
+        path = Path(csv_path).resolve()
+        key = str(path)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT offset, rows FROM metrics_imports WHERE path = ?", (key,)
+            ).fetchone()
+        offset, imported = row if row else (0, 0)
+
+        # Stop at the last complete line; a writer may be mid-row
+        end = tool.complete_lines_end(key)
+        if end < offset:
+            logger.warning("Metrics CSV %s shrank; importing it from the start", key)
+            offset, imported = 0, 0
+        if end == offset:
+            logger.info("No new metrics rows in %s", key)
+            return 0
+
+        header = tool.read_header(key)
+        if header != METRICS_HEADER:
+            raise ValueError(f"Not a metrics CSV (header {header}): {csv_path}")
+
+        added = 0
+        chunks = tool.iter_csv_range(
+            key,
+            offset,
+            end,
+            names=header,
+            chunksize=IMPORT_BATCH_ROWS,
+            dtype={"task_type": str, "notes": str},
+        )
+        with self._lock, self._conn:
+            for chunk in chunks:
+                chunk = chunk[METRICS_HEADER].fillna({"notes": "OK"})
+                self._conn.executemany(
+                    "INSERT INTO metrics (timestamp, task_type, output_length, score, notes) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    chunk.itertuples(index=False, name=None),
+                )
+                added += len(chunk)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metrics_imports (path, offset, rows) VALUES (?, ?, ?)",
+                (key, end, imported + added),
+            )
+
+        logger.info("Imported %d metrics rows from %s", added, key)
+        return added
+
+    # ---------- queries ----------
+
+    def _where(self, start: str | None, end: str | None, task_type: str | None) -> tuple[str, list]:
+        conditions, params = [], []
+        if task_type is not None:
+            conditions.append("task_type = ?")
+            params.append(task_type.upper())
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            condition, bound = _end_bound(end)
+            conditions.append(condition)
+            params.append(bound)
+        return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def _grain(self, grain: str) -> str:
+        if grain not in GRAINS:
+            raise ValueError(f"Unknown grain {grain!r} (expected one of {', '.join(GRAINS)})")
+        return GRAINS[grain]
+
+    def _query(self, sql: str, params: list, columns: list[str]) -> pd.DataFrame:
+        with self._lock:
+            records = self._conn.execute(sql, params).fetchall()
+        return pd.DataFrame.from_records(records, columns=columns)
+
+    def count(self, start: str | None = None, end: str | None = None, task_type: str | None = None) -> int:
+        where, params = self._where(start, end, task_type)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM metrics {where}", params).fetchone()[0]
+
+    def score_trend(
+        self,
+        grain: str = "day",
+        start: str | None = None,
+        end: str | None = None,
+        task_type: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Per period and task type: evaluations, mean/min/max score, and how
+        many had notes (failed at least one check).
+        """
+        period = self._grain(grain)
+        where, params = self._where(start, end, task_type)
+        sql = (
+            f"SELECT {period} AS period, task_type, COUNT(*), AVG(score), MIN(score), MAX(score), "
+            f"SUM(notes != 'OK') FROM metrics {where} "
+            f"GROUP BY period, task_type ORDER BY period, task_type"
+        )
+        return self._query(
+            sql, params,
+            ["period", "task_type", "count", "mean_score", "min_score", "max_score", "with_notes"],
+        )
+
+    def note_frequency(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        task_type: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        How often each failure note occurs, most frequent first, and the
+        share of evaluations in the window that got it.
+        """
+        where, params = self._where(start, end, task_type)
+        # Group by the joined notes first: there are only a few distinct
+        # combinations, so the splitting happens on those, not per row
+        grouped = self._query(
+            f"SELECT notes, COUNT(*) FROM metrics {where} GROUP BY notes", params, ["notes", "count"]
+        )
+        total = int(grouped["count"].sum())
+
+        counts: dict[str, int] = {}
+        for notes, count in grouped.itertuples(index=False, name=None):
+            if notes == "OK":
+                continue
+            for note in notes.split("; "):
+                counts[note] = counts.get(note, 0) + count
+
+        result = pd.DataFrame(sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])), columns=["note", "count"])
+        result["share"] = result["count"] / total if total else 0.0
+        return result
+
+    def length_percentile(
+        self,
+        pct: float = 95,
+        grain: str = "day",
+        start: str | None = None,
+        end: str | None = None,
+        task_type: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Nearest-rank `pct` percentile of output_length per period,
+        computed in SQLite with window functions.
+        """
+        if not 0 < pct <= 100:
+            raise ValueError("pct must be in (0, 100]")
+        period = self._grain(grain)
+        where, params = self._where(start, end, task_type)
+        sql = f"""
+            WITH ranked AS (
+                SELECT {period} AS period, output_length,
+                       ROW_NUMBER() OVER (PARTITION BY {period} ORDER BY output_length) AS rn,
+                       COUNT(*) OVER (PARTITION BY {period}) * ? / 100.0 AS rank
+                FROM metrics {where}
+            )
+            SELECT period, output_length FROM ranked
+            WHERE rn = MAX(1, CAST(rank AS INTEGER) + (rank > CAST(rank AS INTEGER)))
+            ORDER BY period
+        """
+        column = f"p{pct:g}_length"
+        return self._query(sql, [pct] + params, ["period", column])
@@ -0,0 +1,93 @@
+# src/tools/report_state.py
+
+"""
+Saved progress for incremental reports over append-only CSV files.
+
+For each CSV we remember how many bytes were already processed, the
+report totals for those bytes, and two small hashes (start of the file
+and the bytes just before the saved offset). If either hash no longer
+matches, the file was rewritten rather than appended to.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BYTES = 4096
+
+
+def _hash_range(path: Path, start: int, end: int) -> str:
+    with path.open("rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ReportStateStore:
+    """
+    Stores one JSON state file per CSV under `state_dir`.
+    """
+
+    def __init__(self, state_dir: str = "data/report_state"):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def _state_path(self, path: Path) -> Path:
+        name = hashlib.blake2b(str(path).encode("utf-8"), digest_size=16).hexdigest()
+        return self.state_dir / f"{name}.json"
+
+    def _fingerprint(self, path: Path, offset: int) -> dict:
+        return {
+            "head_hash": _hash_range(path, 0, min(offset, FINGERPRINT_BYTES)),
+            "tail_hash": _hash_range(path, max(0, offset - FINGERPRINT_BYTES), offset),
+        }
+
+    def load(self, file_path: str) -> tuple[int, dict] | None:
+        """
+        Returns (offset, aggregates) if the saved state still describes
+        the start of the file, otherwise None.
+        """
+        path = Path(file_path).resolve()
+        state_path = self._state_path(path)
+
+        if not state_path.exists():
+            return None
+
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Report state is unreadable, ignoring: %s", state_path)
+            return None
+
+        offset = state["offset"]
+        if path.stat().st_size < offset:
+            logger.info("File shrank since last report, recomputing: %s", path)
+            return None
+
+        if self._fingerprint(path, offset) != state["fingerprint"]:
+            logger.info("File was rewritten since last report, recomputing: %s", path)
+            return None
+
+        return offset, state["aggregates"]
+
+    def save(self, file_path: str, offset: int, aggregates: dict):
+        """
+        Save the aggregates for the first `offset` bytes of the file.
+        """
+        path = Path(file_path).resolve()
+        state_path = self._state_path(path)
+
+        state = {
+            "path": str(path),
+            "offset": offset,
+            "fingerprint": self._fingerprint(path, offset),
+            "aggregates": aggregates,
+        }
+
+        tmp_path = state_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp_path, state_path)
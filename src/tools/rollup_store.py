@@ -0,0 +1,306 @@
+# src/tools/rollup_store.py
+
+"""
+Precomputed daily / weekly / monthly sales rollups per client.
+
+The rollups live in a SQLite file next to the data (.rollups.db in the
+data's directory). Each CSV file's contribution is stored separately,
+keyed by the file, so refresh() only parses files that are new or
+changed (by size and mtime) and drops the rows of files that are gone.
+Queries over date ranges and clients then sum a few thousand rollup
+rows instead of rescanning the CSVs.
+
+Periods are labelled by their first day: 'YYYY-MM-DD' for days,
+the Monday of the ISO week for weeks, 'YYYY-MM' for months. Rows whose
+date is missing or doesn't parse are rolled up under the period ''
+(UNDATED), so they still count in the totals and row counts; date
+range queries leave them out.
+"""
+
+import glob
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from tools.spreadsheet_parser import SpreadsheetTool
+
+logger = logging.getLogger(__name__)
+
+GRAINS = ("day", "week", "month")
+
+ROLLUP_FILE = ".rollups.db"
+
+UNDATED = ""
+
+ROLLUP_COLUMNS = ("date", "client", "revenue", "expenses")
+
+
+def _is_rollup_column(name: str) -> bool:
+    return name in ROLLUP_COLUMNS
+
+
+def rollup_frame(df: pd.DataFrame) -> list[tuple]:
+    """
+    (grain, period, client, revenue, expenses, rows) for one file's rows.
+    Runs in SpreadsheetTool's worker processes.
+
+    Rows are grouped once per (date, client); weeks and months are
+    rolled up from those daily sums.
+    """
+    if "client" not in df:
+        df = df.assign(client="")
+
+    grouped = df.groupby([df["date"], df["client"].astype(str)], sort=False, dropna=False)
+    daily = grouped[["revenue", "expenses"]].sum()
+    daily["rows"] = grouped.size()
+
+    dates = pd.DatetimeIndex(pd.to_datetime(daily.index.get_level_values(0), format="mixed", errors="coerce"))
+    clients = daily.index.get_level_values(1)
+    labels = {
+        "day": dates.strftime("%Y-%m-%d").fillna(UNDATED),
+        "week": (dates - pd.to_timedelta(dates.weekday, unit="D")).strftime("%Y-%m-%d").fillna(UNDATED),
+        "month": dates.strftime("%Y-%m").fillna(UNDATED),
+    }
+
+    rows = []
+    for grain in GRAINS:
+        table = daily.groupby([labels[grain], clients], sort=False).sum()
+        periods, names = table.index.get_level_values(0), table.index.get_level_values(1)
+        rows.extend(zip(
+            [grain] * len(table),
+            periods.tolist(),
+            names.tolist(),
+            table["revenue"].tolist(),
+            table["expenses"].tolist(),
+            table["rows"].tolist(),
+        ))
+    return rows
+
+
+def rollup_location(source: str) -> Path:
+    """
+    Where the rollups for `source` (file, directory or glob) are kept:
+    in the directory holding the data.
+    """
+    path = Path(source)
+    if path.is_dir():
+        return path / ROLLUP_FILE
+    if glob.has_magic(source):
+        parts = []
+        for part in path.parts:
+            if glob.has_magic(part):
+                break
+            parts.append(part)
+        return Path(*parts) / ROLLUP_FILE if parts else Path(ROLLUP_FILE)
+    return path.parent / ROLLUP_FILE
+
+
+class RollupStore:
+    """
+    Rollups for one data source (a CSV file, directory or glob pattern).
+    """
+
+    def __init__(self, source: str, tool: SpreadsheetTool | None = None, db_path: str | None = None):
+        self.source = source
+        self.tool = tool or SpreadsheetTool()
+        self.db_path = Path(db_path) if db_path else rollup_location(source)
+        self.base_dir = self.db_path.parent.resolve()
+
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS rollup_files (
+                file TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS rollups (
+                grain TEXT NOT NULL,
+                period TEXT NOT NULL,
+                client TEXT NOT NULL,
+                file TEXT NOT NULL,
+                revenue NUMERIC NOT NULL,
+                expenses NUMERIC NOT NULL,
+                rows INTEGER NOT NULL,
+                PRIMARY KEY (grain, period, client, file)
+            );
+            CREATE INDEX IF NOT EXISTS idx_rollups_client ON rollups (grain, client, period);
+            CREATE INDEX IF NOT EXISTS idx_rollups_file ON rollups (file);
+            """
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def _key(self, path: Path) -> str:
+        """
+        File name as stored: relative to the rollup directory if possible.
+        """
+        resolved = path.resolve()
+        try:
+            return str(resolved.relative_to(self.base_dir))
+        except ValueError:
+            return str(resolved)
+
+    def _source_files(self) -> dict[str, Path]:
+        return {self._key(p): p for p in self.tool.resolve_paths(self.source)}
+
+    def refresh(self) -> dict:
+        """
+        Bring the rollups up to date with the files in the source.
+        Returns counts of files added, updated, removed and unchanged.
+        """
+        files = self._source_files()
+
+        with self._lock:
+            known = {
+                file: (size, mtime_ns)
+                for file, size, mtime_ns in self._conn.execute(
+                    "SELECT file, size, mtime_ns FROM rollup_files"
+                )
+            }
+
+        changed = []
+        for key, path in files.items():
+            stat = path.stat()
+            if known.get(key) != (stat.st_size, stat.st_mtime_ns):
+                changed.append((key, path, stat))
+
+        # Files under this directory that no longer exist. Other sources
+        # sharing the directory keep their own (still existing) files.
+        removed = [
+            key for key in known
+            if key not in files and not (self.base_dir / key).exists()
+        ]
+
+        results = []
+        if changed:
+            logger.info("Rolling up %d new or changed files", len(changed))
+            results = self.tool.aggregate_files(
+                [path for _, path, _ in changed], rollup_frame, usecols=_is_rollup_column
+            )
+
+        with self._lock, self._conn:
+            for key in removed:
+                self._conn.execute("DELETE FROM rollups WHERE file = ?", (key,))
+                self._conn.execute("DELETE FROM rollup_files WHERE file = ?", (key,))
+
+            for (key, _, stat), rows in zip(changed, results):
+                self._conn.execute("DELETE FROM rollups WHERE file = ?", (key,))
+                self._conn.executemany(
+                    "INSERT INTO rollups (grain, period, client, file, revenue, expenses, rows) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(g, p, c, key, r, e, n) for g, p, c, r, e, n in rows or []],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rollup_files (file, size, mtime_ns) VALUES (?, ?, ?)",
+                    (key, stat.st_size, stat.st_mtime_ns),
+                )
+
+        new = sum(1 for key, _, _ in changed if key not in known)
+        stats = {
+            "added": new,
+            "updated": len(changed) - new,
+            "removed": len(removed),
+            "unchanged": len(files) - len(changed),
+        }
+        logger.info("Rollups refreshed: %s", stats)
+        return stats
+
+    def query(
+        self,
+        grain: str = "day",
+        start: str | None = None,
+        end: str | None = None,
+        clients: list[str] | None = None,
+        by_client: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Revenue, expenses and row counts per period (and per client with
+        by_client=True), summed over the source's files.
+
+        `start` / `end` are inclusive period labels ('2025-11-01', or
+        '2025-11' for months); with either, UNDATED rows are left out.
+        Call refresh() first to include new files.
+        """
+        if grain not in GRAINS:
+            raise ValueError(f"Unknown grain {grain!r} (expected one of {', '.join(GRAINS)})")
+
+        files = [(key,) for key in self._source_files()]
+        where = ["grain = ?"]
+        params: list = [grain]
+        if start is not None:
+            where.append("period >= ?")
+            params.append(start)
+        if end is not None:
+            where.append("period <= ?")
+            params.append(end)
+        if start is not None or end is not None:
+            where.append("period <> ?")
+            params.append(UNDATED)
+        if clients is not None:
+            where.append(f"client IN ({', '.join('?' * len(clients))})")
+            params.extend(clients)
+        # The source's files go in a temp table: there may be thousands
+        where.append("file IN (SELECT file FROM temp.source_files)")
+
+        group = "period, client" if by_client else "period"
+        sql = (
+            f"SELECT {group}, SUM(revenue), SUM(expenses), SUM(rows) FROM rollups "
+            f"WHERE {' AND '.join(where)} GROUP BY {group} ORDER BY {group}"
+        )
+
+        with self._lock:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS source_files (file TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM temp.source_files")
+            self._conn.executemany("INSERT INTO temp.source_files (file) VALUES (?)", files)
+            records = self._conn.execute(sql, params).fetchall()
+
+        columns = group.split(", ") + ["revenue", "expenses", "rows"]
+        return pd.DataFrame.from_records(records, columns=columns)
+
+    def verify(self) -> list[str]:
+        """
+        Recompute the rollups from the raw files and compare. Returns a
+        description of each difference (empty list = rollups are correct).
+        """
+        stored = self.query("day", by_client=True)
+
+        df = self.tool.read_many(self.source, usecols=_is_rollup_column)
+        expected = [r for r in rollup_frame(df) if r[0] == "day"]
+        expected = pd.DataFrame(
+            [r[1:] for r in expected], columns=["period", "client", "revenue", "expenses", "rows"]
+        )
+
+        merged = stored.merge(
+            expected,
+            on=["period", "client"],
+            how="outer",
+            suffixes=("_stored", "_actual"),
+            indicator="status",
+        )
+
+        problems = []
+        for row in merged.itertuples(index=False):
+            label = f"{row.period} / {row.client or '-'}"
+            if row.status == "left_only":
+                problems.append(f"{label}: in rollups but not in the data")
+            elif row.status == "right_only":
+                problems.append(f"{label}: missing from rollups")
+            else:
+                for name in ("revenue", "expenses", "rows"):
+                    have, want = getattr(row, f"{name}_stored"), getattr(row, f"{name}_actual")
+                    if not np.isclose(have, want):
+                        problems.append(f"{label}: {name} is {have}, expected {want}")
+
+        if problems:
+            logger.warning("Rollup verification found %d problems", len(problems))
+        return problems
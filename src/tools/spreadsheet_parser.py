@@ -1,35 +1,368 @@
 # src/tools/spreadsheet_parser.py
 
+import csv
+import glob
+import io
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterator
 
 import pandas as pd
 
+from tools.columnar_cache import ColumnarCache
+from utils.tracing import traced
+from config import (
+    SPREADSHEET_CACHE,
+    SPREADSHEET_CACHE_DIR,
+    SPREADSHEET_CACHE_MAX_BYTES,
+    SPREADSHEET_WORKERS,
+)
+
 logger = logging.getLogger(__name__)
 
+# Files picked up from a directory. Compression is inferred from the
+# extension by pandas; .zst needs the optional 'zstandard' package.
+CSV_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.zst")
+
+_GLOB_CHARS = set("*?[")
+
+
+def _parse_file(path: str, usecols: list[str] | None, dtype: dict | None) -> pd.DataFrame:
+    """
+    Parse one CSV (in a worker process). A zero-byte file gives an empty
+    frame.
+    """
+    try:
+        return pd.read_csv(path, usecols=usecols, dtype=dtype)
+    except pd.errors.EmptyDataError:
+        logger.warning("CSV file has no data: %s", path)
+        return pd.DataFrame()
+
+
+def _parse_and_aggregate(path: str, usecols, dtype, aggregate: Callable):
+    """
+    Parse one CSV and reduce it with `aggregate` (in a worker process),
+    so only the small partial result is sent back. Empty files give None.
+    """
+    df = _parse_file(path, usecols, dtype)
+    if df.empty:
+        return None
+    return aggregate(df)
+
+
+class _BoundedReader(io.RawIOBase):
+    """
+    Read-only view of a file that stops at a fixed byte offset.
+    """
+
+    def __init__(self, f, end: int):
+        self._f = f
+        self._end = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        remaining = self._end - self._f.tell()
+        if remaining <= 0:
+            return 0
+        view = memoryview(buffer)[:remaining]
+        return self._f.readinto(view)
+
+
 class SpreadsheetTool:
     """
     Tool for reading CSV files into a pandas DataFrame.
     Agents can use this to analyze business data.
+
+    If a ColumnarCache is given (or SPREADSHEET_CACHE is enabled), parsed
+    files are cached on disk and later reads skip CSV parsing.
+
+    read_many() / aggregate_many() accept a file, a directory or a glob
+    pattern and parse the files in parallel on `workers` processes.
     """
 
-    def read_csv(self, file_path: str) -> pd.DataFrame:
-        """
-        Reads a CSV file and returns a pandas DataFrame.
-        """
+    def __init__(self, cache: ColumnarCache | None = None, workers: int = SPREADSHEET_WORKERS):
+        if cache is None and SPREADSHEET_CACHE:
+            cache = ColumnarCache(SPREADSHEET_CACHE_DIR, SPREADSHEET_CACHE_MAX_BYTES)
+        self.cache = cache
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self._pool: ProcessPoolExecutor | None = None
 
+    def _check_exists(self, file_path: str) -> Path:
         path = Path(file_path)
-        logger.info("Reading CSV file: %s", path)
 
         if not path.exists():
             logger.error("CSV file not found: %s", path)
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        return path
+
+    def _cache_put(self, path: Path, df: pd.DataFrame):
+        """
+        Cache a parsed file. A failure is logged, not raised: the read
+        itself has already succeeded.
+        """
+        try:
+            self.cache.put(path, df)
+        except Exception as e:
+            logger.warning("Could not cache %s: %s", path, e)
+
+    @traced("csv.parse")
+    def read_csv(self, file_path: str) -> pd.DataFrame:
+        """
+        Reads a CSV file and returns a pandas DataFrame.
+        """
+
+        logger.info("Reading CSV file: %s", file_path)
+        path = self._check_exists(file_path)
+
+        if self.cache is not None:
+            df = self.cache.get(path)
+            if df is not None:
+                return df
+
         df = pd.read_csv(path)
 
         if df.empty:
             logger.warning("CSV file is empty: %s", path)
             raise ValueError(f"CSV file is empty: {file_path}")
 
+        if self.cache is not None:
+            self._cache_put(path, df)
+
         logger.info("CSV read successfully with %d rows and %d columns", *df.shape)
         return df
+
+    @staticmethod
+    def is_multi_source(source: str) -> bool:
+        """
+        True if `source` is a directory or a glob pattern.
+        """
+        return Path(source).is_dir() or bool(_GLOB_CHARS & set(str(source)))
+
+    def resolve_paths(self, source: str) -> list[Path]:
+        """
+        The CSV files `source` refers to, sorted: the file itself, the
+        CSV files in a directory (see CSV_PATTERNS), or a glob's matches.
+        """
+        path = Path(source)
+
+        if path.is_dir():
+            paths = {p for pattern in CSV_PATTERNS for p in path.glob(pattern)}
+        elif _GLOB_CHARS & set(str(source)):
+            paths = {Path(p) for p in glob.glob(str(source), recursive=True)}
+            paths = {p for p in paths if p.is_file()}
+        else:
+            return [self._check_exists(source)]
+
+        if not paths:
+            logger.error("No CSV files found for: %s", source)
+            raise FileNotFoundError(f"No CSV files found for: {source}")
+
+        return sorted(paths)
+
+    def _map_files(self, fn: Callable, paths: list[Path], *args) -> list:
+        """
+        fn(str(path), *args) for every path, in order, on a process pool
+        when there is more than one file to do.
+        """
+        if self.workers <= 1 or len(paths) <= 1:
+            return [fn(str(p), *args) for p in paths]
+
+        # The pool is started once and reused, so later reports don't pay
+        # for starting the worker processes again.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        logger.info("Parsing %d CSV files on %d processes", len(paths), self.workers)
+        chunksize = max(1, len(paths) // (self.workers * 4))
+        return list(self._pool.map(
+            fn,
+            [str(p) for p in paths],
+            *([a] * len(paths) for a in args),
+            chunksize=chunksize,
+        ))
+
+    def close(self):
+        """
+        Stop the worker processes, if any were started.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @traced("csv.parse_many")
+    def read_many(
+        self,
+        source: str,
+        usecols: list[str] | None = None,
+        dtype: dict | None = None,
+    ) -> pd.DataFrame:
+        """
+        Parse every CSV in `source` (file, directory or glob) in parallel
+        and concatenate them in path order.
+
+        Files already in the columnar cache are not parsed again (the
+        cache is only used when all columns are read). Empty files are
+        skipped.
+        """
+
+        paths = self.resolve_paths(source)
+        logger.info("Reading %d CSV files from: %s", len(paths), source)
+
+        use_cache = self.cache is not None and usecols is None and dtype is None
+        frames: dict[Path, pd.DataFrame] = {}
+        if use_cache:
+            for path in paths:
+                df = self.cache.get(path)
+                if df is not None:
+                    frames[path] = df
+
+        missing = [p for p in paths if p not in frames]
+        for path, df in zip(missing, self._map_files(_parse_file, missing, usecols, dtype)):
+            if use_cache and not df.empty:
+                self._cache_put(path, df)
+            frames[path] = df
+
+        non_empty = [frames[p] for p in paths if not frames[p].empty]
+        if not non_empty:
+            logger.warning("All CSV files are empty: %s", source)
+            raise ValueError(f"CSV files are empty: {source}")
+
+        df = pd.concat(non_empty, ignore_index=True)
+        logger.info("Read %d files with %d rows in total", len(non_empty), len(df))
+        return df
+
+    def aggregate_many(
+        self,
+        source: str,
+        aggregate: Callable[[pd.DataFrame], object],
+        usecols: list[str] | None = None,
+        dtype: dict | None = None,
+    ) -> list:
+        """
+        Parse every CSV in `source` in parallel and return
+        [aggregate(df) for each non-empty file], in path order.
+
+        `aggregate` runs in the worker processes, so it must be a
+        module-level function; only its (small) results come back.
+        """
+
+        paths = self.resolve_paths(source)
+        logger.info("Aggregating %d CSV files from: %s", len(paths), source)
+
+        results = [r for r in self.aggregate_files(paths, aggregate, usecols, dtype) if r is not None]
+        if not results:
+            logger.warning("All CSV files are empty: %s", source)
+            raise ValueError(f"CSV files are empty: {source}")
+        return results
+
+    @traced("csv.aggregate_files")
+    def aggregate_files(
+        self,
+        paths: list[Path],
+        aggregate: Callable[[pd.DataFrame], object],
+        usecols=None,
+        dtype: dict | None = None,
+    ) -> list:
+        """
+        Like aggregate_many(), for an explicit list of files. Results line
+        up with `paths`; empty files give None.
+        """
+        return self._map_files(_parse_and_aggregate, paths, usecols, dtype, aggregate)
+
+    def iter_csv_chunks(
+        self,
+        file_path: str,
+        chunksize: int = 100_000,
+        usecols: list[str] | None = None,
+        dtype: dict | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Reads a CSV file in chunks of at most `chunksize` rows.
+
+        Only `usecols` are parsed (all columns if None), so memory use is
+        bounded by the chunk size instead of the file size.
+        """
+
+        logger.info("Streaming CSV file: %s (chunksize=%d)", file_path, chunksize)
+        path = self._check_exists(file_path)
+
+        with pd.read_csv(
+            path, usecols=usecols, dtype=dtype, chunksize=chunksize
+        ) as reader:
+            yield from reader
+
+    def read_header(self, file_path: str) -> list[str]:
+        """
+        Column names from the first line of a CSV file.
+        """
+
+        path = self._check_exists(file_path)
+        with path.open("r", newline="", encoding="utf-8") as f:
+            return next(csv.reader(f), [])
+
+    def complete_lines_end(self, file_path: str, block_size: int = 64 * 1024) -> int:
+        """
+        Byte offset just past the last newline in the file.
+
+        Rows after this offset may still be in the middle of being written.
+        """
+
+        path = self._check_exists(file_path)
+        size = path.stat().st_size
+
+        with path.open("rb") as f:
+            pos = size
+            while pos > 0:
+                start = max(0, pos - block_size)
+                f.seek(start)
+                block = f.read(pos - start)
+                idx = block.rfind(b"\n")
+                if idx != -1:
+                    return start + idx + 1
+                pos = start
+
+        return 0
+
+    def iter_csv_range(
+        self,
+        file_path: str,
+        start: int,
+        end: int,
+        names: list[str] | None = None,
+        chunksize: int = 100_000,
+        usecols: list[str] | None = None,
+        dtype: dict | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Reads the rows stored between byte offsets `start` and `end`.
+
+        With start == 0 the header line is read from the file. Otherwise
+        `start` must point at the beginning of a row and `names` gives the
+        column names from the header.
+        """
+
+        logger.info("Reading CSV byte range %d-%d of %s", start, end, file_path)
+        path = self._check_exists(file_path)
+
+        if end <= start:
+            return
+
+        header = "infer" if start == 0 else None
+
+        with path.open("rb") as f:
+            f.seek(start)
+            bounded = io.BufferedReader(_BoundedReader(f, end))
+            with pd.read_csv(
+                bounded,
+                header=header,
+                names=names if start else None,
+                usecols=usecols,
+                dtype=dtype,
+                chunksize=chunksize,
+            ) as reader:
+                yield from reader
@@ -0,0 +1,354 @@
+# src/utils/llm_cache.py
+
+"""
+Response cache for LLM clients.
+
+CachedLLMClient wraps any client that has generate(prompt, max_tokens)
+(and optionally agenerate / generate_stream). Responses are stored under a hash of
+(provider, model, prompt, max_tokens), so the same prompt is only sent
+to the model once.
+
+Backends:
+- InMemoryCacheBackend: LRU dict, lost when the process exits
+- SQLiteCacheBackend: persistent, with TTL and max-entry eviction
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator
+
+from config import (
+    LLM_CACHE,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+    LLM_PROVIDER,
+)
+
+logger = logging.getLogger(__name__)
+
+# Clients report failures as text with these prefixes; never cache those.
+ERROR_PREFIXES = ("[RealLLMClient]", "[LLMPool]")
+
+
+def cache_key(provider: str, model: str, prompt: str, max_tokens: int) -> str:
+    payload = json.dumps([provider, model, prompt, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class InMemoryCacheBackend:
+    """
+    LRU cache kept in process memory.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[str, float] | None:
+        """
+        Returns (response, original latency in seconds) or None.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def put(self, key: str, response: str, latency: float):
+        with self._lock:
+            self._data[key] = (response, latency)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCacheBackend:
+    """
+    Persistent cache in a SQLite file.
+
+    Entries older than `ttl` seconds are treated as missing (ttl <= 0
+    disables expiry). When there are more than `max_entries` rows, the
+    least recently used ones are deleted.
+
+    Hits don't write: their last-used times are collected and written in
+    one batch every TOUCH_BATCH hits or TOUCH_INTERVAL seconds, and
+    before evicting (so eviction sees them). Losing a batch on a crash
+    only makes the LRU order slightly stale.
+    """
+
+    TOUCH_BATCH = 256
+    TOUCH_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        db_path: str = LLM_CACHE_PATH,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        # key -> last-used time, not written yet
+        self._touched: dict[str, float] = {}
+        self._touched_since = time.monotonic()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Durable enough under WAL (a power cut may lose the last commits,
+        # never corrupt the file), without an fsync per commit
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                latency REAL NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)"
+        )
+        self._conn.commit()
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def _write_touches(self):
+        """
+        Write the collected last-used times (caller holds the lock and commits).
+        """
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE llm_cache SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            self._touched.clear()
+        self._touched_since = time.monotonic()
+
+    def get(self, key: str) -> tuple[str, float] | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, latency, created_at FROM llm_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, latency, created_at = row
+            if self.ttl > 0 and created_at + self.ttl < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._rows -= 1
+                self._touched.pop(key, None)
+                return None
+
+            self._touched[key] = now
+            if (
+                len(self._touched) >= self.TOUCH_BATCH
+                or time.monotonic() - self._touched_since >= self.TOUCH_INTERVAL
+            ):
+                self._write_touches()
+                self._conn.commit()
+            return response, latency
+
+    def put(self, key: str, response: str, latency: float):
+        now = time.time()
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._touched.pop(key, None)
+            self._conn.execute(
+                """
+                INSERT INTO llm_cache (key, response, latency, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    response = excluded.response,
+                    latency = excluded.latency,
+                    created_at = excluded.created_at,
+                    last_used = excluded.last_used
+                """,
+                (key, response, latency, now, now),
+            )
+            if not exists:
+                self._rows += 1
+            if self._rows > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        Delete the least recently used rows over max_entries (caller holds
+        the lock and commits). The count is re-read first, since other
+        processes may share the file.
+        """
+        self._write_touches()
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        excess = self._rows - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_used, rowid LIMIT ?
+                )
+                """,
+                (excess,),
+            )
+            self._rows -= excess
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._touched.clear()
+            self._rows = 0
+
+
+class CachedLLMClient:
+    """
+    Wraps an LLM client and answers repeated prompts from a cache.
+
+    stats() reports hits, misses, hit rate and the model time saved
+    (the original latency of each cached response, summed over hits).
+    """
+
+    def __init__(self, client, backend=None):
+        self.client = client
+        self.backend = backend if backend is not None else InMemoryCacheBackend()
+        self.provider = getattr(client, "provider", LLM_PROVIDER)
+        self.model_name = getattr(client, "model_name", type(client).__name__)
+
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        self._lock = threading.Lock()
+
+    def _key(self, prompt: str, max_tokens: int) -> str:
+        return cache_key(self.provider, self.model_name, prompt, max_tokens)
+
+    def _lookup(self, key: str) -> str | None:
+        entry = self.backend.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            response, latency = entry
+            self.hits += 1
+            self.time_saved += latency
+        logger.info("LLM cache hit (saved %.3fs)", latency)
+        return response
+
+    def _store(self, key: str, response: str, latency: float):
+        if response.startswith(ERROR_PREFIXES):
+            return
+        self.backend.put(key, response, latency)
+
+    def generate(self, prompt: str, max_tokens: int = 512) -> str:
+        key = self._key(prompt, max_tokens)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        response = self.client.generate(prompt, max_tokens=max_tokens)
+        self._store(key, response, time.perf_counter() - start)
+        return response
+
+    async def agenerate(self, prompt: str, max_tokens: int = 512) -> str:
+        key = self._key(prompt, max_tokens)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        response = await self.client.agenerate(prompt, max_tokens=max_tokens)
+        self._store(key, response, time.perf_counter() - start)
+        return response
+
+    def generate_stream(self, prompt: str, max_tokens: int = 512) -> Iterator[str]:
+        """
+        A hit is yielded in one piece. On a miss the wrapped client's
+        stream is passed through and stored once it has finished.
+        """
+        key = self._key(prompt, max_tokens)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        stream = getattr(self.client, "generate_stream", None)
+        start = time.perf_counter()
+        if stream is None:
+            response = self.client.generate(prompt, max_tokens=max_tokens)
+            yield response
+        else:
+            parts = []
+            for chunk in stream(prompt, max_tokens=max_tokens):
+                parts.append(chunk)
+                yield chunk
+            # A stream that broke off ends with an error chunk; don't keep it
+            if parts and parts[-1].startswith(ERROR_PREFIXES):
+                return
+            response = "".join(parts)
+        self._store(key, response, time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "time_saved_seconds": self.time_saved,
+            }
+
+
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+
+def get_default_backend():
+    """
+    The process-wide backend selected by LLM_CACHE ('memory' or 'sqlite'),
+    shared by every agent. Returns None when caching is off.
+    """
+    global _default_backend
+
+    if LLM_CACHE not in ("memory", "sqlite"):
+        return None
+
+    with _default_backend_lock:
+        if _default_backend is None:
+            if LLM_CACHE == "sqlite":
+                _default_backend = SQLiteCacheBackend()
+            else:
+                _default_backend = InMemoryCacheBackend()
+        return _default_backend
+
+
+def with_cache(client):
+    """
+    Wrap client in a CachedLLMClient if LLM_CACHE is enabled.
+    """
+    backend = get_default_backend()
+    if backend is None:
+        return client
+    logger.info("Caching LLM responses with %s", type(backend).__name__)
+    return CachedLLMClient(client, backend)
@@ -7,23 +7,57 @@ LLM client abstraction.
 - RealLLMClient: uses Gemini (via google-generativeai) when configured.
 
 Agents (EmailAgent, MeetingAgent) can choose Fake or Real based on config.
+
+Both clients have a blocking generate() and an async agenerate(), so
+many LLM calls can be in flight at once from asyncio code.
+
+generate_stream() yields the answer in pieces as the model produces
+them, so callers can show output before the whole answer is ready.
+
+RealLLMClient.generate()/agenerate()/generate_stream() never raise;
+errors come back as text. Code that wants to retry (see utils.llm_pool)
+uses RealLLMClient.complete() / acomplete() / complete_stream(), which
+raise instead. FakeLLMClient has no complete*(): its generate*() calls
+raise TransientLLMError for injected failures (failure_rate > 0), and
+the pool retries those.
 """
 
+import asyncio
 import logging
-from textwrap import shorten
-from typing import Optional
+import random
+import re
+import time
+from typing import Iterator, Optional
 
-from config import LLM_PROVIDER, LLM_API_KEY
+from config import (
+    LLM_PROVIDER,
+    LLM_API_KEY,
+    LLM_MODEL,
+    LLM_TIMEOUT,
+    FAKE_LLM_LATENCY,
+    FAKE_LLM_TOKEN_DELAY,
+)
+from utils.logging_config import shortened
 
 logger = logging.getLogger(__name__)
 
-# Try to import google.generativeai for Gemini, but don't crash if missing.
-try:
-    import google.generativeai as genai
-    _HAS_GEMINI = True
-except ImportError:
-    _HAS_GEMINI = False
-    genai = None  # type: ignore
+
+class TransientLLMError(Exception):
+    """
+    A failure worth retrying (rate limited, timeout, server overloaded).
+    """
+
+
+def _import_gemini():
+    """
+    Import google.generativeai on first use (it is slow to import).
+    Returns None if it is not installed.
+    """
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        return None
+    return genai
 
 
 class FakeLLMClient:
@@ -33,14 +67,94 @@ class FakeLLMClient:
     It does NOT generate real language, but:
     - Logs the prompt
     - Returns a stub response indicating what it would have done
+
+    `latency` (seconds) simulates a slow model, so throughput of the
+    sync and async paths can be measured offline. With `failure_rate`
+    > 0, that fraction of calls raises TransientLLMError, to exercise
+    retry and rate-limit handling. `token_delay` is the time per token
+    after the first: streamed calls pause that long between tokens, and
+    blocking calls wait for all of it, so time-to-first-token can be
+    compared.
     """
 
+    provider = "fake"
+    model_name = "fake"
+
+    def __init__(
+        self,
+        latency: float = FAKE_LLM_LATENCY,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+        token_delay: float = FAKE_LLM_TOKEN_DELAY,
+    ):
+        self.latency = latency
+        self.token_delay = token_delay
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    def _maybe_fail(self):
+        if self.failure_rate > 0 and self._random.random() < self.failure_rate:
+            raise TransientLLMError("FakeLLMClient injected failure")
+
     def generate(self, prompt: str, max_tokens: int = 512) -> str:
         logger.info(
             "FakeLLMClient.generate called with prompt (first 120 chars): %s",
-            shorten(prompt, width=120, placeholder="..."),
+            shortened(prompt, width=120),
         )
 
+        delay = self._total_delay()
+        if delay > 0:
+            time.sleep(delay)
+
+        self._maybe_fail()
+        return self._response()
+
+    async def agenerate(self, prompt: str, max_tokens: int = 512) -> str:
+        logger.info(
+            "FakeLLMClient.agenerate called with prompt (first 120 chars): %s",
+            shortened(prompt, width=120),
+        )
+
+        delay = self._total_delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        self._maybe_fail()
+        return self._response()
+
+    def generate_stream(self, prompt: str, max_tokens: int = 512) -> Iterator[str]:
+        """
+        Yields the fake response word by word (with trailing whitespace),
+        after `latency` seconds and then `token_delay` between tokens.
+        """
+        logger.info(
+            "FakeLLMClient.generate_stream called with prompt (first 120 chars): %s",
+            shortened(prompt, width=120),
+        )
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        self._maybe_fail()
+        for i, token in enumerate(self._tokens()):
+            if i and self.token_delay > 0:
+                time.sleep(self.token_delay)
+            yield token
+
+    def _tokens(self) -> list[str]:
+        # Words with their trailing whitespace, so "".join() gives the response back
+        return re.findall(r"\S+\s*|\s+", self._response())
+
+    def _total_delay(self) -> float:
+        """
+        Time a non-streaming call takes: the start-up latency plus the
+        time to "generate" every token after the first.
+        """
+        if self.token_delay <= 0:
+            return self.latency
+        return self.latency + self.token_delay * (len(self._tokens()) - 1)
+
+    def _response(self) -> str:
         return (
             "FAKE LLM RESPONSE\n"
             "-----------------\n"
@@ -63,11 +177,13 @@ class RealLLMClient:
         self,
         api_key: Optional[str] = None,
         provider: Optional[str] = None,
-        model_name: str = "models/gemini-flash-latest",
+        model_name: str = LLM_MODEL,
+        timeout: float = LLM_TIMEOUT,
     ):
         self.provider = provider or LLM_PROVIDER
         self.api_key = api_key or LLM_API_KEY
         self.model_name = model_name
+        self.timeout = timeout
 
         if self.provider != "gemini":
             raise ValueError(
@@ -81,7 +197,8 @@ class RealLLMClient:
                 "Set LLM_API_KEY in your .env or environment."
             )
 
-        if not _HAS_GEMINI:
+        genai = _import_gemini()
+        if genai is None:
             raise ImportError(
                 "google-generativeai is not installed. "
                 "Install it with: pip install google-generativeai"
@@ -106,17 +223,81 @@ class RealLLMClient:
         """
         logger.info(
             "RealLLMClient.generate called (first 120 chars of prompt): %s",
-            shorten(prompt, width=120, placeholder="..."),
+            shortened(prompt, width=120),
         )
 
         try:
-            response = self.client.generate_content(prompt)
-            # response.text is usually the main text output
-            text = getattr(response, "text", None)
-            if not text:
-                logger.warning("Gemini response had no 'text' attribute or was empty.")
-                return "[RealLLMClient] Empty response from Gemini."
-            return text
+            return self.complete(prompt, max_tokens)
         except Exception as e:
             logger.exception("Error while calling Gemini LLM")
             return f"[RealLLMClient] Error while calling LLM: {e}"
+
+    async def agenerate(self, prompt: str, max_tokens: int = 512) -> str:
+        """
+        Async version of generate(), using Gemini's native async call.
+
+        Errors are handled the same way as in generate().
+        """
+        logger.info(
+            "RealLLMClient.agenerate called (first 120 chars of prompt): %s",
+            shortened(prompt, width=120),
+        )
+
+        try:
+            return await self.acomplete(prompt, max_tokens)
+        except Exception as e:
+            logger.exception("Error while calling Gemini LLM")
+            return f"[RealLLMClient] Error while calling LLM: {e}"
+
+    def generate_stream(self, prompt: str, max_tokens: int = 512) -> Iterator[str]:
+        """
+        Stream the Gemini answer chunk by chunk.
+
+        Errors are yielded as text, like generate() returns them.
+        """
+        logger.info(
+            "RealLLMClient.generate_stream called (first 120 chars of prompt): %s",
+            shortened(prompt, width=120),
+        )
+
+        try:
+            yield from self.complete_stream(prompt, max_tokens)
+        except Exception as e:
+            logger.exception("Error while streaming from Gemini LLM")
+            yield f"[RealLLMClient] Error while calling LLM: {e}"
+
+    def complete(self, prompt: str, max_tokens: int = 512) -> str:
+        """
+        Like generate(), but exceptions from Gemini are raised
+        (with a request timeout of `self.timeout` seconds).
+        """
+        response = self.client.generate_content(
+            prompt, request_options={"timeout": self.timeout}
+        )
+        return self._response_text(response)
+
+    async def acomplete(self, prompt: str, max_tokens: int = 512) -> str:
+        response = await self.client.generate_content_async(
+            prompt, request_options={"timeout": self.timeout}
+        )
+        return self._response_text(response)
+
+    def complete_stream(self, prompt: str, max_tokens: int = 512) -> Iterator[str]:
+        """
+        Like generate_stream(), but exceptions from Gemini are raised.
+        """
+        response = self.client.generate_content(
+            prompt, stream=True, request_options={"timeout": self.timeout}
+        )
+        for chunk in response:
+            text = getattr(chunk, "text", None)
+            if text:
+                yield text
+
+    def _response_text(self, response) -> str:
+        # response.text is usually the main text output
+        text = getattr(response, "text", None)
+        if not text:
+            logger.warning("Gemini response had no 'text' attribute or was empty.")
+            return "[RealLLMClient] Empty response from Gemini."
+        return text
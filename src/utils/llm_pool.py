@@ -0,0 +1,431 @@
+# src/utils/llm_pool.py
+
+"""
+Process-wide pool of LLM clients with rate limiting and retries.
+
+LLMClientPool.get(provider, model) hands out one shared client per
+(provider, model). Each client is a ResilientLLMClient, which:
+- waits on token buckets for requests/minute and tokens/minute
+- retries transient errors with exponential backoff and full jitter
+- stops calling the provider for a while after repeated failures
+  (circuit breaker) and answers with an error message right away
+
+Like the plain clients, generate()/agenerate()/generate_stream() never
+raise; when every attempt fails they return a message starting with
+ERROR_PREFIX.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Iterator
+
+from utils.llm_client import FakeLLMClient, RealLLMClient, TransientLLMError
+from utils.llm_cache import with_cache
+from utils.prompts import estimate_tokens as prompt_tokens
+from config import (
+    USE_FAKE_LLM,
+    LLM_PROVIDER,
+    LLM_MODEL,
+    LLM_RPM,
+    LLM_TPM,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    LLM_BREAKER_THRESHOLD,
+    LLM_BREAKER_RESET,
+)
+
+logger = logging.getLogger(__name__)
+
+ERROR_PREFIX = "[LLMPool]"
+
+# Exception class names (from google.api_core and friends) that mean
+# "try again later" rather than "this request is wrong".
+TRANSIENT_ERROR_NAMES = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "GatewayTimeout",
+}
+
+
+def is_transient(error: Exception) -> bool:
+    if isinstance(error, (TransientLLMError, TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in TRANSIENT_ERROR_NAMES
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """
+    Rough token cost of a call: the prompt's estimated tokens, plus
+    the most the model may generate.
+    """
+    return prompt_tokens(prompt) + max_tokens
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `per_minute` tokens per minute.
+
+    Callers reserve tokens up front (the balance may go negative) and
+    then sleep until their reservation is covered, so waiters are served
+    in arrival order.
+    """
+
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """
+        Take `amount` tokens; return how long the caller must wait.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, amount: float = 1) -> float:
+        wait = self._reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, amount: float = 1) -> float:
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. While open,
+    calls are rejected. After `reset_timeout` seconds one trial call is
+    let through; success closes the breaker, failure opens it again. A
+    trial that ends without a result (cancelled, timed out, stream
+    abandoned) is released, so the next call becomes the trial.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            # open, or half_open with the trial call already in flight
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def release(self):
+        """
+        Give up the trial slot without a verdict: back to open, with the
+        reset timeout already served.
+        """
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning("LLM circuit breaker opened after %d failures", self._failures)
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class ResilientLLMClient:
+    """
+    Wraps an LLM client with rate limiting, retries and a circuit breaker.
+
+    Calls the wrapped client's complete()/acomplete()/complete_stream()
+    if it has them (they raise on error), otherwise
+    generate()/agenerate()/generate_stream().
+    """
+
+    def __init__(
+        self,
+        client,
+        rpm: float = LLM_RPM,
+        tpm: float = LLM_TPM,
+        max_retries: int = LLM_MAX_RETRIES,
+        base_delay: float = LLM_RETRY_BASE_DELAY,
+        max_delay: float = LLM_RETRY_MAX_DELAY,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.client = client
+        self.provider = getattr(client, "provider", LLM_PROVIDER)
+        self.model_name = getattr(client, "model_name", type(client).__name__)
+
+        self.request_bucket = TokenBucket(rpm) if rpm > 0 else None
+        self.token_bucket = TokenBucket(tpm) if tpm > 0 else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_RESET)
+
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.throttled_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: anywhere between 0 and the exponential cap
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _count(self, name: str, amount: float = 1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _rejected_message(self) -> str:
+        self._count("rejected")
+        return f"{ERROR_PREFIX} LLM temporarily unavailable (circuit open), please retry shortly."
+
+    def _failed_message(self, error: Exception) -> str:
+        self._count("failures")
+        return f"{ERROR_PREFIX} Error while calling LLM: {error}"
+
+    def generate(self, prompt: str, max_tokens: int = 512) -> str:
+        call = getattr(self.client, "complete", self.client.generate)
+        tokens = estimate_tokens(prompt, max_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                return self._rejected_message()
+
+            waited = 0.0
+            if self.request_bucket:
+                waited += self.request_bucket.acquire(1)
+            if self.token_bucket:
+                waited += self.token_bucket.acquire(tokens)
+            self._count("throttled_seconds", waited)
+            self._count("calls")
+
+            try:
+                result = call(prompt, max_tokens=max_tokens)
+            except BaseException as e:
+                if not isinstance(e, Exception):
+                    # Cancelled, timed out by the caller, interrupted
+                    self.breaker.release()
+                    raise
+                if not is_transient(e):
+                    # The provider answered, it just rejected this request;
+                    # that says nothing bad about its health.
+                    logger.exception("Non-retryable LLM error")
+                    self.breaker.record_success()
+                    return self._failed_message(e)
+
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    logger.warning("LLM call failed after %d attempts: %s", attempt + 1, e)
+                    return self._failed_message(e)
+
+                delay = self._backoff(attempt)
+                logger.info("Transient LLM error (%s), retrying in %.2fs", e, delay)
+                self._count("retries")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+        return self._failed_message(RuntimeError("no attempts made"))
+
+    async def agenerate(self, prompt: str, max_tokens: int = 512) -> str:
+        call = getattr(self.client, "acomplete", self.client.agenerate)
+        tokens = estimate_tokens(prompt, max_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                return self._rejected_message()
+
+            waited = 0.0
+            if self.request_bucket:
+                waited += await self.request_bucket.aacquire(1)
+            if self.token_bucket:
+                waited += await self.token_bucket.aacquire(tokens)
+            self._count("throttled_seconds", waited)
+            self._count("calls")
+
+            try:
+                result = await call(prompt, max_tokens=max_tokens)
+            except BaseException as e:
+                if not isinstance(e, Exception):
+                    # Cancelled, timed out by the caller, interrupted
+                    self.breaker.release()
+                    raise
+                if not is_transient(e):
+                    logger.exception("Non-retryable LLM error")
+                    self.breaker.record_success()
+                    return self._failed_message(e)
+
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    logger.warning("LLM call failed after %d attempts: %s", attempt + 1, e)
+                    return self._failed_message(e)
+
+                delay = self._backoff(attempt)
+                logger.info("Transient LLM error (%s), retrying in %.2fs", e, delay)
+                self._count("retries")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+        return self._failed_message(RuntimeError("no attempts made"))
+
+    def generate_stream(self, prompt: str, max_tokens: int = 512) -> Iterator[str]:
+        """
+        Streaming version of generate().
+
+        A stream is only retried if it fails before its first chunk;
+        after that the caller has already seen part of the answer, so
+        the error is yielded as a final chunk instead.
+        """
+        stream = getattr(
+            self.client, "complete_stream", getattr(self.client, "generate_stream", None)
+        )
+        if stream is None:
+            yield self.generate(prompt, max_tokens)
+            return
+
+        tokens = estimate_tokens(prompt, max_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                yield self._rejected_message()
+                return
+
+            waited = 0.0
+            if self.request_bucket:
+                waited += self.request_bucket.acquire(1)
+            if self.token_bucket:
+                waited += self.token_bucket.acquire(tokens)
+            self._count("throttled_seconds", waited)
+            self._count("calls")
+
+            started = False
+            try:
+                for chunk in stream(prompt, max_tokens=max_tokens):
+                    started = True
+                    yield chunk
+            except BaseException as e:
+                if not isinstance(e, Exception):
+                    # Stream closed by the caller (GeneratorExit), interrupted
+                    self.breaker.release()
+                    raise
+                if started or not is_transient(e):
+                    logger.exception("LLM stream failed")
+                    if is_transient(e):
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    yield self._failed_message(e)
+                    return
+
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    logger.warning("LLM stream failed after %d attempts: %s", attempt + 1, e)
+                    yield self._failed_message(e)
+                    return
+
+                delay = self._backoff(attempt)
+                logger.info("Transient LLM error (%s), retrying in %.2fs", e, delay)
+                self._count("retries")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return
+
+        yield self._failed_message(RuntimeError("no attempts made"))
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "throttled_seconds": self.throttled_seconds,
+                "breaker_state": self.breaker.state,
+            }
+
+
+class LLMClientPool:
+    """
+    One shared, rate-limited client per (provider, model).
+    """
+
+    def __init__(self):
+        self._clients: dict[tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str | None = None, model_name: str | None = None):
+        """
+        Shared client for provider/model. Defaults come from config;
+        provider 'fake' gives a FakeLLMClient.
+        """
+        provider = provider or ("fake" if USE_FAKE_LLM else LLM_PROVIDER)
+        model_name = model_name or ("fake" if provider == "fake" else LLM_MODEL)
+        key = (provider, model_name)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = with_cache(ResilientLLMClient(self._create(provider, model_name)))
+                self._clients[key] = client
+            return client
+
+    def _create(self, provider: str, model_name: str):
+        if provider == "fake":
+            logger.info("LLM pool creating FakeLLMClient")
+            return FakeLLMClient()
+        logger.info("LLM pool creating RealLLMClient for %s/%s", provider, model_name)
+        return RealLLMClient(provider=provider, model_name=model_name)
+
+
+_pool: LLMClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> LLMClientPool:
+    """
+    The process-wide client pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = LLMClientPool()
+        return _pool
@@ -1,47 +1,261 @@
 # src/utils/logging_config.py
 
+"""
+Logging setup for the application.
+
+By default records are handed to a QueueHandler and written by a
+QueueListener thread, so formatting and file/console I/O happen off the
+request thread. Log arguments are formatted by the listener as well:
+wrap expensive ones in Lazy / shortened() and they are only computed
+for records that are actually written.
+
+Options (see config): LOG_LEVEL, LOG_FORMAT ('text' or 'json' lines),
+LOG_QUEUE (false = write on the calling thread, as before) and
+LOG_RATE_LIMITS (per-logger records/second; WARNING and above are never
+limited).
+"""
+
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from textwrap import shorten
+
+from config import LOG_FORMAT, LOG_LEVEL, LOG_QUEUE, LOG_RATE_LIMITS
+
+logger = logging.getLogger(__name__)
 
 LOG_DIR = Path("logs")
 LOG_FILE = LOG_DIR / "app.log"
 
-def setup_logging():
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] [%(name)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_listener: QueueListener | None = None
+
+
+class Lazy:
     """
-    Configure logging for the application.
+    Log argument computed only when the message is formatted, and then
+    only once (several handlers may format the same record):
 
-    - Logs go to both console and file
-    - File logs are rotated (so file doesn't grow forever)
+        logger.info("Prompt: %s", Lazy(expensive, prompt))
     """
 
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    __slots__ = ("func", "args", "kwargs", "_value")
 
-    logger = logging.getLogger()  # root logger
-    logger.setLevel(logging.INFO)  # default level
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._value = None
 
-    # Avoid adding duplicate handlers if setup_logging is called multiple times
-    if logger.handlers:
-        return
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = str(self.func(*self.args, **self.kwargs))
+        return self._value
+
+
+def shortened(text: str, width: int = 120) -> Lazy:
+    """
+    Lazy textwrap.shorten(text, width), for logging prompts and outputs.
+    """
+    return Lazy(shorten, text, width, placeholder="...")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, thread, and
+    exc_info when there is an exception.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues the record as is. The standard one merges
+    the message and arguments on the calling thread (so records can be
+    pickled); in-process, that work can be left to the listener.
+
+    Arguments are therefore formatted a little later, on the listener
+    thread: don't log objects that are mutated right after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class MergingQueueListener(QueueListener):
+    """
+    QueueListener that merges message and arguments once per record,
+    before handing it to the handlers (which would each do it again).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger: at most `rates[name]` records per second
+    (bursts up to one second's worth) for loggers named in `rates`, or
+    below them (e.g. 'agents' covers 'agents.planner'). Records at
+    WARNING and above always pass. Dropped records are counted.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped: dict[str, int] = {}
+        self._buckets: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> float | None:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate is None:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [max(rate, 1.0), now]
+            tokens, last = bucket
+            tokens = min(max(rate, 1.0), tokens + (now - last) * rate)
+            if tokens >= 1.0:
+                bucket[0], bucket[1] = tokens - 1.0, now
+                return True
+            bucket[0], bucket[1] = tokens, now
+            self.dropped[record.name] = self.dropped.get(record.name, 0) + 1
+            return False
+
+
+def parse_rate_limits(spec: str) -> dict[str, float]:
+    """
+    "utils.llm_client=5, agents=20" -> {"utils.llm_client": 5.0, "agents": 20.0}.
+    """
+    rates = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, sep, value = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid log rate limit {part.strip()!r} (expected logger=records_per_second)")
+        rates[name.strip()] = float(value)
+    return rates
+
+
+def build_handlers(log_file: Path = LOG_FILE, json_lines: bool = False) -> list[logging.Handler]:
+    """
+    Console handler plus a rotating file handler (so the file doesn't
+    grow forever), both with the text or JSON lines format.
+    """
+    log_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Console handler (prints to terminal)
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
 
     # File handler (writes to logs/app.log)
     file_handler = RotatingFileHandler(
-        LOG_FILE, maxBytes=500_000, backupCount=3, encoding="utf-8"
+        log_file, maxBytes=500_000, backupCount=3, encoding="utf-8"
     )
-    file_handler.setLevel(logging.INFO)
 
-    # Log format
-    formatter = logging.Formatter(
-        fmt="%(asctime)s [%(levelname)s] [%(name)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    formatter = JsonFormatter() if json_lines else logging.Formatter(fmt=TEXT_FORMAT, datefmt=DATE_FORMAT)
+    for handler in (console_handler, file_handler):
+        handler.setFormatter(formatter)
+    return [console_handler, file_handler]
+
+
+def setup_logging(
+    level: str = LOG_LEVEL,
+    log_format: str = LOG_FORMAT,
+    use_queue: bool = LOG_QUEUE,
+    rate_limits: str = LOG_RATE_LIMITS,
+    log_file: Path = LOG_FILE,
+):
+    """
+    Configure logging for the application.
+
+    - Logs go to both console and file
+    - With use_queue, the request thread only enqueues records; a
+      listener thread formats and writes them
+    """
+    global _listener
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+
+    # Avoid adding duplicate handlers if setup_logging is called multiple times
+    if root.handlers:
+        return
+
+    handlers = build_handlers(log_file, json_lines=log_format == "json")
+
+    if use_queue:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = MergingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        handlers = [DeferredQueueHandler(log_queue)]
+
+    # One filter shared by the handlers, so they drop the same records
+    limits = parse_rate_limits(rate_limits)
+    rate_filter = RateLimitFilter(limits) if limits else None
+    for handler in handlers:
+        if rate_filter:
+            handler.addFilter(rate_filter)
+        root.addHandler(handler)
+
+
+def shutdown_logging():
+    """
+    Write out queued records, stop the listener and remove the root
+    handlers (setup_logging() can then be called again).
+    """
+    global _listener
+
+    root = logging.getLogger()
+    rate_filters = {f for h in root.handlers for f in h.filters if isinstance(f, RateLimitFilter)}
+    for rate_filter in rate_filters:
+        if rate_filter.dropped:
+            logger.info("Rate limiting dropped log records: %s", rate_filter.dropped)
 
-    console_handler.setFormatter(formatter)
-    file_handler.setFormatter(formatter)
+    if _listener is not None:
+        _listener.stop()
+        atexit.unregister(shutdown_logging)
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
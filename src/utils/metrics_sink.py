@@ -0,0 +1,250 @@
+# src/utils/metrics_sink.py
+
+"""
+Buffered writers for evaluation metrics.
+
+Rows are collected in memory and written in batches by a background
+thread, either when `batch_size` rows are waiting or every
+`flush_interval` seconds. Anything still buffered is flushed on close(),
+when an unclosed sink is garbage collected, and at interpreter exit
+(one atexit hook closes every live sink).
+
+Backends:
+- CSVMetricsSink: appends to a CSV file, one write() per batch, under an
+  exclusive file lock where the OS supports it (or one file per process)
+- SQLiteMetricsSink: inserts into an indexed SQLite table
+"""
+
+import atexit
+import csv
+import io
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+METRICS_HEADER = ["timestamp", "task_type", "output_length", "score", "notes"]
+
+
+def create_metrics_table(conn: sqlite3.Connection):
+    """
+    The metrics table and its indexes, if they don't exist yet. Shared by
+    SQLiteMetricsSink and the metrics query layer (tools.metrics_query).
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            task_type TEXT NOT NULL,
+            output_length INTEGER NOT NULL,
+            score REAL NOT NULL,
+            notes TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics (timestamp)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_metrics_task_type ON metrics (task_type, timestamp)"
+    )
+    conn.commit()
+
+
+# Sinks not closed yet; closed (and flushed) at interpreter exit
+_live_sinks: "weakref.WeakSet[BufferedMetricsSink]" = weakref.WeakSet()
+
+
+def _close_live_sinks():
+    for sink in list(_live_sinks):
+        sink.close()
+
+
+atexit.register(_close_live_sinks)
+
+
+def _flush_loop(sink_ref: weakref.ref, wakeup: threading.Event, interval: float):
+    """
+    Background flusher. The sink is only referenced weakly between
+    flushes, so a sink nobody uses any more can be collected; the
+    thread then ends.
+    """
+    while True:
+        wakeup.wait(interval)
+        wakeup.clear()
+        sink = sink_ref()
+        if sink is None or sink._closed:
+            return
+        sink.flush()
+        del sink
+
+
+class BufferedMetricsSink(ABC):
+    """
+    Base class: buffering, background flushing and shutdown.
+    Subclasses implement _write_rows().
+    """
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer: list[list] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=_flush_loop,
+            args=(weakref.ref(self), self._wakeup, flush_interval),
+            name=f"{type(self).__name__}-flusher",
+            daemon=True,
+        )
+        self._thread.start()
+        _live_sinks.add(self)
+
+    def write(self, row: list):
+        """
+        Queue one metrics row. Never blocks on I/O.
+        """
+        if self._closed:
+            logger.warning("%s is closed; dropping metrics row %s", type(self).__name__, row)
+            return
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Write out everything buffered so far.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return
+            try:
+                self._write_rows(rows)
+            except Exception:
+                logger.exception("Failed to write %d metrics rows", len(rows))
+
+    def close(self):
+        """
+        Stop the background thread and flush what is left.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        _live_sinks.discard(self)
+
+    def __del__(self):
+        # Dropped without close(): write out what is still buffered
+        if not getattr(self, "_closed", True):
+            self._closed = True
+            self._wakeup.set()
+            self.flush()
+
+    @abstractmethod
+    def _write_rows(self, rows: list[list]):
+        """
+        Write one batch of rows (called under the flush lock).
+        """
+
+
+class CSVMetricsSink(BufferedMetricsSink):
+    """
+    Appends metrics rows to a CSV file.
+
+    With per_process=True each process writes its own file
+    (metrics.<pid>.csv), so no locking is needed at all.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/metrics.csv",
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        per_process: bool = False,
+    ):
+        path = Path(path)
+        if per_process:
+            path = path.with_name(f"{path.stem}.{os.getpid()}{path.suffix}")
+        self.path = path
+        self._ensure_file()
+
+        super().__init__(batch_size, flush_interval)
+
+    def _ensure_file(self):
+        """
+        Create the CSV with a header row, unless another writer already did.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with self.path.open("x", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(METRICS_HEADER)
+            logger.info("Created metrics file at %s", self.path)
+        except FileExistsError:
+            pass
+
+    def _write_rows(self, rows: list[list]):
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        data = buf.getvalue()
+
+        with self.path.open("a", newline="", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.write(data)
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class SQLiteMetricsSink(BufferedMetricsSink):
+    """
+    Inserts metrics rows into a SQLite table indexed by timestamp and task_type.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/metrics.db",
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Only used under _flush_lock, from whichever thread is flushing
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        create_metrics_table(self._conn)
+
+        super().__init__(batch_size, flush_interval)
+
+    def _write_rows(self, rows: list[list]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO metrics (timestamp, task_type, output_length, score, notes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
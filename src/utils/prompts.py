@@ -1,13 +1,196 @@
 # src/utils/prompts.py
 
+"""
+Prompt templates for the agents.
+
+Templates are registered once by name. Registration dedents the text and
+compiles it into a %-style format string, so rendering is one C-level
+string substitution rather than an f-string plus textwrap.dedent per
+call. New prompt types only need a register_template() call:
+
+    register_template("followup", '''
+        Write a short follow-up to:
+        \"\"\"{message}\"\"\"
+        ''', trim_field="message")
+    get_template("followup").render(message=text)
+
+Token budgeting: estimate_tokens() is a cheap local estimate (no
+tokenizer), context_limit() the context window of a model, and
+prompt_budget() what is left of it for the prompt once the reply
+(max_tokens) is reserved. render_within() trims the template's
+trim_field (keeping its start and end) so the prompt fits a budget;
+inputs that should be split rather than cut (meeting transcripts) use
+field_budget() to size their chunks instead.
+"""
+
+import logging
+from string import Formatter
 from textwrap import dedent
 
-def build_email_prompt(user_request: str, signature: str) -> str:
+from config import LLM_CONTEXT_TOKENS, LLM_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Context window (tokens) by model name prefix, without any "models/" prefix
+CONTEXT_LIMITS = {
+    "gemini-1.5-pro": 2_097_152,
+    "gemini": 1_048_576,
+    "gpt-4.1": 1_047_576,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-4": 8_192,
+    "gpt-3.5-turbo": 16_385,
+}
+DEFAULT_CONTEXT_LIMIT = 8_192
+
+TRIM_MARKER = "\n[... {omitted} characters omitted ...]\n"
+
+
+def estimate_tokens(text: str) -> int:
     """
-    Build a prompt for writing a business email.
+    Rough token count: ~4 characters per token for ASCII text, ~4 UTF-8
+    bytes per token otherwise (non-Latin scripts take more tokens per
+    character).
+    """
+    if text.isascii():
+        return (len(text) + 3) // 4
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def context_limit(model: str = LLM_MODEL) -> int:
+    """
+    Context window of `model`: LLM_CONTEXT_TOKENS if set, else the
+    longest matching prefix in CONTEXT_LIMITS, else DEFAULT_CONTEXT_LIMIT.
     """
+    if LLM_CONTEXT_TOKENS > 0:
+        return LLM_CONTEXT_TOKENS
+    name = model.rpartition("/")[2].lower()
+    matches = [prefix for prefix in CONTEXT_LIMITS if name.startswith(prefix)]
+    return CONTEXT_LIMITS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_LIMIT
+
+
+def prompt_budget(max_tokens: int = 512, model: str = LLM_MODEL) -> int:
+    """
+    Tokens available for the prompt when `max_tokens` are kept for the reply.
+    """
+    return context_limit(model) - max_tokens
+
 
-    prompt = f"""
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    `text` cut to about max_tokens (estimated): the first two thirds and
+    the last third are kept, joined by a marker saying how much was
+    left out.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    # Characters to keep, scaled by the text's own characters per token
+    keep = max(0, max_tokens * len(text) // estimate_tokens(text) - len(TRIM_MARKER) - 8)
+    while True:
+        head = keep * 2 // 3
+        tail = keep - head
+        trimmed = text[:head] + TRIM_MARKER.format(omitted=len(text) - keep) + (text[-tail:] if tail else "")
+        if estimate_tokens(trimmed) <= max_tokens or keep == 0:
+            return trimmed
+        keep = keep * 9 // 10
+
+
+class PromptTemplate:
+    """
+    A named prompt with {field} placeholders, compiled once.
+
+    `trim_field` is the (user-supplied) field render_within() may cut to
+    make the prompt fit.
+    """
+
+    def __init__(self, name: str, text: str, trim_field: str | None = None):
+        self.name = name
+        self.text = dedent(text).strip()
+
+        parts, fields = [], []
+        for literal, field, spec, conversion in Formatter().parse(self.text):
+            parts.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Prompt {name!r}: unsupported placeholder {{{field}}}")
+            parts.append(f"%({field})s")
+            fields.append(field)
+
+        self.fields = tuple(dict.fromkeys(fields))
+        if trim_field is not None and trim_field not in self.fields:
+            raise ValueError(f"Prompt {name!r} has no field {trim_field!r}")
+        self.trim_field = trim_field
+
+        self._format = "".join(parts)
+        # Tokens of the template itself, without the field values
+        self.fixed_tokens = estimate_tokens(self.render(**{f: "" for f in self.fields}))
+
+    def render(self, **values: str) -> str:
+        try:
+            return self._format % values
+        except KeyError as e:
+            raise ValueError(f"Prompt {self.name!r} needs a value for {e.args[0]!r}") from None
+
+    def field_budget(self, max_prompt_tokens: int, field: str | None = None, **values: str) -> int:
+        """
+        Tokens left for `field` (default: trim_field) in a prompt of at
+        most max_prompt_tokens, given the other fields' values.
+        """
+        field = field or self.trim_field
+        others = sum(estimate_tokens(v) for name, v in values.items() if name != field)
+        return max_prompt_tokens - self.fixed_tokens - others
+
+    def render_within(self, max_prompt_tokens: int, **values: str) -> str:
+        """
+        render(), with trim_field cut down if the prompt would be longer
+        than max_prompt_tokens.
+        """
+        prompt = self.render(**values)
+        if self.trim_field is None or estimate_tokens(prompt) <= max_prompt_tokens:
+            return prompt
+
+        budget = max(0, self.field_budget(max_prompt_tokens, **values))
+        original = values[self.trim_field]
+        values[self.trim_field] = trim_to_tokens(original, budget)
+        logger.warning(
+            "Prompt %r over budget (%d tokens); trimmed %s from %d to about %d tokens",
+            self.name, max_prompt_tokens, self.trim_field, estimate_tokens(original), budget,
+        )
+        return self.render(**values)
+
+
+_TEMPLATES: dict[str, PromptTemplate] = {}
+
+
+def register_template(name: str, text: str, trim_field: str | None = None) -> PromptTemplate:
+    """
+    Compile and register a template (replacing one of the same name).
+    """
+    template = PromptTemplate(name, text, trim_field)
+    _TEMPLATES[name] = template
+    return template
+
+
+def get_template(name: str) -> PromptTemplate:
+    try:
+        return _TEMPLATES[name]
+    except KeyError:
+        raise KeyError(f"Unknown prompt template {name!r} (known: {', '.join(sorted(_TEMPLATES))})") from None
+
+
+def render_prompt(name: str, max_tokens: int = 512, **values: str) -> str:
+    """
+    Render a registered template within the prompt budget of LLM_MODEL,
+    keeping `max_tokens` for the reply.
+    """
+    return get_template(name).render_within(prompt_budget(max_tokens), **values)
+
+
+register_template(
+    "email",
+    """
     You are a professional business email assistant.
 
     Write a clear, polite, and concise email based on the user's request below.
@@ -25,16 +208,13 @@ def build_email_prompt(user_request: str, signature: str) -> str:
     \"\"\"{signature}\"\"\"
 
     Now write only the email.
-    """
-    return dedent(prompt).strip()
-
+    """,
+    trim_field="user_request",
+)
 
-def build_meeting_summary_prompt(transcript: str) -> str:
+register_template(
+    "meeting_summary",
     """
-    Build a prompt for summarizing a meeting.
-    """
-
-    prompt = f"""
     You are an assistant that summarizes business meetings.
 
     Given the meeting transcript below:
@@ -55,5 +235,84 @@ def build_meeting_summary_prompt(transcript: str) -> str:
     1. ...
     2. ...
     3. ...
+    """,
+    trim_field="transcript",
+)
+
+register_template(
+    "meeting_chunk",
+    """
+    You are an assistant that summarizes business meetings.
+
+    Below is one part of a longer meeting transcript.
+    1. Write a brief summary of this part (2-4 sentences).
+    2. List the action items mentioned in this part as numbered bullet points.
+       - Each item should start with a verb (e.g., "Finalize", "Prepare", "Schedule").
+       - Include who is responsible, if mentioned.
+       - If there are none, leave the list empty.
+
+    Transcript part:
+    \"\"\"{transcript_part}\"\"\"
+
+    Format:
+
+    === Meeting Summary ===
+    <summary here>
+
+    === Action Items ===
+    1. ...
+    """,
+    trim_field="transcript_part",
+)
+
+register_template(
+    "meeting_reduce",
     """
-    return dedent(prompt).strip()
+    You are an assistant that summarizes business meetings.
+
+    Below are summaries of consecutive parts of one meeting, in order.
+    Combine them into a single brief summary (3-5 sentences) of the whole
+    meeting. Do not list action items.
+
+    Part summaries:
+    \"\"\"{parts}\"\"\"
+
+    Format:
+
+    === Meeting Summary ===
+    <summary here>
+    """,
+    trim_field="parts",
+)
+
+
+def build_email_prompt(user_request: str, signature: str) -> str:
+    """
+    Build a prompt for writing a business email.
+    """
+    return render_prompt("email", user_request=user_request, signature=signature)
+
+
+def build_meeting_summary_prompt(transcript: str) -> str:
+    """
+    Build a prompt for summarizing a meeting.
+    """
+    return render_prompt("meeting_summary", transcript=transcript)
+
+
+def build_meeting_chunk_prompt(transcript_part: str) -> str:
+    """
+    Build a prompt for summarizing one part of a long meeting.
+    """
+    return render_prompt("meeting_chunk", transcript_part=transcript_part)
+
+
+def build_meeting_reduce_prompt(partial_summaries: list[str]) -> str:
+    """
+    Build a prompt for combining summaries of consecutive meeting parts.
+    """
+
+    parts = "\n\n".join(
+        f"Part {i}:\n{summary}" for i, summary in enumerate(partial_summaries, 1)
+    )
+    return render_prompt("meeting_reduce", parts=parts)
@@ -0,0 +1,370 @@
+# src/utils/tracing.py
+
+"""
+Lightweight request tracing and per-stage latency histograms.
+
+Code marks the stages of a request with spans:
+
+    with span("email.prompt"):
+        ...
+
+or decorates a function with @traced("memory.get"). Spans nest through
+a context variable, so spans opened inside a request belong to it (also
+across asyncio.to_thread). Each finished span is kept for export and
+its duration goes into the histogram for its name.
+
+Tracing is off unless TRACING=true (or enable() is called). When it is
+off, span() returns a shared no-op object and @traced calls straight
+through, so a span costs a few hundred nanoseconds.
+
+Finished traces can be written in Chrome trace format (open in
+chrome://tracing or https://ui.perfetto.dev) or as OTLP-JSON.
+"""
+
+import atexit
+import bisect
+import functools
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+
+from config import TRACE_FILE, TRACE_FORMAT, TRACE_MAX_SPANS, TRACING
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "ai-business-agent"
+
+TRACE_FORMATS = ("chrome", "otlp")
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+    1_000, 2_500, 5_000, 10_000, 30_000, 60_000, float("inf"),
+)
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+# Span ids are a random per-process base plus a counter (cheaper than
+# random bits per span); they are only formatted as hex on export.
+_SPAN_ID_BASE = random.getrandbits(64) & ~0xFFFFFFFF
+_span_counter = itertools.count(1)
+
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets (BUCKETS_MS). Percentiles are
+    the upper bound of the bucket they fall in, capped at the maximum.
+    """
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+
+class Span:
+    """
+    One timed stage. Use as a context manager; set() adds attributes.
+    """
+
+    __slots__ = (
+        "tracer", "name", "attrs", "trace_id", "span_id", "parent_id",
+        "thread_id", "start_ns", "end_ns", "_perf_start", "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, key: str, value):
+        self.attrs[key] = value
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.trace_id = parent.trace_id if parent else random.getrandbits(128)
+        self.parent_id = parent.span_id if parent else None
+        self.span_id = _SPAN_ID_BASE | (next(_span_counter) & 0xFFFFFFFF)
+        self.thread_id = threading.get_ident()
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        self._perf_start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._perf_start)
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer.record(self)
+        return False
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """
+    Returned by span() while tracing is off.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, key: str, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Collects finished spans (the most recent `max_spans`) and keeps a
+    latency histogram per span name.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = TRACE_MAX_SPANS):
+        self.enabled = enabled
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attrs)
+
+    def record(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = Histogram()
+            histogram.add(span.duration_ms)
+
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._histograms.clear()
+
+    def stats(self) -> dict[str, dict]:
+        """
+        {span name: count, mean, p50/p95/p99 and max in ms}.
+        """
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self._histograms.items())}
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        if not stats:
+            return "No spans recorded."
+
+        width = max(len(name) for name in stats)
+        lines = [f"{'stage':<{width}}  {'count':>7}  {'mean':>9}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'max':>9}"]
+        for name, s in stats.items():
+            lines.append(
+                f"{name:<{width}}  {s['count']:>7}  {s['mean_ms']:>7.2f}ms  {s['p50_ms']:>7.2f}ms"
+                f"  {s['p95_ms']:>7.2f}ms  {s['p99_ms']:>7.2f}ms  {s['max_ms']:>7.2f}ms"
+            )
+        return "\n".join(lines)
+
+    # ---------- export ----------
+
+    def to_chrome(self) -> dict:
+        """
+        Chrome trace event format ("X" complete events, microseconds).
+        """
+        pid = os.getpid()
+        events = []
+        for s in self.spans():
+            args = {key: _jsonable(value) for key, value in s.attrs.items()}
+            args["trace_id"] = f"{s.trace_id:032x}"
+            events.append({
+                "name": s.name,
+                "cat": s.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": s.start_ns / 1000,
+                "dur": (s.end_ns - s.start_ns) / 1000,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otlp(self) -> dict:
+        """
+        OTLP-JSON (the JSON encoding of an ExportTraceServiceRequest).
+        """
+        spans = []
+        for s in self.spans():
+            record = {
+                "traceId": f"{s.trace_id:032x}",
+                "spanId": f"{s.span_id:016x}",
+                "name": s.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [_otlp_attribute(k, v) for k, v in s.attrs.items()],
+            }
+            if s.parent_id:
+                record["parentSpanId"] = f"{s.parent_id:016x}"
+            if "error" in s.attrs:
+                record["status"] = {"code": 2, "message": str(s.attrs["error"])}
+            spans.append(record)
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }]
+        }
+
+    def export(self, path: str = TRACE_FILE, fmt: str = TRACE_FORMAT) -> int:
+        """
+        Write the collected spans to `path`. Returns the number of spans.
+        """
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format {fmt!r} (expected one of {', '.join(TRACE_FORMATS)})")
+
+        data = self.to_chrome() if fmt == "chrome" else self.to_otlp()
+        count = len(data["traceEvents"]) if fmt == "chrome" else len(
+            data["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        )
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, path)
+
+        logger.info("Wrote %d spans to %s (%s)", count, path, fmt)
+        return count
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+_tracer = Tracer(enabled=TRACING)
+
+
+def get_tracer() -> Tracer:
+    """
+    The process-wide tracer.
+    """
+    return _tracer
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing one stage. A no-op while tracing is off.
+    """
+    if not _tracer.enabled:
+        return _NOOP_SPAN
+    return Span(_tracer, name, attrs)
+
+
+def traced(name: str):
+    """
+    Decorator: run the function inside span(name).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(_tracer, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable():
+    _tracer.enabled = True
+
+
+def disable():
+    _tracer.enabled = False
+
+
+def setup_tracing():
+    """
+    If tracing is on, write the trace and log the per-stage latencies
+    when the process exits.
+    """
+    if not _tracer.enabled:
+        return
+
+    def _on_exit():
+        if not _tracer.spans():
+            return
+        logger.info("Stage latencies:\n%s", _tracer.format_stats())
+        try:
+            _tracer.export()
+        except OSError:
+            logger.exception("Could not write trace file")
+
+    atexit.register(_on_exit)
+    logger.info("Tracing enabled; trace will be written to %s (%s)", TRACE_FILE, TRACE_FORMAT)
@@ -0,0 +1,183 @@
+# src/utils/transcript.py
+
+"""
+Helpers for summarizing long meeting transcripts in pieces.
+
+split_transcript() cuts a transcript into chunks that fit a token
+budget, breaking only between speaker turns or paragraphs (and inside a
+turn only when the turn alone is too long). Chunk boundaries are chosen
+from the content itself, so editing one part of a transcript leaves the
+other chunks byte-for-byte the same and their cached summaries reusable.
+
+parse_summary() and merge_action_items() take LLM summaries of the
+chunks apart and combine their action items without duplicates.
+"""
+
+import hashlib
+import re
+from typing import Iterable
+
+from utils.prompts import estimate_tokens
+
+# "Alice:", "Bob Smith:", "[00:12:03] SPEAKER 2:" at the start of a line
+_SPEAKER_RE = re.compile(r"^[ \t]*(?:\[[^\]\n]*\][ \t]*)?[A-Z][\w.' -]{0,40}:", re.M)
+_PARAGRAPH_RE = re.compile(r"\n[ \t]*\n")
+_SENTENCE_RE = re.compile(r"[^.!?\n]*(?:[.!?]+|\n|$)[ \t]*\n?")
+_WORD_RE = re.compile(r"\S+\s*|\s+")
+
+_SECTION_RE = re.compile(r"^\s*===\s*(meeting summary|action items)\s*===\s*$", re.I | re.M)
+_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+(.+?)\s*$")
+
+
+def _turns(text: str) -> list[str]:
+    """
+    Split at speaker lines and blank lines; the pieces join back to `text`.
+    """
+    starts = {0}
+    starts.update(m.start() for m in _SPEAKER_RE.finditer(text))
+    starts.update(m.end() for m in _PARAGRAPH_RE.finditer(text))
+    starts = sorted(s for s in starts if s < len(text))
+    return [text[a:b] for a, b in zip(starts, starts[1:] + [len(text)])]
+
+
+def _split_long(text: str, max_tokens: int) -> list[str]:
+    """
+    Break a single over-long turn into pieces of at most max_tokens,
+    by sentence, then by word, then (for absurdly long words) by length.
+    """
+    pieces = []
+    for sentence in (s for s in _SENTENCE_RE.findall(text) if s):
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        for word in _WORD_RE.findall(sentence):
+            # Up to 4 UTF-8 bytes per character outside ASCII
+            step = max_tokens * 4 if word.isascii() else max_tokens
+            pieces.extend(word[i:i + step] for i in range(0, len(word), step))
+
+    return ["".join(group) for group in pack_texts(pieces, max_tokens)]
+
+
+def pack_texts(texts: list[str], max_tokens: int) -> list[list[str]]:
+    """
+    Group consecutive texts greedily so each group fits max_tokens
+    (a single text that is already too big gets a group of its own).
+    """
+    groups: list[list[str]] = []
+    current: list[str] = []
+    size = 0
+    for text in texts:
+        n = estimate_tokens(text)
+        if current and size + n > max_tokens:
+            groups.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += n
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _is_anchor(unit: str) -> bool:
+    # Roughly one unit in four ends a chunk once the chunk is big enough.
+    digest = hashlib.blake2b(unit.strip().encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % 4 == 0
+
+
+def split_transcript(text: str, max_tokens: int, min_tokens: int | None = None) -> list[str]:
+    """
+    Split a transcript into chunks of at most max_tokens (estimated).
+
+    A chunk ends early, once it has at least min_tokens (default half of
+    max_tokens), after a turn whose content hash marks it as an anchor.
+    Because anchors depend only on the turn's own text, boundaries after
+    an edit fall back into the same places. "".join(chunks) == text.
+    """
+    if min_tokens is None:
+        min_tokens = max_tokens // 2
+
+    units: list[str] = []
+    for turn in _turns(text):
+        if estimate_tokens(turn) > max_tokens:
+            units.extend(_split_long(turn, max_tokens))
+        else:
+            units.append(turn)
+
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for unit in units:
+        n = estimate_tokens(unit)
+        if current and size + n > max_tokens:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += n
+        if size >= min_tokens and _is_anchor(unit):
+            chunks.append("".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append("".join(current))
+
+    return chunks
+
+
+def parse_summary(text: str) -> tuple[str, list[str]]:
+    """
+    Split an LLM meeting summary into (summary text, action items).
+
+    Understands the "=== Meeting Summary ===" / "=== Action Items ==="
+    layout from build_meeting_summary_prompt(). Text without those
+    headers is treated as all summary.
+    """
+    sections = {"meeting summary": [], "action items": []}
+    current = "meeting summary"
+    position = 0
+
+    for match in _SECTION_RE.finditer(text):
+        sections[current].append(text[position:match.start()])
+        current = match.group(1).lower()
+        position = match.end()
+    sections[current].append(text[position:])
+
+    summary = "\n".join(part.strip() for part in sections["meeting summary"] if part.strip())
+    items = []
+    for line in "\n".join(sections["action items"]).splitlines():
+        match = _ITEM_RE.match(line)
+        if match:
+            items.append(match.group(1))
+    return summary, items
+
+
+def merge_action_items(items: Iterable[str], similarity: float = 0.8) -> list[str]:
+    """
+    Action items in first-seen order, dropping repeats. Two items are
+    the same if their word sets overlap by at least `similarity`
+    (Jaccard), so "Finalize the template by Friday" and "finalize
+    template by Friday." count once.
+    """
+    merged: list[str] = []
+    seen: list[set[str]] = []
+
+    for item in items:
+        words = set(re.findall(r"[^\W_]+", item.lower())) - {"the", "a", "an"}
+        if not words:
+            continue
+        if any(len(words & other) / len(words | other) >= similarity for other in seen):
+            continue
+        merged.append(item.strip())
+        seen.append(words)
+
+    return merged
+
+
+def format_meeting_summary(summary: str, action_items: list[str]) -> str:
+    """
+    Render a summary in the same layout the single-call prompt asks for.
+    """
+    lines = ["=== Meeting Summary ===", summary.strip(), "", "=== Action Items ==="]
+    if action_items:
+        lines += [f"{i}. {item}" for i, item in enumerate(action_items, 1)]
+    else:
+        lines.append("No action items found.")
+    return "\n".join(lines)
@@ -0,0 +1,113 @@
+# tests/test_batch.py
+
+import json
+
+from agents.evaluator_agent import EvaluatorAgent
+from agents.planner import PlannerAgent
+from batch import BatchRunner
+
+
+def make_planner(tmp_path) -> PlannerAgent:
+    planner = PlannerAgent()
+    planner.evaluator_agent = EvaluatorAgent(str(tmp_path / "metrics.csv"))
+    return planner
+
+
+def write_requests(path, texts):
+    with path.open("w", encoding="utf-8") as f:
+        for i, text in enumerate(texts):
+            f.write(json.dumps({"request_id": f"r{i}", "body": text}) + "\n")
+
+
+def read_results(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_batch_writes_results_in_input_order(tmp_path):
+    """
+    Ordered mode keeps input order even with several workers, and each
+    request is routed once.
+    """
+
+    texts = ["write an email", "sales report", "summarize the meeting", "hello"] * 5
+    input_path = tmp_path / "requests.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    write_requests(input_path, texts)
+
+    planner = make_planner(tmp_path)
+    routed = []
+    detect_intent = planner.detect_intent
+    planner.detect_intent = lambda text: routed.append(text) or detect_intent(text)
+
+    runner = BatchRunner(planner, workers=4, queue_size=2)
+    summary = runner.run(str(input_path), str(output_path))
+
+    results = read_results(output_path)
+    assert len(routed) == 20
+    assert [r["line"] for r in results] == list(range(20))
+    assert [r["intent"] for r in results[:4]] == ["EMAIL", "REPORT", "MEETING", "GENERAL"]
+    assert summary["completed"] == 20
+    assert summary["errors"] == 0
+
+
+def test_batch_resumes_from_existing_output(tmp_path):
+    """
+    With resume, lines already in the output are skipped and a torn
+    last line from a crash is discarded.
+    """
+
+    input_path = tmp_path / "requests.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    write_requests(input_path, ["write an email"] * 6)
+
+    runner = BatchRunner(make_planner(tmp_path), workers=2)
+    runner.run(str(input_path), str(output_path))
+
+    lines = output_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    output_path.write_text("".join(lines[:3]) + lines[3][:10], encoding="utf-8")
+
+    summary = BatchRunner(make_planner(tmp_path), workers=2).run(
+        str(input_path), str(output_path), resume=True
+    )
+
+    results = read_results(output_path)
+    assert summary["skipped"] == 3
+    assert summary["completed"] == 3
+    assert [r["line"] for r in results] == list(range(6))
+
+
+def test_batch_without_resume_replaces_output(tmp_path):
+    """
+    A second run without resume starts the output file over, and the
+    runner's counts cover only that run.
+    """
+
+    input_path = tmp_path / "requests.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    write_requests(input_path, ["write an email", "hello"])
+
+    runner = BatchRunner(make_planner(tmp_path), workers=2)
+    runner.run(str(input_path), str(output_path))
+    summary = runner.run(str(input_path), str(output_path))
+
+    assert summary["completed"] == len(read_results(output_path))
+    assert summary["completed"] == 2
+    assert sum(s["count"] for s in summary["per_intent"].values()) == 2
+
+
+def test_batch_reports_unreadable_input(tmp_path):
+    """
+    Invalid UTF-8 part-way through stops the reader; whatever was read
+    is processed and the summary says the input was not fully read.
+    """
+
+    input_path = tmp_path / "requests.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    write_requests(input_path, ["write an email", "hello"])
+    with input_path.open("ab") as f:
+        f.write(b'{"body": "\xff\xfe"}\n' * 2000)
+
+    summary = BatchRunner(make_planner(tmp_path), workers=2).run(str(input_path), str(output_path))
+
+    assert summary["input_error"].startswith("UnicodeDecodeError")
+    assert summary["completed"] == len(read_results(output_path))
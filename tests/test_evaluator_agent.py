@@ -0,0 +1,208 @@
+# tests/test_evaluator_agent.py
+
+import csv
+import gc
+import sqlite3
+import threading
+
+from agents.background_evaluator import BackgroundEvaluator, EvalSampler
+from agents.evaluation_rules import Contains, LinePrefix
+from agents.evaluator_agent import EvaluatorAgent
+from utils import metrics_sink
+from utils.metrics_sink import CSVMetricsSink, SQLiteMetricsSink
+
+
+def test_metrics_rows_are_buffered_until_flush(tmp_path):
+    """
+    Rows are written in a batch, with the same columns as before.
+    """
+
+    path = tmp_path / "metrics.csv"
+    sink = CSVMetricsSink(str(path), batch_size=1000, flush_interval=60)
+    agent = EvaluatorAgent(str(path), sink=sink)
+
+    agent.evaluate("EMAIL", "write an email", "Subject: Hi\nDear Bob,\nThanks")
+    agent.evaluate("GENERAL", "hello", "short")
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+
+    agent.flush()
+
+    rows = list(csv.reader(path.open(encoding="utf-8")))
+    assert rows[0] == ["timestamp", "task_type", "output_length", "score", "notes"]
+    assert [r[1] for r in rows[1:]] == ["EMAIL", "GENERAL"]
+    agent.close()
+
+
+def test_full_batch_is_flushed_in_background(tmp_path):
+    """
+    Reaching batch_size wakes the writer thread without an explicit flush.
+    """
+
+    path = tmp_path / "metrics.csv"
+    sink = CSVMetricsSink(str(path), batch_size=3, flush_interval=60)
+
+    for i in range(3):
+        sink.write(["t", "EMAIL", i, 0.5, "OK"])
+
+    for _ in range(100):
+        if len(path.read_text(encoding="utf-8").splitlines()) == 4:
+            break
+        sink._thread.join(0.01)
+
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+    sink.close()
+
+
+def test_dropped_sink_flushes_and_stops_its_thread(tmp_path, caplog):
+    """
+    A sink that is never closed is flushed when it is collected, and its
+    flusher thread ends; writes after close() are logged, not lost silently.
+    """
+
+    path = tmp_path / "metrics.csv"
+    sink = CSVMetricsSink(str(path), batch_size=1000, flush_interval=0.01)
+    sink.write(["t", "EMAIL", 1, 0.5, "OK"])
+    thread = sink._thread
+    assert sink in metrics_sink._live_sinks
+
+    del sink
+    gc.collect()
+    thread.join(1)
+
+    assert not thread.is_alive()
+    assert all(s.path != path for s in metrics_sink._live_sinks)
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    closed = CSVMetricsSink(str(path))
+    closed.close()
+    closed.write(["t", "EMAIL", 2, 0.5, "OK"])
+    assert "dropping metrics row" in caplog.text
+
+
+def test_sqlite_metrics_backend(tmp_path):
+    """
+    The SQLite sink stores rows in an indexed 'metrics' table.
+    """
+
+    db_path = tmp_path / "metrics.db"
+    agent = EvaluatorAgent(sink=SQLiteMetricsSink(str(db_path)))
+    agent.evaluate("REPORT", "sales report", "Total revenue: 1")
+    agent.close()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT task_type FROM metrics").fetchall() == [("REPORT",)]
+    conn.close()
+
+
+def test_background_evaluator_drops_when_queue_is_full(tmp_path):
+    """
+    submit() never blocks: with the worker busy and the queue full,
+    further evaluations are dropped and counted.
+    """
+
+    release = threading.Event()
+
+    class SlowEvaluator(EvaluatorAgent):
+        def evaluate(self, task_type, user_input, output_text):
+            release.wait()
+            return super().evaluate(task_type, user_input, output_text)
+
+    background = BackgroundEvaluator(SlowEvaluator(str(tmp_path / "metrics.csv")), max_queue=2)
+
+    futures = [background.submit("GENERAL", "hello", "some text") for _ in range(6)]
+    # One is being evaluated, two are waiting, the rest were dropped
+    assert futures.count(None) >= 3
+
+    release.set()
+    background.close()
+    stats = background.stats()
+    assert stats["evaluated"] == stats["submitted"] == 6 - stats["dropped"]
+    assert all("=== Evaluation ===" in f.result() for f in futures if f is not None)
+
+
+def test_batch_scores_match_single_evaluation(tmp_path):
+    """
+    evaluate_batch() gives the same scores and notes as evaluate() on
+    each output, for mixed task types.
+    """
+
+    outputs = [
+        ("EMAIL", "Subject: Update\nDear Ana,\nThe project is on track for Friday.\nBest regards,\nBob"),
+        ("EMAIL", "hi"),
+        ("REPORT", "=== Sales Report ===\nTotal revenue: 10\nTotal expenses: 4\nTotal profit: 6\nRows: 2"),
+        ("REPORT", "Total revenue: 1"),
+        ("MEETING", "Meeting Summary:\nWe met.\n\nAction Items:\n  1. Ship it\n2. Test it"),
+        ("MEETING", "nothing numbered here\n- a bullet"),
+        ("GENERAL", "A reasonably long general answer to a question."),
+        ("UNKNOWN", ""),
+    ]
+    agent = EvaluatorAgent(str(tmp_path / "metrics.csv"))
+
+    batch = agent.evaluate_batch([t for t, _ in outputs], [o for _, o in outputs])
+
+    for (task_type, output), row in zip(outputs, batch.itertuples(index=False)):
+        score, notes = agent._rules_for(task_type).score(output)
+        assert row.task_type == task_type
+        assert row.output_length == len(output)
+        assert row.score == score
+        assert row.notes == ("; ".join(notes) if notes else "OK")
+        assert f"Score: {score:.2f}" in agent.evaluate(task_type, "input", output)
+
+    assert list(batch["score"].round(2)) == [0.9, 0.5, 0.8, 0.6, 0.8, 0.5, 0.6, 0.5]
+    agent.close()
+
+
+def test_rules_split_lines_like_splitlines(tmp_path):
+    """
+    Line rules see the same lines as str.splitlines(), so \\r and
+    \\u2028 line breaks count, in single and batch scoring alike.
+    """
+
+    outputs = [
+        ("MEETING", "Meeting Summary\r\rAction Items\r1. Ana drafts\r2. Bob books"),
+        ("REPORT", "\u2028".join(["Total revenue: 10", "Total profit: 6", "a", "b", "c"])),
+        ("REPORT", "\r\n".join(["Total revenue: 10", "Total profit: 6", "a", " \x1f ", "c"])),
+    ]
+    agent = EvaluatorAgent(str(tmp_path / "metrics.csv"))
+
+    for task_type, output in outputs[:2]:
+        score, notes = agent._rules_for(task_type).score(output)
+        assert round(score, 2) == 0.8 and notes == []
+    assert agent._rules_for("REPORT").score(outputs[2][1])[1] == ["Report seems too short (few lines)"]
+
+    batch = agent.evaluate_batch([t for t, _ in outputs], [o for _, o in outputs])
+    assert list(batch["score"].round(2)) == [0.8, 0.8, 0.7]
+    agent.close()
+
+
+def test_registered_task_type_rules(tmp_path):
+    """
+    A new task type gets its own rules without touching the evaluator.
+    """
+
+    agent = EvaluatorAgent(str(tmp_path / "metrics.csv"))
+    agent.register_task_type("INVOICE", [
+        Contains("invoice #", 0.2, "Missing invoice number"),
+        LinePrefix(("- ",), 0.2, "Needs at least two line items", count=2),
+    ])
+
+    summary = agent.evaluate("invoice", "bill acme", "Invoice #42\n- Design: 100\n- Build: 200")
+    assert "Score: 0.90" in summary
+
+    batch = agent.evaluate_batch("INVOICE", ["Invoice #1\n- one item", "no number"])
+    assert list(batch["score"].round(2)) == [0.7, 0.5]
+    assert batch["notes"][1] == "Missing invoice number; Needs at least two line items"
+    agent.close()
+
+
+def test_sampler_keeps_exact_spacing():
+    """
+    Rate 0.1 evaluates exactly every 10th output (no float drift), and
+    intents match whatever their case.
+    """
+
+    sampler = EvalSampler({"email": 0.1})
+    picked = [i for i in range(100) if sampler.should_evaluate("Email" if i % 2 else "EMAIL")]
+
+    assert picked == list(range(0, 100, 10))
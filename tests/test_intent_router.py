@@ -0,0 +1,44 @@
+# tests/test_intent_router.py
+
+from agents.intent_router import IntentRouter, build_default_router
+
+
+def test_default_routes():
+    """
+    Basic phrases still route where they used to.
+    """
+
+    router = build_default_router()
+
+    assert router.route("write an email to a client about project delay") == "EMAIL"
+    assert router.route("generate a sales report") == "REPORT"
+    assert router.route("summarize the meeting") == "MEETING"
+    assert router.route("set email signature to Thanks") == "PREFERENCE"
+    assert router.route("please show preferences") == "SHOW_PREFS"
+    assert router.route("hello there") == "GENERAL"
+
+
+def test_keywords_match_whole_words_only():
+    """
+    'mail' must not fire inside other words, and 'summarize' must not
+    beat a more specific report request.
+    """
+
+    router = build_default_router()
+
+    assert router.route("check the gmailbox setup") == "GENERAL"
+    assert router.route("summarize the sales report") == "REPORT"
+    assert router.route("read sales_data.csv") == "REPORT"
+
+
+def test_custom_intent_and_phrases():
+    """
+    New intents can be registered, including multi-word phrases.
+    """
+
+    router = IntentRouter()
+    router.register("INVOICE", ["invoice", "purchase order"], weight=2.0)
+    router.register("REPORT", ["report", "order"])
+
+    assert router.route("create a purchase order report") == "INVOICE"
+    assert router.route("order report") == "REPORT"
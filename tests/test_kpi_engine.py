@@ -0,0 +1,111 @@
+# tests/test_kpi_engine.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.report_agent import DEFAULT_KPIS, ReportAgent
+from tools.kpi_engine import KPI, KPIEngine, top_n
+
+
+def make_sales(rows: int = 5000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-01-01", periods=90).strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "date": rng.choice(dates, rows),
+        "client": rng.choice([f"Client {i}" for i in range(40)], rows),
+        "revenue": rng.integers(100, 5000, rows),
+        "expenses": rng.integers(50, 3000, rows),
+    })
+
+
+def test_kpis_match_pandas():
+    """
+    Every KPI kind must agree with the equivalent pandas expression,
+    and a small block size must not change the results.
+    """
+
+    df = make_sales()
+    kpis = [
+        KPI("total", "total", "revenue"),
+        KPI("by_client", "sum", "revenue", by="client"),
+        KPI("count", "count", by="client"),
+        KPI("mean", "mean", "expenses", by="client"),
+        KPI("margin", "margin", "revenue"),
+        KPI("margin_by_client", "margin", "revenue", by="client"),
+        KPI("growth", "growth", "revenue", by="date"),
+        KPI("rolling", "rolling", "revenue", by="date", window=7),
+        KPI("monthly", "sum", "revenue", by="date", period="M"),
+        KPI("top", "top", "revenue", by="client", n=5),
+    ]
+    results = KPIEngine(kpis, block_size=777).compute(df)
+
+    by_client = df.groupby("client")[["revenue", "expenses"]].sum()
+    by_date = df.groupby("date")["revenue"].sum()
+    monthly = df.groupby(pd.to_datetime(df["date"]).dt.to_period("M"))["revenue"].sum()
+
+    assert results["total"] == df["revenue"].sum()
+    assert results["by_client"].tolist() == by_client["revenue"].tolist()
+    assert results["count"].tolist() == df["client"].value_counts().sort_index().tolist()
+    np.testing.assert_allclose(results["mean"], df.groupby("client")["expenses"].mean())
+    assert results["margin"] == pytest.approx(
+        (df["revenue"].sum() - df["expenses"].sum()) / df["revenue"].sum()
+    )
+    np.testing.assert_allclose(
+        results["margin_by_client"],
+        (by_client["revenue"] - by_client["expenses"]) / by_client["revenue"],
+    )
+    np.testing.assert_allclose(results["growth"], by_date.pct_change())
+    np.testing.assert_allclose(results["rolling"], by_date.rolling(7).mean())
+    assert results["monthly"].tolist() == monthly.tolist()
+    assert results["top"].tolist() == by_client["revenue"].nlargest(5).tolist()
+
+
+def test_top_n_is_stable_for_ties():
+    """
+    Ties keep their original order and NaN goes last.
+    """
+
+    values = np.array([5, 7, 7, np.nan, 1, 7, 3])
+    assert top_n(values, 3).tolist() == [1, 2, 5]
+    assert top_n(values, 10).tolist() == [1, 2, 5, 0, 6, 4, 3]
+
+
+def test_missing_group_keys_are_skipped():
+    """
+    Rows without a group key are left out of the grouping, like groupby.
+    """
+
+    df = pd.DataFrame({"client": ["a", None, "b", "a"], "revenue": [1, 2, 3, 4]})
+    result = KPIEngine([KPI("s", "sum", "revenue", by="client")]).compute(df)["s"]
+    assert result.to_dict() == {"a": 5, "b": 3}
+
+
+def test_report_lists_kpis():
+    """
+    With KPIs configured, the report keeps its basic section and adds them.
+    """
+
+    plain = ReportAgent().generate_report("examples/sales_data.csv")
+    result = ReportAgent(kpis=DEFAULT_KPIS).generate_report("examples/sales_data.csv")
+
+    assert result.startswith(plain)
+    assert "=== KPIs ===" in result
+    assert "top_clients:" in result
+
+
+def test_categorical_groups_use_codes():
+    """
+    Unsorted and unused categories give the same result as plain strings.
+    """
+
+    df = make_sales(rows=500)
+    categories = sorted(set(df["client"]), reverse=True) + ["Client unused"]
+    as_category = df.assign(client=pd.Categorical(df["client"], categories=categories))
+
+    kpi = [KPI("s", "sum", "revenue", by="client")]
+    expected = KPIEngine(kpi).compute(df)["s"]
+    result = KPIEngine(kpi).compute(as_category)["s"]
+
+    assert result.index.tolist() == expected.index.tolist()
+    assert result.tolist() == expected.tolist()
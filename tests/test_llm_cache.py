@@ -0,0 +1,114 @@
+# tests/test_llm_cache.py
+
+import asyncio
+
+from utils.llm_cache import CachedLLMClient, InMemoryCacheBackend, SQLiteCacheBackend
+
+
+class CountingClient:
+    """
+    Minimal LLM client that counts how often it is really called.
+    """
+
+    model_name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt: str, max_tokens: int = 512) -> str:
+        self.calls += 1
+        return f"answer to: {prompt}"
+
+    async def agenerate(self, prompt: str, max_tokens: int = 512) -> str:
+        return self.generate(prompt, max_tokens)
+
+
+def test_repeated_prompt_is_served_from_cache():
+    """
+    The second identical call must not reach the wrapped client.
+    """
+
+    inner = CountingClient()
+    client = CachedLLMClient(inner, InMemoryCacheBackend())
+
+    first = client.generate("summarize", max_tokens=100)
+    second = asyncio.run(client.agenerate("summarize", max_tokens=100))
+    client.generate("summarize", max_tokens=200)
+
+    assert first == second
+    assert inner.calls == 2
+    assert client.stats()["hits"] == 1
+    assert client.stats()["misses"] == 2
+
+
+def test_sqlite_backend_expires_and_evicts(tmp_path):
+    """
+    Entries older than the TTL are misses, and only max_entries are kept.
+    """
+
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), ttl=60, max_entries=2)
+    backend.put("a", "A", 1.0)
+    backend.put("b", "B", 1.0)
+    backend.put("c", "C", 1.0)
+
+    assert backend.get("a") is None
+    assert backend.get("c") == ("C", 1.0)
+
+    backend._conn.execute("UPDATE llm_cache SET created_at = created_at - 120")
+
+    assert backend.get("b") is None
+
+
+def test_sqlite_backend_evicts_least_recently_used(tmp_path):
+    """
+    Hits are batched, not written one by one, but eviction still sees
+    them: the entry read most recently survives.
+    """
+
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), ttl=0, max_entries=2)
+    backend.put("a", "A", 1.0)
+    backend.put("b", "B", 1.0)
+
+    assert backend.get("a") == ("A", 1.0)
+    assert backend._touched
+
+    backend.put("c", "C", 1.0)
+    assert backend.get("b") is None
+    assert backend.get("a") == ("A", 1.0)
+    assert backend._rows == 2
+
+
+def test_error_responses_are_not_cached():
+    """
+    RealLLMClient error strings must be retried, not replayed.
+    """
+
+    class FailingClient(CountingClient):
+        def generate(self, prompt: str, max_tokens: int = 512) -> str:
+            self.calls += 1
+            return "[RealLLMClient] Error while calling LLM: timeout"
+
+    inner = FailingClient()
+    client = CachedLLMClient(inner, InMemoryCacheBackend())
+    client.generate("hello")
+    client.generate("hello")
+
+    assert inner.calls == 2
+
+
+def test_streamed_response_is_cached():
+    """
+    A completed stream is stored, so the same prompt is then a hit
+    (streamed or not).
+    """
+
+    from utils.llm_client import FakeLLMClient
+
+    inner = FakeLLMClient()
+    client = CachedLLMClient(inner, InMemoryCacheBackend())
+
+    streamed = "".join(client.generate_stream("hello"))
+    assert streamed == inner.generate("hello")
+    assert "".join(client.generate_stream("hello")) == streamed
+    assert client.generate("hello") == streamed
+    assert client.stats()["hits"] == 2
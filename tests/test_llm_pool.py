@@ -0,0 +1,180 @@
+# tests/test_llm_pool.py
+
+import asyncio
+import time
+
+import pytest
+
+from utils.llm_client import FakeLLMClient, TransientLLMError
+from utils.llm_pool import (
+    CircuitBreaker,
+    LLMClientPool,
+    ResilientLLMClient,
+    TokenBucket,
+)
+
+
+class ScriptedClient:
+    """
+    Fails with the given errors first, then answers normally.
+    """
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate(self, prompt: str, max_tokens: int = 512) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_transient_errors_are_retried():
+    """
+    Transient failures are retried until the call succeeds.
+    """
+
+    inner = ScriptedClient([TransientLLMError("429"), TimeoutError("slow")])
+    client = ResilientLLMClient(inner, max_retries=3, base_delay=0.001)
+
+    assert client.generate("hi") == "ok"
+    assert inner.calls == 3
+    assert client.stats()["retries"] == 2
+
+
+def test_non_transient_errors_are_not_retried():
+    """
+    A bad request fails right away and comes back as an error message.
+    """
+
+    inner = ScriptedClient([ValueError("bad prompt")])
+    client = ResilientLLMClient(inner, max_retries=3, base_delay=0.001)
+
+    assert client.generate("hi").startswith("[LLMPool] Error while calling LLM")
+    assert inner.calls == 1
+
+
+def test_circuit_breaker_short_circuits_after_failures():
+    """
+    Once the breaker opens, calls fail fast without reaching the client.
+    """
+
+    inner = FakeLLMClient(failure_rate=1.0)
+    client = ResilientLLMClient(
+        inner,
+        max_retries=0,
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+    )
+
+    client.generate("a")
+    client.generate("b")
+    result = client.generate("c")
+
+    assert "circuit open" in result
+    assert client.stats()["calls"] == 2
+    assert client.stats()["breaker_state"] == "open"
+
+
+def test_circuit_breaker_recovers_after_reset_timeout():
+    """
+    After the reset timeout, a successful trial call closes the breaker.
+    """
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+
+    assert not breaker.allow()
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_cancelled_trial_call_releases_the_breaker():
+    """
+    A half-open trial that is cancelled (e.g. by a request timeout)
+    doesn't leave the breaker stuck: the next call becomes the trial.
+    """
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    client = ResilientLLMClient(FakeLLMClient(latency=1.0), max_retries=0, breaker=breaker)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(client.agenerate("slow"), timeout=0.01))
+    assert breaker.state == "open"
+
+    client.client = FakeLLMClient(latency=0.0)
+    assert not client.generate("fast").startswith("[LLMPool]")
+    assert breaker.state == "closed"
+
+    # Same for a stream abandoned mid-way
+    breaker.record_failure()
+    time.sleep(0.02)
+    stream = client.generate_stream("hi")
+    next(stream)
+    stream.close()
+    assert breaker.state == "open"
+    assert breaker.allow()
+
+
+def test_token_bucket_spaces_out_requests():
+    """
+    With capacity 1 at 600/minute, three requests need about 0.2s.
+    """
+
+    bucket = TokenBucket(per_minute=600, capacity=1)
+
+    start = time.perf_counter()
+    for _ in range(3):
+        bucket.acquire(1)
+
+    assert time.perf_counter() - start == pytest.approx(0.2, abs=0.08)
+
+
+def test_pool_shares_one_client_per_provider_and_model():
+    pool = LLMClientPool()
+
+    assert pool.get("fake", "fake") is pool.get("fake", "fake")
+    assert pool.get("fake", "other") is not pool.get("fake", "fake")
+
+
+class ScriptedStreamClient:
+    """
+    Streams 'a', 'b', 'c'; raises the given errors before (or, with
+    fail_after, part-way through) the stream.
+    """
+
+    def __init__(self, errors, fail_after: int | None = None):
+        self.errors = list(errors)
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def generate_stream(self, prompt: str, max_tokens: int = 512):
+        self.calls += 1
+        for i, chunk in enumerate("abc"):
+            if self.errors and i == (self.fail_after or 0):
+                raise self.errors.pop(0)
+            yield chunk
+
+
+def test_stream_retries_only_before_first_chunk():
+    """
+    A stream that fails before yielding anything is retried; one that
+    fails part-way ends with an error chunk instead.
+    """
+
+    inner = ScriptedStreamClient([TransientLLMError("429")])
+    client = ResilientLLMClient(inner, max_retries=2, base_delay=0.001)
+    assert "".join(client.generate_stream("hi")) == "abc"
+    assert inner.calls == 2
+
+    inner = ScriptedStreamClient([TransientLLMError("reset")], fail_after=1)
+    client = ResilientLLMClient(inner, max_retries=2, base_delay=0.001)
+    chunks = list(client.generate_stream("hi"))
+    assert chunks[0] == "a"
+    assert chunks[-1].startswith("[LLMPool]")
+    assert inner.calls == 1
@@ -0,0 +1,61 @@
+# tests/test_logging_config.py
+
+import json
+import logging
+
+import pytest
+
+from utils import logging_config
+from utils.logging_config import Lazy, RateLimitFilter
+
+
+def test_queue_pipeline_writes_json_lines_and_formats_lazily(monkeypatch, tmp_path):
+    """
+    Records go through the listener thread; Lazy arguments are only
+    computed for records that are written.
+    """
+    # setup_logging() only configures a root logger without handlers
+    # (pytest's capture handlers are put back afterwards)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(root, "level", root.level)
+
+    log_file = tmp_path / "app.log"
+    logging_config.setup_logging(level="INFO", log_format="json", use_queue=True, rate_limits="", log_file=log_file)
+    calls = []
+
+    def expensive(text):
+        calls.append(text)
+        return text.upper()
+
+    logger = logging.getLogger("agents.test")
+    logger.debug("skipped %s", Lazy(expensive, "debug"))
+    logger.info("prompt: %s", Lazy(expensive, "hello"))
+    logging_config.shutdown_logging()
+
+    lines = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert [(line["level"], line["logger"], line["message"]) for line in lines] == [
+        ("INFO", "agents.test", "prompt: HELLO"),
+    ]
+    assert calls == ["hello"]
+    assert lines[0]["thread"] == "MainThread"
+
+
+def test_rate_limit_per_logger():
+    """
+    Limited loggers (and their children) drop records over the rate;
+    warnings and other loggers always pass.
+    """
+    rate_filter = RateLimitFilter(logging_config.parse_rate_limits("utils.llm_client=2"))
+
+    def record(name, level=logging.INFO):
+        return logging.makeLogRecord({"name": name, "levelno": level})
+
+    passed = [rate_filter.filter(record("utils.llm_client.fake")) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert rate_filter.filter(record("utils.llm_client.fake", logging.WARNING))
+    assert all(rate_filter.filter(record("agents.planner")) for _ in range(5))
+    assert rate_filter.dropped == {"utils.llm_client.fake": 3}
+
+    with pytest.raises(ValueError):
+        logging_config.parse_rate_limits("utils.llm_client")
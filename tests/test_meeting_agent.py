@@ -0,0 +1,117 @@
+# tests/test_meeting_agent.py
+
+import threading
+
+from agents.meeting_agent import MeetingAgent
+from utils.llm_cache import InMemoryCacheBackend
+from utils.transcript import estimate_tokens, merge_action_items, parse_summary, split_transcript
+
+
+def make_transcript(turns: int = 200) -> str:
+    speakers = ["Alice", "Bob", "Carol"]
+    lines = []
+    for i in range(turns):
+        speaker = speakers[i % len(speakers)]
+        text = f"Update number {i} on the project, nothing unusual to report here today."
+        if i % 50 == 0:
+            text += " Bob will finalize the email template by Friday."
+        lines.append(f"{speaker}: {text}")
+    return "\n".join(lines) + "\n"
+
+
+class ChunkLLM:
+    """
+    Fake LLM that "summarizes" a chunk by copying its sentences
+    mentioning 'will' as action items, and counts the chunk calls.
+    """
+
+    provider = "test"
+    model_name = "chunk"
+
+    def __init__(self):
+        self.chunk_calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, max_tokens: int = 512) -> str:
+        if "Transcript part:" not in prompt:
+            return "=== Meeting Summary ===\nCombined summary."
+        with self._lock:
+            self.chunk_calls += 1
+        items = [s.strip() for s in prompt.split(".") if " will " in s]
+        numbered = "\n".join(f"{i}. {item}" for i, item in enumerate(items, 1))
+        return f"=== Meeting Summary ===\nPart summary.\n\n=== Action Items ===\n{numbered}"
+
+
+def test_split_transcript_respects_budget_and_turns():
+    """
+    Chunks fit the budget, start at speaker turns and join back to the text.
+    """
+
+    text = make_transcript()
+    chunks = split_transcript(text, max_tokens=300)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+    assert all(estimate_tokens(c) <= 300 for c in chunks)
+    assert all(c.split(":", 1)[0] in {"Alice", "Bob", "Carol"} for c in chunks)
+
+    # One huge turn is still split
+    long_turn = "Alice: " + "This goes on and on. " * 2000
+    assert all(estimate_tokens(c) <= 300 for c in split_transcript(long_turn, 300))
+
+
+def test_edit_only_changes_nearby_chunks():
+    """
+    Editing one turn leaves most chunk boundaries where they were.
+    """
+
+    text = make_transcript()
+    edited = text.replace("Update number 5 on", "Update number 5, slightly longer now, on")
+
+    before = split_transcript(text, max_tokens=300)
+    after = split_transcript(edited, max_tokens=300)
+
+    unchanged = set(before) & set(after)
+    assert len(unchanged) >= len(before) - 2
+
+
+def test_long_transcript_is_map_reduced(tmp_path):
+    """
+    A long transcript is summarized chunk by chunk, action items are
+    deduplicated, and unchanged chunks are served from the cache.
+    """
+
+    llm = ChunkLLM()
+    agent = MeetingAgent(llm=llm, chunk_tokens=300, chunk_cache=InMemoryCacheBackend())
+    path = tmp_path / "meeting.txt"
+    path.write_text(make_transcript(), encoding="utf-8")
+
+    result = agent.summarize_meeting(str(path))
+    first_calls = llm.chunk_calls
+
+    summary, items = parse_summary(result)
+    assert first_calls > 1
+    assert summary == "Combined summary."
+    assert items == ["Bob will finalize the email template by Friday"]
+
+    # Same transcript again: every chunk is cached
+    agent.summarize_meeting(str(path))
+    assert llm.chunk_calls == first_calls
+
+    # Small edit: only the affected chunks are redone
+    path.write_text(make_transcript().replace("number 120 ", "number 120 (revised) "), encoding="utf-8")
+    agent.summarize_meeting(str(path))
+    assert 0 < llm.chunk_calls - first_calls <= 2
+
+
+def test_merge_action_items_drops_near_duplicates():
+    """
+    Items that differ only in articles, case or punctuation count once.
+    """
+
+    items = [
+        "Finalize the email template by Friday",
+        "finalize email template by Friday.",
+        "Schedule a follow-up meeting on Monday",
+    ]
+    assert merge_action_items(items) == [items[0], items[2]]
@@ -0,0 +1,139 @@
+# tests/test_memory_store.py
+
+import threading
+
+from memory.memory_store import MemoryStore
+
+
+def test_connection_is_reused_within_a_thread(tmp_path):
+    """
+    The same thread should keep using one connection, in WAL mode.
+    """
+
+    store = MemoryStore(str(tmp_path / "memory.db"))
+
+    conn = store._get_connection()
+
+    assert store._get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.close()
+
+
+def test_writes_are_visible_across_threads(tmp_path):
+    """
+    Each thread has its own connection, but they all see the same data.
+    """
+
+    store = MemoryStore(str(tmp_path / "memory.db"))
+    results = {}
+
+    def worker(i: int):
+        store.set_memory(f"key{i}", f"value{i}")
+        results[i] = store._get_connection()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(conn) for conn in results.values()}) == 4
+    assert store.get_memory("key3") == "value3"
+    assert len(store.get_all_memories()) == 4
+    store.close()
+
+
+def test_repeated_reads_are_served_from_cache(tmp_path):
+    """
+    Reads hit the cache until our own write invalidates the key.
+    """
+
+    store = MemoryStore(str(tmp_path / "memory.db"))
+    store.set_memory("email_signature", "Thanks,\nAlice")
+
+    assert store.get_memory("email_signature") == "Thanks,\nAlice"
+    assert store.get_memory("email_signature") == "Thanks,\nAlice"
+    assert store.get_memory("missing") is None
+    assert store.get_memory("missing") is None
+    assert store.cache_info()["hits"] == 2
+
+    store.set_memory("email_signature", "Cheers,\nBob")
+
+    assert store.get_memory("email_signature") == "Cheers,\nBob"
+    store.close()
+
+
+def test_cache_sees_writes_from_other_connections(tmp_path):
+    """
+    A second store (like another process) writing to the same file
+    must not leave stale values in our cache.
+    """
+
+    db_path = str(tmp_path / "memory.db")
+    reader = MemoryStore(db_path)
+    writer = MemoryStore(db_path, cache_size=0)
+
+    writer.set_memory("email_signature", "old")
+    assert reader.get_memory("email_signature") == "old"
+
+    writer.set_memory("email_signature", "new")
+
+    assert reader.get_memory("email_signature") == "new"
+    reader.close()
+    writer.close()
+
+
+def test_cache_entries_expire_after_ttl(tmp_path, monkeypatch):
+    """
+    With a TTL, cached values are re-read from SQLite once they expire.
+    """
+
+    store = MemoryStore(str(tmp_path / "memory.db"), cache_ttl=10)
+    store.set_memory("k", "v")
+
+    now = [1000.0]
+    monkeypatch.setattr("memory.memory_store.time.monotonic", lambda: now[0])
+
+    store.get_memory("k")
+    store.get_memory("k")
+    now[0] += 11
+    store.get_memory("k")
+
+    assert store.cache_info()["hits"] == 1
+    assert store.cache_info()["misses"] == 2
+    store.close()
+
+
+def test_bulk_set_get_delete(tmp_path):
+    """
+    set_many / get_many / delete_many work on many keys at once.
+    """
+
+    store = MemoryStore(str(tmp_path / "memory.db"))
+    store.set_many({f"client{i}": f"sig{i}" for i in range(1200)})
+    store.set_many([("client0", "updated")])
+
+    values = store.get_many(["client0", "client1199", "nope"])
+
+    assert values == {"client0": "updated", "client1199": "sig1199"}
+    assert store.delete_many(["client0", "client1"]) == 2
+    assert store.get_memory("client0") is None
+    assert len(store.get_all_memories()) == 1198
+    store.close()
+
+
+def test_jsonl_export_import_roundtrip(tmp_path):
+    """
+    Exported memories can be imported into a fresh database.
+    """
+
+    source = MemoryStore(str(tmp_path / "source.db"))
+    source.set_many({"a": "1", "b": "line1\nline2"})
+    assert source.export_jsonl(str(tmp_path / "memories.jsonl")) == 2
+
+    target = MemoryStore(str(tmp_path / "target.db"))
+
+    assert target.import_jsonl(str(tmp_path / "memories.jsonl")) == 2
+    assert sorted(target.get_all_memories()) == [("a", "1"), ("b", "line1\nline2")]
+    source.close()
+    target.close()
@@ -0,0 +1,66 @@
+# tests/test_metrics_query.py
+
+import csv
+
+from tools.metrics_query import MetricsQuery
+from utils.metrics_sink import METRICS_HEADER
+
+ROWS = [
+    ["2025-11-01T09:00:00", "EMAIL", 100, 0.9, "OK"],
+    ["2025-11-01T10:00:00", "EMAIL", 300, 0.6, "Missing subject line; Missing greeting (e.g., 'Dear ...')"],
+    ["2025-11-01T11:00:00", "REPORT", 200, 0.8, "OK"],
+    ["2025-11-02T09:00:00", "EMAIL", 50, 0.7, "Missing subject line"],
+    ["2025-12-01T09:00:00", "MEETING", 400, 0.5, "No numbered action items found"],
+]
+
+
+def write_csv(path, rows, header=True):
+    with path.open("a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(METRICS_HEADER)
+        writer.writerows(rows)
+
+
+def test_csv_import_is_incremental(tmp_path):
+    """
+    Importing the same CSV again only adds rows appended since.
+    """
+    path = tmp_path / "metrics.csv"
+    write_csv(path, ROWS[:3])
+    query = MetricsQuery(str(tmp_path / "metrics.db"))
+
+    assert query.import_csv(str(path)) == 3
+    assert query.import_csv(str(path)) == 0
+
+    write_csv(path, ROWS[3:], header=False)
+    assert query.import_csv(str(path)) == 2
+    assert query.count() == 5
+    query.close()
+
+
+def test_windowed_aggregates(tmp_path):
+    """
+    Score trend, note frequency and length percentile over a window.
+    """
+    path = tmp_path / "metrics.csv"
+    write_csv(path, ROWS)
+    query = MetricsQuery(str(tmp_path / "metrics.db"))
+    query.import_csv(str(path))
+
+    # end is inclusive: the whole of 2025-11-02, nothing from December
+    trend = query.score_trend("day", start="2025-11-01", end="2025-11-02")
+    assert list(zip(trend["period"], trend["task_type"], trend["count"])) == [
+        ("2025-11-01", "EMAIL", 2), ("2025-11-01", "REPORT", 1), ("2025-11-02", "EMAIL", 1),
+    ]
+    assert trend["mean_score"].round(2).tolist() == [0.75, 0.8, 0.7]
+    assert trend["with_notes"].tolist() == [1, 0, 1]
+
+    notes = query.note_frequency(task_type="email")
+    assert notes.iloc[0].tolist() == ["Missing subject line", 2, 2 / 3]
+    assert len(notes) == 2
+
+    lengths = query.length_percentile(95, "month")
+    assert lengths.to_dict("list") == {"period": ["2025-11", "2025-12"], "p95_length": [300, 400]}
+    assert query.length_percentile(50, "day", end="2025-11-01")["p50_length"].tolist() == [200]
+    query.close()
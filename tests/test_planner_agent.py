@@ -0,0 +1,159 @@
+# tests/test_planner_agent.py
+
+import asyncio
+import time
+
+from agents.evaluator_agent import EvaluatorAgent
+from agents.planner import PlannerAgent
+from utils.llm_client import FakeLLMClient
+
+
+def make_planner(tmp_path, latency: float = 0.0, **kwargs) -> PlannerAgent:
+    """
+    Build a PlannerAgent that writes metrics to a temp file and uses
+    a FakeLLMClient with the given latency.
+    """
+
+    planner = PlannerAgent(**kwargs)
+    planner.evaluator_agent = EvaluatorAgent(str(tmp_path / "metrics.csv"))
+    planner.email_agent.llm = FakeLLMClient(latency=latency)
+    planner.meeting_agent.llm = FakeLLMClient(latency=latency)
+    return planner
+
+
+def test_async_request_matches_sync_request(tmp_path):
+    """
+    The asyncio path must produce the same response as the blocking one.
+    """
+
+    planner = make_planner(tmp_path)
+
+    for user_input in ["write an email to a client", "summarize the meeting", "sales report"]:
+        expected = planner.handle_request(user_input)
+        assert asyncio.run(planner.ahandle_request(user_input)) == expected
+
+
+def test_async_requests_overlap_llm_latency(tmp_path):
+    """
+    With a slow fake LLM, concurrent requests should take roughly one
+    LLM round-trip per batch, not one per request.
+    """
+
+    planner = make_planner(tmp_path, latency=0.2, max_concurrency=10)
+    inputs = [f"write an email to client {i}" for i in range(10)]
+
+    start = time.perf_counter()
+    results = asyncio.run(planner.ahandle_requests(inputs))
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 10
+    assert all("FAKE LLM RESPONSE" in r for r in results)
+    assert elapsed < 1.0
+
+
+def test_custom_intent_handler(tmp_path):
+    """
+    A registered intent is routed to its handler.
+    """
+
+    planner = make_planner(tmp_path)
+    planner.register_intent("INVOICE", ["invoice"], lambda text: f"Invoice for: {text}")
+
+    response = planner.handle_request("create an invoice for Client A")
+
+    assert planner.detect_intent("create an invoice") == "INVOICE"
+    assert response.startswith("Invoice for: create an invoice for Client A")
+
+
+def test_sub_agents_are_lazy_and_shared():
+    """
+    Nothing is built up front, and sub-agents share one MemoryAgent
+    and one LLM client.
+    """
+
+    planner = PlannerAgent()
+
+    assert not planner.registry.is_built("email_agent")
+    assert planner.detect_intent("hello") == "GENERAL"
+    assert not planner.registry.is_built("memory_store")
+
+    assert planner.email_agent.memory_agent is planner.memory_agent
+    assert planner.email_agent.llm is planner.meeting_agent.llm
+
+
+def test_stream_matches_blocking_response(tmp_path):
+    """
+    The streamed chunks join up to the same text handle_request() returns.
+    """
+
+    planner = make_planner(tmp_path)
+
+    for user_input in ["write an email to a client", "summarize the meeting", "sales report", "hello"]:
+        expected = planner.handle_request(user_input)
+        chunks = list(planner.handle_request_stream(user_input))
+        assert "".join(chunks) == expected
+
+    # LLM answers arrive in many pieces, evaluation last
+    chunks = list(planner.handle_request_stream("write an email to a client"))
+    assert len(chunks) > 2
+    assert chunks[-1].startswith("\n\n---\n")
+
+
+def test_stream_first_token_arrives_early(tmp_path):
+    """
+    With a per-token delay, the first chunk shows up long before the
+    whole response is done.
+    """
+
+    planner = make_planner(tmp_path)
+    planner.email_agent.llm = FakeLLMClient(token_delay=0.005)
+
+    start = time.perf_counter()
+    stream = planner.handle_request_stream("write an email to a client")
+    next(stream)
+    first = time.perf_counter() - start
+    for _ in stream:
+        pass
+    total = time.perf_counter() - start
+
+    assert first < total / 5
+
+
+def test_background_evaluation_returns_before_scoring(tmp_path):
+    """
+    In background mode the response comes back without the evaluation,
+    which is delivered to the callback afterwards.
+    """
+
+    delivered = []
+    planner = make_planner(
+        tmp_path,
+        evaluation="background",
+        on_evaluation=lambda intent, text, summary: delivered.append((intent, summary)),
+    )
+
+    response = planner.handle_request("write an email to a client")
+    async_response = asyncio.run(planner.ahandle_request("hello"))
+    assert "=== Evaluation ===" not in response + async_response
+
+    planner.flush_evaluations()
+    assert [intent for intent, _ in delivered] == ["EMAIL", "GENERAL"]
+    assert all("=== Evaluation ===" in summary for _, summary in delivered)
+    assert planner.evaluation_stats()["evaluated"] == 2
+    assert "EMAIL" in (tmp_path / "metrics.csv").read_text()
+
+
+def test_evaluation_sampling_per_intent(tmp_path):
+    """
+    A sample rate evaluates that fraction of the intent's outputs;
+    other intents are always evaluated.
+    """
+
+    planner = make_planner(tmp_path, sample_rates={"GENERAL": 0.25, "EMAIL": 0})
+
+    general = [planner.handle_request("hello") for _ in range(8)]
+    email = planner.handle_request("write an email")
+
+    assert sum("=== Evaluation ===" in r for r in general) == 2
+    assert "=== Evaluation ===" not in email
+    assert "=== Evaluation ===" in planner.handle_request("summarize the meeting")
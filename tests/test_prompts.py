@@ -0,0 +1,54 @@
+# tests/test_prompts.py
+
+import pytest
+
+from agents.meeting_agent import MeetingAgent
+from utils import prompts
+from utils.prompts import estimate_tokens, get_template, register_template
+
+
+def test_registered_template_renders_and_checks_fields():
+    """
+    Templates are dedented once; literal % and {{ }} survive rendering.
+    """
+    template = register_template(
+        "test_followup",
+        """
+        Follow up on: {message}
+        Discount: 50% {{not a field}}
+        """,
+        trim_field="message",
+    )
+
+    assert get_template("test_followup") is template
+    assert template.fields == ("message",)
+    assert template.render(message="the %(x)s offer") == (
+        "Follow up on: the %(x)s offer\nDiscount: 50% {not a field}"
+    )
+
+    with pytest.raises(ValueError):
+        template.render()
+    with pytest.raises(KeyError):
+        get_template("no_such_prompt")
+
+
+def test_prompts_fit_the_context_limit(monkeypatch):
+    """
+    Oversized inputs are trimmed (keeping both ends) or chunked to fit
+    the model's context.
+    """
+    monkeypatch.setattr(prompts, "LLM_CONTEXT_TOKENS", 2_000)
+    budget = prompts.prompt_budget(512)
+    assert budget == 1_488
+
+    request = "START " + "please include the numbers " * 2_000 + " END"
+    prompt = prompts.build_email_prompt(request, "Bob")
+    assert estimate_tokens(prompt) <= budget
+    assert "START" in prompt and "END" in prompt and "characters omitted" in prompt
+
+    # Short inputs are left alone
+    assert "omitted" not in prompts.build_email_prompt("thank the client", "Bob")
+
+    agent = MeetingAgent(llm=object(), chunk_tokens=3_000, chunk_cache=None)
+    assert agent.chunk_tokens == get_template("meeting_chunk").field_budget(budget)
+    assert agent.chunk_tokens < budget
@@ -1,5 +1,7 @@
 # tests/test_report_agent.py
 
+from pathlib import Path
+
 from agents.report_agent import ReportAgent
 
 def test_generate_report_contains_revenue():
@@ -11,3 +13,147 @@ def test_generate_report_contains_revenue():
     result = agent.generate_report("examples/sales_data.csv")
 
     assert "Total revenue" in result
+
+
+def test_streaming_report_matches_in_memory_report():
+    """
+    The chunked report must be identical to the in-memory one,
+    even when every chunk holds only a couple of rows.
+    """
+
+    expected = ReportAgent(streaming=False).generate_report("examples/sales_data.csv")
+
+    agent = ReportAgent(streaming=True, chunksize=2)
+    result = agent.generate_report("examples/sales_data.csv")
+
+    assert result == expected
+
+
+def test_incremental_report_folds_in_appended_rows(tmp_path):
+    """
+    After rows are appended, the incremental report must equal a full
+    recompute, and the saved offset must move to the end of the file.
+    """
+
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text(Path("examples/sales_data.csv").read_text())
+
+    agent = ReportAgent(incremental=True, state_dir=str(tmp_path / "state"))
+    agent.generate_report(str(csv_path))
+
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write("2025-11-04,Client D,3000,1000\n")
+        f.write("2025-11-01,Client C,700,200\n")
+
+    result = agent.generate_report(str(csv_path))
+
+    assert result == ReportAgent().generate_report(str(csv_path))
+    offset, _ = agent.state_store.load(str(csv_path))
+    assert offset == csv_path.stat().st_size
+
+
+def test_incremental_report_counts_unterminated_last_row(tmp_path):
+    """
+    A last row without a trailing newline is in the report, and is
+    counted once when the file is appended to later.
+    """
+
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text(
+        "date,client,revenue,expenses\n"
+        "2025-12-01,Client A,10,5\n"
+        "2025-12-02,Client B,20,5"
+    )
+
+    agent = ReportAgent(incremental=True, state_dir=str(tmp_path / "state"))
+    result = agent.generate_report(str(csv_path))
+    assert "Rows of data: 2" in result
+    assert result == ReportAgent().generate_report(str(csv_path))
+
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write("\n2025-12-03,Client C,30,5\n")
+
+    result = agent.generate_report(str(csv_path))
+    assert "Rows of data: 3" in result
+    assert result == ReportAgent().generate_report(str(csv_path))
+
+
+def test_incremental_report_recomputes_after_rewrite(tmp_path):
+    """
+    If the file is rewritten instead of appended to, the old totals
+    must not leak into the new report.
+    """
+
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text(Path("examples/sales_data.csv").read_text())
+
+    agent = ReportAgent(incremental=True, state_dir=str(tmp_path / "state"))
+    agent.generate_report(str(csv_path))
+
+    csv_path.write_text(
+        "date,client,revenue,expenses\n"
+        "2025-12-01,Client A,10,5\n"
+    )
+
+    result = agent.generate_report(str(csv_path))
+
+    assert result == ReportAgent().generate_report(str(csv_path))
+    assert "Rows of data: 1" in result
+
+
+def test_rollup_report_matches_full_report(tmp_path):
+    """
+    Reports from rollups must equal a full recompute, pick up new files
+    without re-reading old ones, and pass verification.
+    """
+
+    import shutil
+
+    folder = tmp_path / "sales"
+    folder.mkdir()
+    shutil.copy("examples/sales_data.csv", folder / "day1.csv")
+
+    agent = ReportAgent(rollups=True)
+    assert agent.generate_report(str(folder)) == ReportAgent().generate_report(str(folder))
+
+    (folder / "day2.csv").write_text(
+        "date,client,revenue,expenses\n2025-11-10,Client A,900,100\n2025-11-11,Client D,50,10\n"
+    )
+    store = agent.rollup_store(str(folder))
+    assert store.refresh() == {"added": 1, "updated": 0, "removed": 0, "unchanged": 1}
+    assert agent.generate_report(str(folder)) == ReportAgent().generate_report(str(folder))
+    assert store.verify() == []
+
+    # A zero-byte file has no rows to roll up, and doesn't break anything
+    (folder / "day3.csv").write_bytes(b"")
+    assert store.refresh()["added"] == 1
+    assert store.verify() == []
+    (folder / "day3.csv").unlink()
+    store.refresh()
+
+    # Rows without a usable date still count, as in a full recompute
+    (folder / "day4.csv").write_text("date,client,revenue,expenses\n,Client A,40,10\n2025-11-12,Client B,5,1\n")
+    store.refresh()
+    assert agent.generate_report(str(folder)) == ReportAgent().generate_report(str(folder))
+    assert "Rows of data: 1" in agent.generate_rollup_report(str(folder), start="2025-11-12")
+    (folder / "day4.csv").write_text("date,client,revenue,expenses\nnot a date,Client B,60,20\n")
+    store.refresh()
+    full = ReportAgent().generate_report(str(folder)).splitlines()
+    assert agent.generate_report(str(folder)).splitlines()[1:5] == full[1:5]
+    assert store.verify() == []
+    (folder / "day4.csv").unlink()
+    store.refresh()
+
+    # Date range and client filters
+    result = agent.generate_rollup_report(str(folder), start="2025-11-02", clients=["Client A"])
+    assert "Rows of data: 2" in result
+    assert "Total revenue: 2100" in result
+
+    weekly = store.query("week", by_client=True)
+    assert weekly["revenue"].sum() == 6500 + 950
+
+    # A removed file drops out; a tampered rollup is caught by verify()
+    (folder / "day2.csv").unlink()
+    assert store.refresh()["removed"] == 1
+    store._conn.execute("UPDATE rollups SET revenue = revenue + 1 WHERE grain = 'day'")
+    assert store.verify()
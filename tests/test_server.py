@@ -0,0 +1,113 @@
+# tests/test_server.py
+
+import asyncio
+import json
+
+from server import PlannerServer
+from test_planner_agent import make_planner
+
+
+async def http(port: int, method: str, path: str, body: bytes = b"") -> tuple[int, dict]:
+    """
+    Send one request on a fresh connection; (status, JSON body).
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(payload)
+
+
+async def start_server(planner, **kwargs) -> PlannerServer:
+    server = PlannerServer(planner, host="127.0.0.1", port=0, **kwargs)
+    await server.start()
+    return server
+
+
+def test_server_handles_requests(tmp_path):
+    """
+    POST /request returns the planner's response (routing the input
+    once); bad input and unknown paths get 4xx answers.
+    """
+    planner = make_planner(tmp_path)
+    routed = []
+    detect_intent = planner.detect_intent
+    planner.detect_intent = lambda text: routed.append(text) or detect_intent(text)
+
+    async def scenario():
+        server = await start_server(planner)
+        try:
+            status, data = await http(
+                server.port, "POST", "/request", json.dumps({"input": "write an email to a client"}).encode()
+            )
+            assert status == 200
+            assert data["intent"] == "EMAIL"
+            assert "FAKE LLM RESPONSE" in data["response"]
+            assert len(routed) == 1
+
+            assert (await http(server.port, "POST", "/request", b"not json"))[0] == 400
+            assert (await http(server.port, "GET", "/request"))[0] == 405
+            assert (await http(server.port, "GET", "/nope"))[0] == 404
+
+            status, health = await http(server.port, "GET", "/health")
+            assert status == 200
+            assert health["served"] == 1
+        finally:
+            await server.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_server_times_out_slow_requests(tmp_path):
+    """
+    A request slower than request_timeout gets a 504, and is not
+    counted as served.
+    """
+    planner = make_planner(tmp_path, latency=1.0)
+
+    async def scenario():
+        server = await start_server(planner, request_timeout=0.1)
+        try:
+            status, data = await http(
+                server.port, "POST", "/request", json.dumps({"input": "write an email"}).encode()
+            )
+            assert status == 504
+            assert "timed out" in data["error"]
+
+            status, health = await http(server.port, "GET", "/health")
+            assert (health["served"], health["timed_out"], health["failed"]) == (0, 1, 0)
+        finally:
+            await server.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_waits_for_in_flight_requests(tmp_path):
+    """
+    Graceful shutdown lets a running request finish and answer, and
+    flushes the metrics it recorded.
+    """
+    planner = make_planner(tmp_path, latency=0.3)
+
+    async def scenario():
+        server = await start_server(planner)
+        request = asyncio.create_task(http(
+            server.port, "POST", "/request", json.dumps({"input": "write an email"}).encode()
+        ))
+        await asyncio.sleep(0.1)
+        assert server.in_flight == 1
+
+        await server.shutdown()
+        status, data = await request
+        assert status == 200
+        assert "FAKE LLM RESPONSE" in data["response"]
+
+    asyncio.run(scenario())
+    assert "EMAIL" in (tmp_path / "metrics.csv").read_text()
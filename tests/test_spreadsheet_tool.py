@@ -0,0 +1,147 @@
+# tests/test_spreadsheet_tool.py
+
+import shutil
+
+import pandas as pd
+
+from tools.columnar_cache import ColumnarCache
+from tools.spreadsheet_parser import SpreadsheetTool
+
+
+def test_columnar_cache_hit_matches_csv(tmp_path):
+    """
+    A cached read must return the same DataFrame as parsing the CSV.
+    """
+
+    csv_path = tmp_path / "sales.csv"
+    shutil.copy("examples/sales_data.csv", csv_path)
+
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    tool = SpreadsheetTool(cache=cache)
+
+    first = tool.read_csv(str(csv_path))
+    second = tool.read_csv(str(csv_path))
+
+    pd.testing.assert_frame_equal(second, pd.read_csv(csv_path))
+    pd.testing.assert_frame_equal(first, second)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_columnar_cache_rebuilds_after_file_changes(tmp_path):
+    """
+    Appending rows must invalidate the cached entry.
+    """
+
+    csv_path = tmp_path / "sales.csv"
+    shutil.copy("examples/sales_data.csv", csv_path)
+
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    tool = SpreadsheetTool(cache=cache)
+    tool.read_csv(str(csv_path))
+
+    with csv_path.open("a", encoding="utf-8") as f:
+        f.write("2025-11-04,Client D,500,100\n")
+
+    df = tool.read_csv(str(csv_path))
+
+    assert len(df) == 6
+    assert cache.stats()["hits"] == 0
+
+
+def test_columnar_cache_evicts_least_recently_used(tmp_path):
+    """
+    With room for only one entry, caching a second file evicts the first.
+    """
+
+    paths = []
+    for name in ("a.csv", "b.csv"):
+        path = tmp_path / name
+        shutil.copy("examples/sales_data.csv", path)
+        paths.append(path)
+
+    cache = ColumnarCache(str(tmp_path / "cache"))
+    tool = SpreadsheetTool(cache=cache)
+    tool.read_csv(str(paths[0]))
+    cache.max_bytes = cache.stats()["bytes"]
+
+    tool.read_csv(str(paths[1]))
+
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(str(paths[0])) is None
+
+
+def test_columnar_caches_can_share_a_directory(tmp_path):
+    """
+    Two caches on one directory see each other's entries, and neither
+    fails or leaves a stray entry behind when both cache the same file.
+    """
+
+    csv_path = tmp_path / "sales.csv"
+    shutil.copy("examples/sales_data.csv", csv_path)
+
+    cache_a = ColumnarCache(str(tmp_path / "cache"))
+    cache_b = ColumnarCache(str(tmp_path / "cache"))
+    SpreadsheetTool(cache=cache_a).read_csv(str(csv_path))
+
+    df = SpreadsheetTool(cache=cache_b).read_csv(str(csv_path))
+    pd.testing.assert_frame_equal(df, pd.read_csv(csv_path))
+    assert cache_b.stats()["hits"] == 1
+
+    # Both put the same file, B from an out-of-date index
+    cache_b._index = {}
+    assert cache_a.put(str(csv_path), df)
+    assert cache_b.put(str(csv_path), df)
+
+    entries = [p for p in (tmp_path / "cache").iterdir() if p.is_dir()]
+    assert len(entries) == 1
+    assert cache_a.stats()["entries"] == cache_b.stats()["entries"] == 1
+
+
+def write_daily_files(tmp_path, days: int = 6):
+    """
+    Split the example data into one (partly gzipped) file per row.
+    """
+
+    df = pd.read_csv("examples/sales_data.csv")
+    folder = tmp_path / "daily"
+    folder.mkdir()
+    for i, row in enumerate(df.itertuples(index=False)):
+        suffix = ".csv.gz" if i % 2 else ".csv"
+        pd.DataFrame([row], columns=df.columns).to_csv(folder / f"sales_{i:02d}{suffix}", index=False)
+    (folder / "notes.txt").write_text("not a csv")
+    return folder, df
+
+
+def test_read_many_matches_single_file(tmp_path):
+    """
+    Reading a directory or glob of split files gives back the same rows,
+    parsed on worker processes.
+    """
+
+    folder, df = write_daily_files(tmp_path)
+    tool = SpreadsheetTool(workers=2)
+
+    pd.testing.assert_frame_equal(tool.read_many(str(folder)), df)
+    pd.testing.assert_frame_equal(tool.read_many(str(folder / "sales_*.csv*")), df)
+    assert len(tool.resolve_paths(str(folder / "sales_0[0-1]*"))) == 2
+    tool.close()
+
+
+def test_multi_file_report_matches_single_file(tmp_path):
+    """
+    A report over a directory of files equals the report over the
+    combined file (a zero-byte file in the directory is skipped).
+    """
+
+    from agents.report_agent import DEFAULT_KPIS, ReportAgent
+
+    folder, _ = write_daily_files(tmp_path)
+    (folder / "sales_99.csv").write_bytes(b"")
+
+    expected = ReportAgent().generate_report("examples/sales_data.csv")
+    assert ReportAgent().generate_report(str(folder)) == expected
+
+    expected = ReportAgent(kpis=DEFAULT_KPIS).generate_report("examples/sales_data.csv")
+    assert ReportAgent(kpis=DEFAULT_KPIS).generate_report(str(folder)) == expected
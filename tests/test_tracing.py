@@ -0,0 +1,86 @@
+# tests/test_tracing.py
+
+import asyncio
+import json
+
+import pytest
+
+from utils import tracing
+from test_planner_agent import make_planner
+
+
+@pytest.fixture
+def tracer():
+    """
+    Tracing switched on for one test, with no spans left over.
+    """
+    tracer = tracing.get_tracer()
+    tracer.reset()
+    tracing.enable()
+    yield tracer
+    tracing.disable()
+    tracer.reset()
+
+
+def test_disabled_tracing_records_nothing():
+    """
+    While tracing is off, span() is a shared no-op.
+    """
+    tracer = tracing.get_tracer()
+    tracer.reset()
+
+    with tracing.span("x") as s:
+        s.set("key", "value")
+
+    assert tracing.span("y") is tracing.span("z")
+    assert tracer.spans() == []
+
+
+def test_request_spans_nest_under_request(tracer, tmp_path):
+    """
+    Blocking and async requests produce a planner.request root with the
+    stage spans as its children, and per-stage histograms.
+    """
+    planner = make_planner(tmp_path)
+    planner.handle_request("write an email to a client")
+    asyncio.run(planner.ahandle_request("write an email to a client"))
+
+    spans = tracer.spans()
+    roots = [s for s in spans if s.name == "planner.request"]
+    assert len(roots) == 2
+    for root in roots:
+        assert root.parent_id is None
+        assert root.attrs["intent"] == "EMAIL"
+        children = {s.name for s in spans if s.parent_id == root.span_id}
+        assert {"planner.intent", "email.prompt", "llm.generate", "evaluator.evaluate"} <= children
+
+    # The memory lookup happens while building the prompt
+    prompt = next(s for s in spans if s.name == "email.prompt")
+    assert any(s.name == "memory.get" and s.parent_id == prompt.span_id for s in spans)
+
+    stats = tracer.stats()
+    assert stats["planner.request"]["count"] == 2
+    assert stats["llm.generate"]["p99_ms"] >= stats["llm.generate"]["p50_ms"]
+
+
+def test_export_formats(tracer, tmp_path):
+    """
+    Chrome trace and OTLP-JSON exports contain every span.
+    """
+    with tracing.span("outer", rows=3):
+        with pytest.raises(ValueError):
+            with tracing.span("inner"):
+                raise ValueError("boom")
+
+    tracer.export(str(tmp_path / "trace.json"), "chrome")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {e["name"] for e in events} == {"outer", "inner"}
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+    tracer.export(str(tmp_path / "otlp.json"), "otlp")
+    data = json.loads((tmp_path / "otlp.json").read_text())
+    spans = {s["name"]: s for s in data["resourceSpans"][0]["scopeSpans"][0]["spans"]}
+    assert spans["inner"]["parentSpanId"] == spans["outer"]["spanId"]
+    assert spans["inner"]["traceId"] == spans["outer"]["traceId"]
+    assert spans["inner"]["status"]["code"] == 2
+    assert {"key": "rows", "value": {"intValue": "3"}} in spans["outer"]["attributes"]